@@ -0,0 +1,321 @@
+# pylint: disable=locally-disabled, line-too-long, broad-exception-caught
+"""
+Generates the wiki pages for many Pokémon in one run, writing each page to its own file in an output directory.
+
+Species can be chosen as the whole dex, a list file of internal names, or a range of dex numbers. All pages in a run
+share the same process, and so the same cached reference dictionaries and game data indexes, meaning each file is only
+read once no matter how many pages are generated.
+
+Generating a page is pure CPU work, so pages may also be generated over a pool of worker processes. The game data is
+then loaded once in the parent process before forking, so every worker shares it rather than loading its own copy.
+"""
+import functools
+import gc
+import logging
+import multiprocessing
+import os
+import time
+from data_access import clear_references, load_reference, preload_references
+from data_collection import clear_indexes, preload_indexes
+from dex_index import build_dex_index, split_dex_number
+from obtainability import resolve_obtainability
+from page_model import RENDERERS
+from section_cache import SectionCache
+from wiki import create_wiki_page
+
+
+def all_species():
+    """
+    Finds the internal name of every Pokémon with a wiki page, in dex order.
+
+    Alternate forms share the page of their base form, and so each internal name is only given once.
+
+    :return list[str]: The internal names of every Pokémon.
+    """
+    return list(dict.fromkeys(value["InternalName"] for value in load_reference('references/pokemon_info.json').values()))
+
+
+def species_in_range(dex_range):
+    """
+    Finds the internal name of every Pokémon within a range of dex numbers, in dex order.
+
+    Both ends must be in the same dex, e.g., "001-050", "X001-X044", or "V010-V020". A single number is also accepted.
+
+    :param str dex_range: The inclusive range of dex numbers.
+    :return list[str]: The internal names of every Pokémon in the range.
+    :raises ValueError: If the range is malformed or spans multiple dexes.
+    """
+    first, _, last = dex_range.upper().partition("-")
+    region, start = split_dex_number(first)
+    end_region, end = split_dex_number(last or first)
+    if region != end_region:
+        raise ValueError(f"Dex range '{dex_range}' must start and end in the same dex.")
+
+    names = []
+    for dex, value in load_reference('references/pokemon_info.json').items():
+        dex_region, number = split_dex_number(dex)
+        if dex_region == region and start <= number <= end:
+            names.append(value["InternalName"])
+
+    return list(dict.fromkeys(names))
+
+
+def species_from_file(filename):
+    """
+    Reads a list of internal names from a file, one per line. Blank lines and lines starting with "#" are ignored.
+
+    :param str filename: The path to the list file.
+    :return list[str]: The internal names in the file, in upper case.
+    """
+    with open(filename, encoding="utf-8") as f:
+        names = [line.strip().upper() for line in f]
+    return list(dict.fromkeys(name for name in names if name and not name.startswith("#")))
+
+
+def page_filename(display_name, internal_name, used_names, extension=".wiki"):
+    """
+    Decides the file name for a wiki page, which is the Pokémon's display name.
+
+    If two Pokémon share a display name (e.g., regional forms), the internal name is added to keep both pages.
+
+    :param str display_name: The display name of the Pokémon.
+    :param str internal_name: The internal name of the Pokémon.
+    :param set[str] used_names: The file names already used in this run, which is updated.
+    :param str extension: The file extension of the page's format.
+    :return str: The file name of the page.
+    """
+    display_name = display_name.replace("/", "-")
+    filename = f"{display_name}{extension}"
+    if filename in used_names:
+        logging.warning("Display name '%s' is used by multiple Pokémon; writing %s separately.", display_name, internal_name)
+        filename = f"{display_name} ({internal_name}){extension}"
+    used_names.add(filename)
+    return filename
+
+
+def write_page(lines, path):
+    """
+    Writes the lines of a wiki page to a file, exactly as they would be printed to the console.
+
+    :param list[str] lines: The lines of the wiki page.
+    :param str path: The path of the file to write.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def stream_page(internal_name, out_dir, used_names, selection=None, page_format="wiki", section_cache=None, filename=None):
+    """
+    Generates the wiki page of a single Pokémon straight into its file, one section at a time, timing it and catching
+    any failure.
+
+    The page is written to a temporary file which only replaces the page's file once complete, so a failure part way
+    through never leaves a partial page behind, nor claims a file name. Pages in any format other than wikitext are
+    rendered from the page model instead, which is created in full first.
+
+    :param str internal_name: The internal name of the Pokémon.
+    :param str out_dir: The directory to write the page to.
+    :param set[str] used_names: The file names already used in this run, which is updated.
+    :param tuple[str] | None selection: The keys of the sections to generate, or None for every section.
+    :param str page_format: The format to write the page in, as in page_model.RENDERERS.
+    :param SectionCache | None section_cache: The cache to reuse sections from and store new sections in, if any.
+    :param str | None filename: The file name to write the page to, e.g., as decided by an earlier run, or None to
+        decide it now.
+    :return dict[str, str | int | float | None]: The file written, the time taken, any error, and the number of sections
+        reused from the cache.
+    """
+    start = time.perf_counter()
+    hits = section_cache.hits if section_cache else 0
+    given_filename = filename
+    try:
+        wiki_page = create_wiki_page(internal_name, section_cache)
+        renderer, extension = RENDERERS[page_format]
+        filename = filename or page_filename(wiki_page.poke_box_gen.name, internal_name, used_names, extension)
+        path = os.path.join(out_dir, filename)
+        with open(path + ".part", "w", encoding="utf-8") as f:
+            if page_format == "wiki":
+                wiki_page.write_wiki_page(f, selection)
+            else:
+                f.writelines(line + "\n" for line in renderer(wiki_page.create_model(selection)))
+        os.replace(path + ".part", path)
+        reused = section_cache.hits - hits if section_cache else 0
+        return {"File": filename, "Time": time.perf_counter() - start, "Error": None, "Reused": reused}
+    except Exception as e:
+        logging.error("Error in generating the wiki page for %s:", internal_name, exc_info=True)
+        if filename is not None:
+            if filename != given_filename:
+                used_names.discard(filename)
+            if os.path.exists(os.path.join(out_dir, filename + ".part")):
+                os.remove(os.path.join(out_dir, filename + ".part"))
+        return {"File": None, "Time": time.perf_counter() - start, "Error": f"{type(e).__name__}: {e}", "Reused": 0}
+
+
+def generate_page(internal_name, selection=None, page_format="wiki", section_cache=None):
+    """
+    Generates the wiki page of a single Pokémon, timing it and catching any failure.
+
+    :param str internal_name: The internal name of the Pokémon.
+    :param tuple[str] | None selection: The keys of the sections to generate, or None for every section.
+    :param str page_format: The format to render the page in, as in page_model.RENDERERS.
+    :param SectionCache | None section_cache: The cache to reuse sections from and store new sections in, if any.
+    :return dict[str, str | list[str] | int | float | None]: The Pokémon's display name, the lines of its page, the
+        time taken, any error, and the number of sections reused from the cache.
+    """
+    start = time.perf_counter()
+    hits = section_cache.hits if section_cache else 0
+    try:
+        wiki_page = create_wiki_page(internal_name, section_cache)
+        lines = list(RENDERERS[page_format][0](wiki_page.create_model(selection)))
+        reused = section_cache.hits - hits if section_cache else 0
+        return {"DisplayName": wiki_page.poke_box_gen.name, "Lines": lines, "Time": time.perf_counter() - start, "Error": None,
+                "Reused": reused}
+    except Exception as e:
+        logging.error("Error in generating the wiki page for %s:", internal_name, exc_info=True)
+        return {"DisplayName": None, "Lines": None, "Time": time.perf_counter() - start, "Error": f"{type(e).__name__}: {e}",
+                "Reused": 0}
+
+
+def _generate_chunk(internal_names, selection=None, page_format="wiki", cache_dir=None):
+    """
+    Generates the wiki pages of a chunk of Pokémon in a worker process.
+
+    :param list[str] internal_names: The internal names of the Pokémon in the chunk.
+    :param tuple[str] | None selection: The keys of the sections to generate, or None for every section.
+    :param str page_format: The format to render pages in, as in page_model.RENDERERS.
+    :param str | None cache_dir: The directory of the section cache to use, if any.
+    :return list[tuple[str, dict[str, str | list[str] | int | float | None]]]: Each Pokémon with its generated page.
+    """
+    section_cache = SectionCache(cache_dir) if cache_dir else None
+    return [(internal_name, generate_page(internal_name, selection, page_format, section_cache)) for internal_name in internal_names]
+
+
+def preload_game_data():
+    """
+    Loads every reference dictionary and builds every game data index up front, then freezes them.
+
+    Freezing moves everything loaded so far out of the garbage collector's reach, so that worker processes forked
+    afterwards never touch (and so never copy) the memory holding it, and can share the parent's copy instead.
+    """
+    preload_references()
+    preload_indexes()
+    build_dex_index()
+    resolve_obtainability()
+    gc.freeze()
+
+
+def reload_game_data():
+    """
+    Forgets every reference dictionary, game data index and obtainability table loaded so far, then loads them again,
+    so that any edits to the files are picked up without restarting the process.
+    """
+    clear_references()
+    clear_indexes()
+    build_dex_index.cache_clear()
+    resolve_obtainability.cache_clear()
+    preload_references()
+    preload_indexes()
+    build_dex_index()
+    resolve_obtainability()
+
+
+def _generated_pages(internal_names, jobs, chunksize, selection=None, page_format="wiki", cache_dir=None):
+    """
+    Generates the wiki page of every given Pokémon over a pool of forked worker processes.
+
+    Pages are always given back in the same order as the Pokémon, no matter which worker finished first.
+
+    :param list[str] internal_names: The internal names of the Pokémon to generate pages for.
+    :param int jobs: The number of worker processes to use.
+    :param int | None chunksize: The number of Pokémon sent to a worker at once, or None to decide automatically.
+    :param tuple[str] | None selection: The keys of the sections to generate, or None for every section.
+    :param str page_format: The format to render pages in, as in page_model.RENDERERS.
+    :param str | None cache_dir: The directory of the section cache to use, if any.
+    :return Iterator[tuple[str, dict[str, str | list[str] | int | float | None]]]: Each Pokémon with its generated page.
+    """
+    preload_game_data()
+    chunksize = chunksize or max(1, len(internal_names) // (jobs * 4))
+    chunks = [internal_names[i:i + chunksize] for i in range(0, len(internal_names), chunksize)]
+    with multiprocessing.get_context("fork").Pool(jobs) as pool:
+        for chunk in pool.imap(functools.partial(_generate_chunk, selection=selection, page_format=page_format, cache_dir=cache_dir), chunks):
+            yield from chunk
+
+
+def run_batch(internal_names, out_dir, jobs=1, chunksize=None, selection=None, page_format="wiki", cache_dir=None,
+              filenames=None):
+    """
+    Generates and writes the wiki page of every given Pokémon to the output directory.
+
+    A failure for one Pokémon is recorded and does not stop the run. In a single process, each page is streamed into its
+    file section by section, so no full page is ever held in memory. Pages may instead be generated in parallel over
+    multiple processes, but are always written by this process in the order given, so file names are decided
+    deterministically either way.
+
+    :param list[str] internal_names: The internal names of the Pokémon to generate pages for.
+    :param str out_dir: The directory to write pages to, which is created if needed.
+    :param int jobs: The number of worker processes to use, where 1 generates pages in this process.
+    :param int | None chunksize: The number of Pokémon sent to a worker at once, or None to decide automatically.
+    :param tuple[str] | None selection: The keys of the sections to generate, or None for every section. Pages limited
+        to a few sections only hold those sections, with no header/footer unless chosen.
+    :param str page_format: The format to write pages in, as in page_model.RENDERERS.
+    :param str | None cache_dir: The directory of the section cache to reuse unchanged sections from, if any.
+    :param dict[str, str] | None filenames: The file name of each Pokémon's page decided by an earlier run, which is kept
+        so that regenerating only some pages never gives a page a different name.
+    :return dict[str, dict[str, str | int | float | None]]: For each Pokémon, the file written, the time taken, any
+        error, and the number of sections reused from the cache.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    filenames = filenames or {}
+    used_names = set(filenames.values())
+    results = {}
+
+    if jobs > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        logging.warning("Forking processes is not supported on this platform; generating pages in a single process.")
+        jobs = 1
+
+    if jobs <= 1:
+        section_cache = SectionCache(cache_dir) if cache_dir else None
+        for internal_name in internal_names:
+            results[internal_name] = stream_page(internal_name, out_dir, used_names, selection, page_format, section_cache,
+                                                 filenames.get(internal_name))
+        return results
+
+    for internal_name, page in _generated_pages(internal_names, jobs, chunksize, selection, page_format, cache_dir):
+        filename = None
+        if page["Error"] is None:
+            filename = filenames.get(internal_name) or page_filename(page["DisplayName"], internal_name, used_names,
+                                                                     RENDERERS[page_format][1])
+            write_page(page["Lines"], os.path.join(out_dir, filename))
+        results[internal_name] = {"File": filename, "Time": page["Time"], "Error": page["Error"], "Reused": page["Reused"]}
+
+    return results
+
+
+def print_summary(results, wall_time=None, slowest=10):
+    """
+    Prints a summary of a batch run: the number of pages written, every failure, and the slowest pages.
+
+    :param dict[str, dict[str, str | float | None]] results: The results of a batch run.
+    :param float | None wall_time: The wall time of the whole run, which differs from the total time of every page if
+        pages were generated in parallel.
+    :param int slowest: The number of slowest pages to show.
+    """
+    failures = {name: result for name, result in results.items() if result["Error"]}
+    total_time = sum(result["Time"] for result in results.values())
+
+    print(f"\nGenerated {len(results) - len(failures)} of {len(results)} pages in {total_time:.2f}s", end="")
+    print(f" ({total_time / len(results) * 1000:.1f}ms per page)." if results else ".")
+    if wall_time is not None:
+        print(f"Wall time: {wall_time:.2f}s.")
+    reused = sum(result.get("Reused", 0) for result in results.values())
+    if reused:
+        print(f"Reused {reused} sections from the cache.")
+
+    if failures:
+        print(f"\n{len(failures)} pages failed:")
+        for name, result in failures.items():
+            print(f"  {name}: {result['Error']}")
+
+    print(f"\nSlowest {min(slowest, len(results))} pages:")
+    for name, result in sorted(results.items(), key=lambda x: -x[1]["Time"])[:slowest]:
+        print(f"  {name}: {result['Time'] * 1000:.1f}ms")
+
@@ -0,0 +1,201 @@
+# pylint: disable=locally-disabled, line-too-long
+"""
+Benchmarks how the time and memory taken to parse the game data, index it and generate pages scale with the size of the
+game data, using synthetic game data from benchmarks.synthetic_data at several multiples of the real size.
+
+For each scale, the synthetic data is generated (or reused, if already there), then measured in a fresh process run from
+its directory, so that no cache carries over from one scale to the next. Three stages are measured, one after another:
+
+- parse: reading pokemon.txt, tm.txt and encounters.txt into lines, and every reference dictionary
+- index: building every game data index, the dex index and the obtainability table, including their own file reads
+- page: generating the sections of the same number of pages at every scale, spread evenly across the dex
+
+Times are measured in one process and the peak memory allocated by each stage, through tracemalloc, in another, as
+tracing slows everything down. The growth of each stage is its time at a scale over its time at the smallest scale,
+divided by how many times larger the data is; about 1 means linear, and more means worse than linear. Pages are
+compared per page, so their growth should stay near 1 / scale if page generation does not depend on the size of the
+data. Run from the root of the repository:
+
+    python -m benchmarks.data_scaling
+    python -m benchmarks.data_scaling --scales 1 10 100 1000 --data-dir synthetic --json scaling.json
+
+1000 times the real size is well over a gigabyte of game data and takes a long while, so is only run when asked for.
+
+Format: {"Scale": {"Lines": int, "Pages": int, "Failures": int, "Time": {"Stage": float}, "Memory": {"Stage": int}}}
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from batch import all_species
+from benchmarks.synthetic_data import SyntheticData
+from data_access import preload_references
+from data_collection import preload_indexes, read_file_lines
+from dex_index import build_dex_index
+from obtainability import resolve_obtainability
+from wiki import create_wiki_page
+
+# The stages measured at every scale, in the order they are run
+STAGES = ("parse", "index", "page")
+
+# The game data files parsed in the parse stage
+GAME_DATA_FILES = ("gamedata/pokemon.txt", "gamedata/tm.txt", "gamedata/encounters.txt")
+
+# The root of the repository, which the process measuring each scale needs on its path
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def count_lines(filename):
+    """
+    :param str filename: The path of the file.
+    :return int: The number of lines in the file, counted without holding them all in memory.
+    """
+    with open(filename, encoding="utf-8") as f:
+        return sum(1 for _ in f)
+
+
+def sample_species(internal_names, pages):
+    """
+    :param list[str] internal_names: The internal names of every Pokémon, in dex order.
+    :param int pages: The number of Pokémon to choose.
+    :return list[str]: The internal names of Pokémon spread evenly across the dex.
+    """
+    step = max(1, len(internal_names) // pages)
+    return internal_names[::step][:pages]
+
+
+def run_stages(pages, memory=False):
+    """
+    Runs every stage once on the game data of the current directory, timing each or tracing the peak memory each
+    allocates. Anything loaded by one stage is kept for the next, just as in a batch run.
+
+    :param int pages: The number of pages to generate in the page stage.
+    :param bool memory: Whether to trace the peak memory allocated by each stage rather than time it.
+    :return dict: The time (in seconds) or peak memory (in bytes) of each stage, with the number of pages generated and
+        how many failed.
+    """
+    results = {}
+    failures = 0
+
+    def parse():
+        for filename in GAME_DATA_FILES:
+            read_file_lines(filename)
+        preload_references()
+
+    def index():
+        preload_indexes()
+        build_dex_index()
+        resolve_obtainability()
+
+    def page():
+        nonlocal failures
+        for internal_name in sample_species(all_species(), pages):
+            try:
+                create_wiki_page(internal_name).create_sections()
+            except Exception:  # pylint: disable=broad-except
+                failures += 1
+
+    if memory:
+        tracemalloc.start()
+    for stage, run in zip(STAGES, (parse, index, page)):
+        if memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            run()
+            results[stage] = tracemalloc.get_traced_memory()[1] - before
+        else:
+            start = time.perf_counter()
+            run()
+            results[stage] = time.perf_counter() - start
+    if memory:
+        tracemalloc.stop()
+    return {"Stages": results, "Pages": len(sample_species(all_species(), pages)), "Failures": failures}
+
+
+def measure_scale(data_dir, pages):
+    """
+    Measures the time and memory of every stage on the game data of a directory, each in a fresh process.
+
+    :param str data_dir: The directory holding the gamedata and references directories.
+    :param int pages: The number of pages to generate in the page stage.
+    :return dict: The time and peak memory of each stage, with the number of pages generated and how many failed.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (REPO_ROOT, os.environ.get("PYTHONPATH")))))
+    runs = []
+    for flags in ([], ["--memory"]):
+        output = subprocess.run([sys.executable, "-m", "benchmarks.data_scaling", "--measure", "--pages", str(pages), *flags],
+                                cwd=data_dir, env=env, capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(output.splitlines()[-1]))
+    timed, traced = runs
+    return {"Pages": timed["Pages"], "Failures": timed["Failures"], "Time": timed["Stages"], "Memory": traced["Stages"]}
+
+
+def print_results(results):
+    """
+    Prints the time, peak memory and growth of each stage at every scale.
+
+    :param dict[int, dict] results: The results of each scale, as from measure_scale, along with its line count.
+    """
+    print(f"{'Scale':>6} {'Lines':>12}" + "".join(f" {stage + ' (s)':>11} {'MiB':>8} {'Growth':>7}" for stage in STAGES))
+    smallest = min(results)
+    for scale, result in sorted(results.items()):
+        row = f"{scale:>5}x {result['Lines']:>12,}"
+        for stage in STAGES:
+            elapsed = result["Time"][stage]
+            first = results[smallest]["Time"][stage]
+            growth = elapsed / first / (scale / smallest) if first else float("nan")
+            row += f" {elapsed:>11.3f} {result['Memory'][stage] / 2 ** 20:>8.1f} {growth:>7.2f}"
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks parsing, indexing and page generation on synthetic game data of growing size.")
+    parser.add_argument("--scales", metavar="N", type=int, nargs="+", default=[1, 10, 100], help="how many times larger than the real data to make it (default: 1 10 100)")
+    parser.add_argument("--pages", metavar="N", type=int, default=50, help="the number of pages to generate at every scale (default: 50)")
+    parser.add_argument("--data-dir", metavar="DIR", help="the directory to keep the synthetic data in, with a subdirectory per scale, which is reused if there (default: a temporary directory)")
+    parser.add_argument("--json", metavar="FILE", help="also write the results to a JSON file")
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--memory", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    if args.measure:
+        # Run from the directory of a single scale's synthetic data by measure_scale
+        print(json.dumps(run_stages(args.pages, args.memory)))
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_root = args.data_dir or temp_dir
+        source = None
+        results = {}
+        for scale in sorted(set(args.scales)):
+            data_dir = os.path.join(data_root, f"x{scale}")
+            if not all(os.path.exists(os.path.join(data_dir, filename)) for filename in GAME_DATA_FILES):
+                print(f"Generating {scale}x game data into '{data_dir}'...")
+                source = source or SyntheticData()
+                source.write(scale, data_dir)
+            print(f"Measuring {scale}x game data...")
+            results[scale] = measure_scale(data_dir, args.pages)
+            results[scale]["Lines"] = sum(count_lines(os.path.join(data_dir, filename)) for filename in GAME_DATA_FILES)
+
+    print(f"\n{args.pages} pages generated at every scale; growth is relative to {min(results)}x, where 1.00 is linear.\n")
+    print_results(results)
+    failures = {scale: result["Failures"] for scale, result in results.items() if result["Failures"]}
+    if failures:
+        print("\nPages failed at some scales, as some Pokémon fail in the real data too: "
+              + ", ".join(f"{count} at {scale}x" for scale, count in failures.items()) + ".")
+
+    if args.json:
+        with open(args.json + ".part", "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1)
+        os.replace(args.json + ".part", args.json)
+        print(f"\nThe results have been written to '{args.json}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+# pylint: disable=locally-disabled, line-too-long
+"""
+Checks that every output of the repository is unchanged, byte for byte, against stored golden outputs: the wiki page of
+every Pokémon in the dex, the lists of listgenerator, and the speed tier tables of speedfinder. Any rewrite meant to
+change only how fast the outputs are made, and not the outputs themselves, should pass.
+
+Pages are generated over a pool of worker processes while listgenerator and speedfinder run alongside, each in its own
+process from a scratch copy of its directory, so the lists and workbook committed there are never overwritten. The speed
+tiers are compared through the CSV files speedfinder writes with --csv --all-stats, as the workbook itself is not the
+same byte for byte from one run to the next.
+
+Every difference is reported by section: for a page, the sections that differ (found as in staleness.split_sections),
+whether it fails or no longer fails, and for the lists and speed tables, each file and how many of its lines differ. The
+time taken by each part of the run is shown next to that of the run the golden outputs came from. The check exits with
+a failure if anything differs. Run from the root of the repository:
+
+    python -m benchmarks.golden --update
+    python -m benchmarks.golden
+    python -m benchmarks.golden --jobs 8 --diff-lines 20 --out new
+
+Golden outputs are only ever written by --update, which replaces them in full, and should be regenerated on a commit
+whose outputs are known to be right, e.g., before starting a rewrite, and again after any intended change to the
+outputs or the game data.
+
+Format of manifest.json: {"Times": {"Part": float}, "Pages": {"InternalName": {"File": str | None, "Error": str | None}}}
+"""
+import argparse
+import difflib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from batch import all_species, run_batch
+from staleness import split_sections
+
+# The special scripts whose outputs are checked, by the directory their outputs are kept in: the directory each is run
+# from, its command line, and the ending of the name of every file it writes that is checked
+SPECIAL_SCRIPTS = {
+    "lists": ("specialscripts/listgenerator", ["listgenerator.py"], "_list.txt"),
+    "speedtiers": ("specialscripts/speedfinder", ["speedfinder.py", "--csv", "--all-stats"], ".csv"),
+}
+
+# Every part of a run, in the order they are reported
+PARTS = ("pages", *SPECIAL_SCRIPTS)
+
+# The root of the repository, which the special scripts need on their path
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_special_script(name):
+    """
+    Starts a special script from a scratch copy of its directory, laid out as in the repository so that its relative
+    paths to the game data and reference dictionaries still work.
+
+    The script is run by this module in a process of its own with --time-script, which times the script alone, so that
+    its time is known without waiting on it here.
+
+    :param str name: The name of the special script, as in SPECIAL_SCRIPTS.
+    :return tuple[subprocess.Popen, str]: The process timing the script, and the scratch directory it runs in.
+    """
+    script_dir, _, suffix = SPECIAL_SCRIPTS[name]
+    scratch = tempfile.mkdtemp()
+    for data_dir in ("gamedata", "references"):
+        os.symlink(os.path.join(REPO_ROOT, data_dir), os.path.join(scratch, data_dir))
+    # Earlier outputs are left out, so that only the files written by this run are checked
+    work_dir = os.path.join(scratch, script_dir)
+    shutil.copytree(os.path.join(REPO_ROOT, script_dir), work_dir, ignore=shutil.ignore_patterns("__pycache__", "*" + suffix))
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (REPO_ROOT, os.environ.get("PYTHONPATH")))))
+    process = subprocess.Popen([sys.executable, "-m", "benchmarks.golden", "--time-script", name], cwd=work_dir, env=env,  # pylint: disable=consider-using-with
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    return process, scratch
+
+
+def time_special_script(name):
+    """
+    Runs a special script from the current directory, as started by start_special_script.
+
+    :param str name: The name of the special script, as in SPECIAL_SCRIPTS.
+    :return dict[str, float | str | None]: The time taken, in seconds, and any error.
+    """
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, *SPECIAL_SCRIPTS[name][1]], capture_output=True, text=True, check=False)
+    elapsed = time.perf_counter() - start
+    error = (process.stderr.strip().splitlines() or [f"exit code {process.returncode}"])[-1] if process.returncode else None
+    return {"Time": elapsed, "Error": error}
+
+
+def finish_special_script(name, process, scratch, out_dir):
+    """
+    Waits for a special script started by start_special_script, keeps the files it wrote, and removes its scratch
+    directory.
+
+    :param str name: The name of the special script, as in SPECIAL_SCRIPTS.
+    :param subprocess.Popen process: The process timing the script.
+    :param str scratch: The scratch directory it ran in.
+    :param str out_dir: The directory to keep the files it wrote in.
+    :return tuple[float, str | None]: The time taken, in seconds, and any error.
+    """
+    script_dir, _, suffix = SPECIAL_SCRIPTS[name]
+    try:
+        stdout, stderr = process.communicate()
+        if process.returncode:
+            return 0.0, (stderr.strip().splitlines() or [f"exit code {process.returncode}"])[-1]
+        result = json.loads(stdout.splitlines()[-1])
+        if result["Error"] is not None:
+            return result["Time"], result["Error"]
+
+        os.makedirs(out_dir, exist_ok=True)
+        work_dir = os.path.join(scratch, script_dir)
+        for filename in os.listdir(work_dir):
+            if filename.endswith(suffix):
+                shutil.copyfile(os.path.join(work_dir, filename), os.path.join(out_dir, filename))
+        return result["Time"], None
+    finally:
+        shutil.rmtree(scratch)
+
+
+def generate_outputs(out_dir, jobs):
+    """
+    Generates every output into a directory: the page of every Pokémon in the dex into "pages", with which file each
+    was written to or why it failed in manifest.json, and the files written by each special script into its own
+    directory. The special scripts run in processes of their own while the pages are generated, without any thread in
+    this process, which would not survive the pool of worker processes being forked.
+
+    :param str out_dir: The directory to write every output into, which is created if needed.
+    :param int jobs: The number of worker processes to generate pages over.
+    :return tuple[dict[str, float], dict[str, str]]: The time taken by each part and by the whole run, in seconds, and
+        the error of every special script that failed.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    times, errors = {}, {}
+    scripts = {name: start_special_script(name) for name in SPECIAL_SCRIPTS}
+    try:
+        results = run_batch(all_species(), os.path.join(out_dir, "pages"), jobs=jobs)
+        times["pages"] = time.perf_counter() - start
+    finally:
+        for name, (process, scratch) in scripts.items():
+            times[name], error = finish_special_script(name, process, scratch, os.path.join(out_dir, name))
+            if error is not None:
+                errors[name] = error
+    times["total"] = time.perf_counter() - start
+
+    manifest = {"Times": times, "Pages": {internal_name: {"File": result["File"], "Error": result["Error"]}
+                                          for internal_name, result in results.items()}}
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    return times, errors
+
+
+def load_manifest(out_dir):
+    """
+    :param str out_dir: A directory of outputs, as written by generate_outputs.
+    :return dict: Its manifest, or an empty one if there is none.
+    """
+    path = os.path.join(out_dir, "manifest.json")
+    if not os.path.exists(path):
+        return {"Times": {}, "Pages": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read().split("\n")
+
+
+def _diff(golden_lines, new_lines, name):
+    """
+    :return list[str]: The lines of a unified diff, with one line of context around each change.
+    """
+    return list(difflib.unified_diff(golden_lines, new_lines, f"golden/{name}", f"new/{name}", n=1, lineterm=""))
+
+
+def _changed_lines(diff):
+    return sum(1 for line in diff[2:] if line[:1] in "+-")
+
+
+def compare_pages(golden_dir, out_dir):
+    """
+    Compares the page of every Pokémon against its golden page, finding the sections of each that differ.
+
+    :param str golden_dir: The directory of golden outputs.
+    :param str out_dir: The directory of new outputs.
+    :return dict: The number of pages checked, what differs about each page that differs, by internal name, the number
+        of pages each section differs on, and the diff of each page that differs.
+    """
+    golden, new = load_manifest(golden_dir)["Pages"], load_manifest(out_dir)["Pages"]
+    differences, sections, diffs = {}, Counter(), {}
+    for internal_name in dict.fromkeys([*golden, *new]):
+        old_page, new_page = golden.get(internal_name), new.get(internal_name)
+        if old_page is None or new_page is None:
+            differences[internal_name] = "new page" if old_page is None else "no longer generated"
+            sections["(pages)"] += 1
+            continue
+        if old_page["Error"] or new_page["Error"]:
+            if old_page["Error"] != new_page["Error"]:
+                if new_page["Error"] is None:
+                    differences[internal_name] = f"no longer fails (was {old_page['Error']})"
+                elif old_page["Error"] is None:
+                    differences[internal_name] = f"fails: {new_page['Error']}"
+                else:
+                    differences[internal_name] = f"fails differently: {new_page['Error']} (was {old_page['Error']})"
+                sections["(failures)"] += 1
+            continue
+
+        old_path = os.path.join(golden_dir, "pages", old_page["File"])
+        new_path = os.path.join(out_dir, "pages", new_page["File"])
+        with open(old_path, "rb") as old_file, open(new_path, "rb") as new_file:
+            if old_page["File"] == new_page["File"] and old_file.read() == new_file.read():
+                continue
+
+        old_lines, new_lines = _read_lines(old_path), _read_lines(new_path)
+        old_sections, new_sections = split_sections("\n".join(old_lines)), split_sections("\n".join(new_lines))
+        keys = [key for key in dict.fromkeys([*old_sections, *new_sections]) if old_sections.get(key) != new_sections.get(key)]
+        if old_page["File"] != new_page["File"]:
+            keys.insert(0, f"(file name {old_page['File']} -> {new_page['File']})")
+        # Differences in whitespace alone are ignored when splitting a page into sections
+        keys = keys or ["(whitespace)"]
+        differences[internal_name] = "differs in " + ", ".join(keys)
+        sections.update(keys)
+        diffs[internal_name] = _diff(old_lines, new_lines, new_page["File"])
+    return {"Checked": len(new), "Differences": differences, "Sections": sections, "Diffs": diffs}
+
+
+def compare_files(golden_dir, out_dir):
+    """
+    Compares every file of a special script against its golden file, each of which counts as its own section.
+
+    :param str golden_dir: The golden directory of the special script's outputs.
+    :param str out_dir: The new directory of the special script's outputs.
+    :return dict: The number of files checked, what differs about each file that differs, by file name, and the diff of
+        each file that differs.
+    """
+    golden = set(os.listdir(golden_dir)) if os.path.isdir(golden_dir) else set()
+    new = set(os.listdir(out_dir)) if os.path.isdir(out_dir) else set()
+    differences, diffs = {}, {}
+    for filename in sorted(golden | new):
+        if filename not in golden or filename not in new:
+            differences[filename] = "new file" if filename not in golden else "no longer written"
+            continue
+        with open(os.path.join(golden_dir, filename), "rb") as old_file, open(os.path.join(out_dir, filename), "rb") as new_file:
+            if old_file.read() == new_file.read():
+                continue
+        diff = _diff(_read_lines(os.path.join(golden_dir, filename)), _read_lines(os.path.join(out_dir, filename)), filename)
+        changed = _changed_lines(diff)
+        differences[filename] = f"{changed} lines differ" if changed else "differs in line endings or encoding"
+        diffs[filename] = diff
+    return {"Checked": len(new), "Differences": differences, "Diffs": diffs}
+
+
+def compare_outputs(golden_dir, out_dir):
+    """
+    Compares every new output against the golden outputs.
+
+    :param str golden_dir: The directory of golden outputs.
+    :param str out_dir: The directory of new outputs.
+    :return dict[str, dict]: The comparison of each part, as from compare_pages or compare_files.
+    """
+    report = {"pages": compare_pages(golden_dir, out_dir)}
+    for name in SPECIAL_SCRIPTS:
+        report[name] = compare_files(os.path.join(golden_dir, name), os.path.join(out_dir, name))
+    return report
+
+
+def print_times(times, golden_times=None):
+    """
+    Prints the time taken by each part of a run, next to that of the golden run if known.
+
+    :param dict[str, float] times: The time taken by each part and by the whole run, in seconds.
+    :param dict[str, float] | None golden_times: The same for the run the golden outputs came from.
+    """
+    golden_times = golden_times or {}
+    print(f"{'Part':<12} {'Time (s)':>10} {'Golden (s)':>11} {'Change':>8}")
+    for part in (*PARTS, "total"):
+        old = golden_times.get(part)
+        golden = f"{old:>11.2f} {times[part] / old - 1:>+8.1%}" if old else f"{'-':>11} {'-':>8}"
+        print(f"{part:<12} {times[part]:>10.2f} {golden}")
+
+
+def print_report(report, diff_lines=0):
+    """
+    Prints every difference found, by part and by section.
+
+    :param dict[str, dict] report: The comparison of each part, as from compare_outputs.
+    :param int diff_lines: The most lines of each diff to show, if any.
+    """
+    for part in PARTS:
+        result = report[part]
+        if not result["Differences"]:
+            print(f"\n{part}: all {result['Checked']} match.")
+            continue
+        print(f"\n{part}: {len(result['Differences'])} of {result['Checked']} differ.")
+        # Each file of a special script is a section of its own, so only pages are summed up by section
+        if "Sections" in result:
+            print("  By section: " + ", ".join(f"{key} ({count} pages)" for key, count in result["Sections"].most_common()))
+        for item, difference in result["Differences"].items():
+            print(f"  {item}: {difference}")
+            diff = result["Diffs"].get(item, [])
+            for line in diff[:diff_lines]:
+                print(f"    {line}")
+            if diff_lines and len(diff) > diff_lines:
+                print(f"    ... {len(diff) - diff_lines} more lines")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Checks every page, list and speed tier table against stored golden outputs.")
+    parser.add_argument("--golden", metavar="DIR", default="benchmarks/golden", help="the directory of golden outputs (default: benchmarks/golden)")
+    parser.add_argument("--update", action="store_true", help="regenerate the golden outputs rather than checking against them")
+    parser.add_argument("--jobs", metavar="N", type=int, default=os.cpu_count() or 1, help="the number of processes to generate pages over (default: every CPU)")
+    parser.add_argument("--out", metavar="DIR", help="keep the new outputs in this directory (default: a temporary directory)")
+    parser.add_argument("--time-script", choices=SPECIAL_SCRIPTS, help=argparse.SUPPRESS)
+    parser.add_argument("--diff-lines", metavar="N", type=int, default=0, help="show up to N lines of the diff of everything that differs (default: 0)")
+    args = parser.parse_args()
+
+    if args.time_script:
+        # Run from the scratch directory of a single special script by start_special_script
+        print(json.dumps(time_special_script(args.time_script)))
+        return 0
+
+    has_golden = os.path.exists(os.path.join(args.golden, "manifest.json"))
+    if not args.update and not has_golden:
+        print(f"No golden outputs found in '{args.golden}'; generate them with --update.")
+        return 1
+    # Only a directory of golden outputs is ever replaced, and nothing is ever written over
+    if args.update and not has_golden and os.path.isdir(args.golden) and os.listdir(args.golden):
+        parser.error(f"'{args.golden}' is not empty and does not hold golden outputs")
+    if args.out and os.path.isdir(args.out) and os.listdir(args.out):
+        parser.error(f"'{args.out}' is not empty")
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        out_dir = args.out or os.path.join(temp_dir, "new")
+        print(f"Generating every page over {args.jobs} processes, with {', '.join(SPECIAL_SCRIPTS)} alongside...")
+        times, errors = generate_outputs(out_dir, args.jobs)
+        for name, error in errors.items():
+            print(f"{name} failed: {error}")
+
+        if args.update:
+            if errors:
+                print("\nThe golden outputs have not been updated, as some special scripts failed.")
+                return 1
+            print_times(times)
+            # The new outputs replace the golden outputs in full, so nothing stale is ever left behind
+            if os.path.exists(args.golden):
+                shutil.rmtree(args.golden)
+            shutil.copytree(out_dir, args.golden)
+            pages = load_manifest(args.golden)["Pages"]
+            print(f"\nThe golden outputs of {len(pages)} pages ({sum(1 for page in pages.values() if page['Error'])} failing) "
+                  f"and every special script have been written to '{args.golden}'.")
+            return 0
+
+        print_times(times, load_manifest(args.golden)["Times"])
+        report = compare_outputs(args.golden, out_dir)
+    print_report(report, args.diff_lines)
+
+    different = [part for part in PARTS if report[part]["Differences"]]
+    if different or errors:
+        print(f"\nOutputs differ from the golden outputs in {', '.join(different or errors)}.")
+        return 1
+    print("\nEvery output matches the golden outputs.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+# pylint: disable=locally-disabled, line-too-long
+"""
+Benchmarks how whole-dex page generation scales with the number of worker processes.
+
+Every page in the dex is generated once for each number of workers (1, 2, 4 and 8 by default), after a warm-up run, and
+the wall time, throughput, and speedup over a single process are printed. Run from the root of the repository, so the
+game data and reference dictionaries can be found:
+
+    python -m benchmarks.parallel_scaling
+    python -m benchmarks.parallel_scaling --jobs 1 2 4 8 16 --repeats 3
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from batch import all_species, run_batch
+
+
+def time_batch(internal_names, jobs, repeats):
+    """
+    Times a batch run of the given Pokémon over a number of workers, keeping the best of a number of repeats.
+
+    :param list[str] internal_names: The internal names of the Pokémon to generate pages for.
+    :param int jobs: The number of worker processes to use.
+    :param int repeats: The number of times to repeat the run.
+    :return float: The best wall time of the runs, in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        with tempfile.TemporaryDirectory() as out_dir:
+            start = time.perf_counter()
+            run_batch(internal_names, out_dir, jobs=jobs)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks whole-dex page generation over multiple worker processes.")
+    parser.add_argument("--jobs", metavar="N", type=int, nargs="+", default=[1, 2, 4, 8], help="the numbers of workers to benchmark")
+    parser.add_argument("--repeats", metavar="N", type=int, default=3, help="the number of runs for each number of workers")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    internal_names = all_species()
+    print(f"Benchmarking {len(internal_names)} pages on {os.cpu_count()} CPUs, best of {args.repeats} runs.")
+
+    # Warm up the caches of this process, which every later run (and worker) then shares
+    time_batch(internal_names, 1, 1)
+
+    print(f"{'Jobs':>6} {'Time (s)':>10} {'Pages/s':>10} {'Speedup':>8}")
+    baseline = None
+    for jobs in args.jobs:
+        elapsed = time_batch(internal_names, jobs, args.repeats)
+        baseline = baseline or elapsed
+        print(f"{jobs:>6} {elapsed:>10.3f} {len(internal_names) / elapsed:>10.1f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
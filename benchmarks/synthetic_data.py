@@ -0,0 +1,256 @@
+# pylint: disable=locally-disabled, line-too-long
+"""
+Generates synthetic game data many times the size of the real game data, for benchmarking how parsing, indexing and
+page generation scale with the size of their input.
+
+The synthetic data is made of copies of the real game data, so every file is valid and has the same mix of cases, e.g.,
+long learnsets, alternate forms, and Pokémon found in many zones. Every copy after the first is renamed consistently
+across every file, so that each copy is a distinct set of Pokémon that only refers to itself:
+
+- Internal names gain a suffix of letters only, as encounter tables are read with every digit removed, e.g., BULBASAUR
+  becomes BULBASAURSYND in the fourth copy, wherever they appear: the sections of pokemon.txt and their evolutions, the
+  learners of each move in tm.txt, the encounters of encounters.txt, and the reference dictionaries keyed by or
+  referring to Pokémon.
+- Internal numbers, dex numbers and zone IDs are offset by a multiple of a power of ten larger than any real one, e.g.,
+  dex number "X031" becomes "X3031", and display names gain the number of their copy, e.g., "Bulbasaur 3".
+
+The learners of each move in tm.txt are added to the move's existing line rather than as new moves, as TM and tutor moves
+are told apart by their line number. Reference dictionaries with nothing to rename are copied as they are.
+
+The few Pokémon that the page code handles by their internal name, e.g., the Eeveelutions, are handled as any other
+Pokémon in every copy after the first, so their pages may differ from, or fail unlike, those of the real data. Run from
+the root of the repository:
+
+    python -m benchmarks.synthetic_data --scale 10 --out synthetic/x10
+    python -m benchmarks.synthetic_data --scale 1000 --out synthetic/x1000
+"""
+import argparse
+import json
+import os
+import shutil
+from data_collection import read_file_lines
+from dex_index import split_dex_number
+
+# The suffix added to the internal names of every copy after the first, followed by the number of the copy in letters,
+# i.e., with A for 0 through to J for 9
+NAME_SUFFIX = "SYN"
+
+# The reference dictionaries keyed by or referring to internal names, internal numbers or zone IDs, which are renamed in
+# every copy; every other reference dictionary is copied as it is
+RENAMED_REFERENCES = ("pokemon_info.json", "species_and_dex_entry.json", "evolution_info.json", "static_encounters.json",
+                      "location_info.json")
+
+
+def _stride(numbers):
+    """
+    :param Iterable[int] numbers: Every number used in the real data.
+    :return int: The smallest power of ten larger than every number, which each copy is offset by a multiple of.
+    """
+    return 10 ** len(str(max(numbers)))
+
+
+class SyntheticData:
+    """
+    Simple class renaming the real game data into any number of distinct copies.
+    """
+    def __init__(self, source_dir="."):
+        """
+        The init function of SyntheticData.
+
+        :param str source_dir: The directory holding the real gamedata and references directories.
+        """
+        self.source_dir = source_dir
+        self.pokemon_lines = read_file_lines(os.path.join(source_dir, "gamedata", "pokemon.txt"))
+        self.tm_lines = read_file_lines(os.path.join(source_dir, "gamedata", "tm.txt"))
+        self.encounter_lines = read_file_lines(os.path.join(source_dir, "gamedata", "encounters.txt"))
+        self.references = {filename: self._load_reference(filename) for filename in RENAMED_REFERENCES}
+
+        self.names = {line.split("=", 1)[1] for line in self.pokemon_lines if line.startswith("InternalName=")}
+        self.number_stride = _stride(int(line.strip("[]")) for line in self.pokemon_lines if self._is_number_line(line))
+        self.dex_stride = _stride(split_dex_number(dex)[1] for dex in self.references["pokemon_info.json"])
+        self.zone_stride = _stride(int(zone) for zone in self.references["location_info.json"])
+
+    def _load_reference(self, filename):
+        with open(os.path.join(self.source_dir, "references", filename), encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _is_number_line(line):
+        return line.startswith("[") and line.endswith("]") and line[1:-1].isdigit()
+
+    def rename(self, name, copy):
+        """
+        :param str name: A string from the real data, which may be an internal name.
+        :param int copy: The number of the copy, where 0 is the real data.
+        :return str: The string in the copy, which only differs if it is an internal name.
+        """
+        if not copy or name not in self.names:
+            return name
+        return name + NAME_SUFFIX + "".join(chr(ord("A") + int(digit)) for digit in str(copy))
+
+    def _rename_list(self, line, copy):
+        return ",".join(self.rename(name, copy) for name in line.split(","))
+
+    def _renumber_dex(self, dex, copy):
+        """
+        :param str dex: A dex number, e.g., "X031" or "030_1".
+        :param int copy: The number of the copy.
+        :return str: The dex number in the copy, e.g., "X3031".
+        """
+        region, number = split_dex_number(dex)
+        form = dex[dex.index("_"):] if "_" in dex else ""
+        return f"{region}{str(number + copy * self.dex_stride).zfill(3)}{form}"
+
+    def _renumber_regional(self, regional_numbers, copy):
+        """
+        Offsets the regional numbers of a Pokémon so that utility_methods.find_dex_number gives its renumbered dex
+        number, skipping the missing X030 in the Xenodex just as the real data does.
+
+        :param str regional_numbers: The regional numbers, e.g., "0,31,0".
+        :param int copy: The number of the copy.
+        :return str: The regional numbers in the copy.
+        """
+        parts = regional_numbers.split(",")
+        for idx, part in enumerate(parts):
+            if part != "0":
+                number = int(part) + copy * self.dex_stride
+                if idx == 1 and int(part) <= 29:
+                    number += 1
+                parts[idx] = str(number)
+                break
+        return ",".join(parts)
+
+    def pokemon_copy(self, copy):
+        """
+        :param int copy: The number of the copy.
+        :return Iterator[str]: The lines of pokemon.txt in the copy.
+        """
+        for line in self.pokemon_lines:
+            if copy == 0:
+                yield line
+            elif self._is_number_line(line):
+                yield f"[{int(line[1:-1]) + copy * self.number_stride}]"
+            elif line.startswith("InternalName="):
+                yield "InternalName=" + self.rename(line.split("=", 1)[1], copy)
+            elif line.startswith("Evolutions="):
+                yield "Evolutions=" + self._rename_list(line.split("=", 1)[1], copy)
+            elif line.startswith("RegionalNumbers="):
+                yield "RegionalNumbers=" + self._renumber_regional(line.split("=", 1)[1], copy)
+            else:
+                yield line
+
+    def tm_lines_scaled(self, copies):
+        """
+        :param int copies: The number of copies.
+        :return Iterator[str]: The lines of tm.txt, with the learners of every copy on each move's line.
+        """
+        for line in self.tm_lines:
+            if line.startswith(("[", "#")) or not line:
+                yield line
+            else:
+                yield ",".join(self._rename_list(line, copy) for copy in range(copies))
+
+    def encounter_copy(self, copy):
+        """
+        :param int copy: The number of the copy.
+        :return Iterator[str]: The lines of encounters.txt in the copy, with every zone renumbered.
+        """
+        for line in self.encounter_lines:
+            if copy == 0:
+                yield line
+            elif "#" in line and line.split("#")[0].strip():
+                zone, comment = line.split("#", 1)
+                yield f"{str(int(zone) + copy * self.zone_stride).zfill(3)} #{comment}"
+            elif "," in line and line.split(",")[0] in self.names:
+                name, levels = line.split(",", 1)
+                yield f"{self.rename(name, copy)},{levels}"
+            else:
+                yield line
+
+    def _rename_value(self, value, copy):
+        if isinstance(value, dict):
+            return {self.rename(key, copy): self._rename_value(item, copy) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._rename_value(item, copy) for item in value]
+        return self.rename(value, copy) if isinstance(value, str) else value
+
+    def references_scaled(self, copies):
+        """
+        :param int copies: The number of copies.
+        :return dict[str, dict]: Every renamed reference dictionary, holding the entries of every copy, by file name.
+        """
+        scaled = {filename: {} for filename in RENAMED_REFERENCES}
+        for copy in range(copies):
+            for dex, info in self.references["pokemon_info.json"].items():
+                scaled["pokemon_info.json"][self._renumber_dex(dex, copy)] = {
+                    "InternalName": self.rename(info["InternalName"], copy),
+                    "DisplayName": f"{info['DisplayName']} {copy}" if copy else info["DisplayName"]}
+            for number, entry in self.references["species_and_dex_entry.json"].items():
+                scaled["species_and_dex_entry.json"][str(int(number) + copy * self.number_stride)] = entry
+            for zone, location in self.references["location_info.json"].items():
+                scaled["location_info.json"][str(int(zone) + copy * self.zone_stride).zfill(3)] = location
+            for filename in ("evolution_info.json", "static_encounters.json"):
+                scaled[filename].update(self._rename_value(self.references[filename], copy))
+        return scaled
+
+    def write(self, copies, out_dir):
+        """
+        Writes the game data and reference dictionaries of a number of copies into a directory laid out as the root of
+        the repository, with gamedata and references directories.
+
+        :param int copies: The number of copies, i.e., how many times larger than the real data to make it.
+        :param str out_dir: The directory to write into, which is created if needed.
+        :return dict[str, int]: The number of lines written to each file of game data.
+        """
+        gamedata_dir, references_dir = os.path.join(out_dir, "gamedata"), os.path.join(out_dir, "references")
+        os.makedirs(gamedata_dir, exist_ok=True)
+        os.makedirs(references_dir, exist_ok=True)
+
+        line_counts = {}
+        for filename, lines in (("pokemon.txt", (line for copy in range(copies) for line in self.pokemon_copy(copy))),
+                                ("tm.txt", self.tm_lines_scaled(copies)),
+                                ("encounters.txt", (line for copy in range(copies) for line in self.encounter_copy(copy)))):
+            path = os.path.join(gamedata_dir, filename)
+            count = 0
+            with open(path + ".part", "w", encoding="utf-8") as f:
+                for line in lines:
+                    f.write(line + "\n")
+                    count += 1
+            os.replace(path + ".part", path)
+            line_counts[filename] = count
+
+        scaled = self.references_scaled(copies)
+        for filename in os.listdir(os.path.join(self.source_dir, "references")):
+            path = os.path.join(references_dir, filename)
+            if filename in scaled:
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(scaled[filename], f, ensure_ascii=False, indent=4)
+            elif filename.endswith(".json"):
+                shutil.copyfile(os.path.join(self.source_dir, "references", filename), path)
+        return line_counts
+
+
+def generate_synthetic_data(copies, out_dir, source_dir="."):
+    """
+    Generates synthetic game data a number of times the size of the real game data.
+
+    :param int copies: How many times larger than the real data to make it, e.g., 10, 100 or 1000.
+    :param str out_dir: The directory to write the gamedata and references directories into.
+    :param str source_dir: The directory holding the real gamedata and references directories.
+    :return dict[str, int]: The number of lines written to each file of game data.
+    """
+    return SyntheticData(source_dir).write(copies, out_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates synthetic game data many times the size of the real game data.")
+    parser.add_argument("--scale", metavar="N", type=int, required=True, help="how many times larger than the real data to make it, e.g., 10, 100 or 1000")
+    parser.add_argument("--out", metavar="DIR", required=True, help="the directory to write the gamedata and references directories into")
+    args = parser.parse_args()
+
+    line_counts = generate_synthetic_data(args.scale, args.out)
+    print(f"Generated {args.scale}x game data into '{args.out}': " + ", ".join(f"{count:,} lines of {filename}" for filename, count in line_counts.items()) + ".")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# pylint: disable=locally-disabled, line-too-long
+"""
+Benchmarks the throughput of each generator method on a fixed sample of Pokémon, and of a whole-dex batch run, and
+checks every result against a stored baseline.
+
+Each metric is measured a number of times after some warm-up runs, and the best and median times are kept. A metric
+regresses if its best time is slower than its baseline by more than the threshold, in which case the benchmark exits
+with a failure, as it also does if there is no baseline to compare against. Run from the root of the repository, so the
+game data and reference dictionaries can be found:
+
+    python -m benchmarks.throughput --save
+    python -m benchmarks.throughput
+    python -m benchmarks.throughput --repeats 10 --threshold 0.1 --no-batch
+
+Baselines depend on the machine they were measured on, so should only be compared against runs on the same machine.
+
+Format: {"Sample": ["InternalName"], "Python": "Version", "Platform": "Platform", "Metrics": {"MetricName": {"Best":
+float, "Median": float, "Repeats": int}}}
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from batch import all_species, run_batch
+from wiki import SECTIONS, create_wiki_page
+
+# The Pokémon every generator method is timed on, chosen to cover long learnsets, many encounters, alternate forms and
+# evolution chains of different lengths
+SAMPLE = ("BULBASAUR", "CHARIZARD", "PIKACHU", "SHYLEON", "MAGIKARP", "GYARADOS", "KLANG", "ODDISHVINTAGE", "FERALIGATR",
+          "KIDOON")
+
+# The sections whose generator methods are timed, by section key
+BENCHMARKED_SECTIONS = ("infobox", "locations", "types", "level", "tm", "breed", "tutor", "evolution")
+
+
+def measure(run, warmup, repeats):
+    """
+    Times a function a number of times, after running it a number of times untimed.
+
+    :param Callable[[], float | None] run: The function to time, which may give back its own time, e.g., to leave out
+        any setup, or None to be timed as a whole.
+    :param int warmup: The number of untimed runs.
+    :param int repeats: The number of timed runs.
+    :return dict[str, float | int]: The best and median time of the timed runs, in seconds, and their number.
+    """
+    for _ in range(warmup):
+        run()
+    times = []
+    # As with timeit, garbage collection is turned off while timing, so that it cannot land in some runs but not others
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            elapsed = run()
+            times.append(time.perf_counter() - start if elapsed is None else elapsed)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {"Best": min(times), "Median": statistics.median(times), "Repeats": repeats}
+
+
+def time_section(key, internal_names, number=1):
+    """
+    Times the generator method of a section over every given Pokémon, leaving out the time taken to create each page
+    and generator, which is shared with other sections.
+
+    :param str key: The key of the section.
+    :param Iterable[str] internal_names: The internal names of the Pokémon.
+    :param int number: The number of times to create the section for each Pokémon.
+    :return float: The total time taken by the generator method, in seconds.
+    """
+    _, _, generator, provider = SECTIONS[key]
+    elapsed = 0.0
+    for _ in range(number):
+        for internal_name in internal_names:
+            method = getattr(getattr(create_wiki_page(internal_name), generator), provider)
+            start = time.perf_counter()
+            method()
+            elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def time_whole_dex(internal_names):
+    """
+    Times a single-process batch run of every given Pokémon into a temporary directory.
+
+    :param list[str] internal_names: The internal names of the Pokémon.
+    :return float: The time taken, in seconds.
+    """
+    with tempfile.TemporaryDirectory() as out_dir:
+        start = time.perf_counter()
+        run_batch(internal_names, out_dir)
+        return time.perf_counter() - start
+
+
+def run_benchmarks(warmup=2, repeats=7, number=20, batch=True):
+    """
+    Measures every metric: the time taken by each benchmarked generator method over the sample, and of a whole-dex
+    batch run.
+
+    :param int warmup: The number of untimed runs of each metric.
+    :param int repeats: The number of timed runs of each metric.
+    :param int number: The number of times each generator method is run over the sample in a single timed run.
+    :param bool batch: Whether to also measure the whole-dex batch run.
+    :return dict: The results, in the same format as a baseline.
+    """
+    metrics = {}
+    for key in BENCHMARKED_SECTIONS:
+        metrics[f"section.{SECTIONS[key][3]}"] = measure(lambda key=key: time_section(key, SAMPLE, number), warmup, repeats)
+    if batch:
+        internal_names = all_species()
+        metrics["batch.whole_dex"] = measure(lambda: time_whole_dex(internal_names), min(warmup, 1), max(1, repeats // 2))
+    return {"Sample": list(SAMPLE), "Python": platform.python_version(), "Platform": platform.platform(), "Metrics": metrics}
+
+
+def compare_results(results, baseline, threshold):
+    """
+    Compares the best time of every metric against a baseline.
+
+    :param dict results: The results of a run, as from run_benchmarks.
+    :param dict baseline: The baseline, in the same format.
+    :param float threshold: The largest slowdown allowed before a metric regresses, e.g., 0.2 for 20%.
+    :return dict[str, tuple[float | None, float, bool]]: The baseline's best time (None if the metric is new), the ratio
+        of the new best time to it, and whether it regressed, by metric.
+    """
+    comparison = {}
+    for name, result in results["Metrics"].items():
+        old = baseline.get("Metrics", {}).get(name)
+        if old is None:
+            comparison[name] = (None, 1.0, False)
+            continue
+        ratio = result["Best"] / old["Best"]
+        comparison[name] = (old["Best"], ratio, ratio > 1 + threshold)
+    return comparison
+
+
+def print_results(results, comparison):
+    """
+    Prints the best and median time of every metric, along with its change against the baseline, if any.
+
+    :param dict results: The results of a run, as from run_benchmarks.
+    :param dict[str, tuple[float | None, float, bool]] comparison: The comparison against the baseline, if any.
+    """
+    print(f"{'Metric':<40} {'Best (ms)':>10} {'Median (ms)':>12} {'Baseline (ms)':>14} {'Change':>8}")
+    for name, result in results["Metrics"].items():
+        old, ratio, regressed = comparison.get(name, (None, 1.0, False))
+        baseline = f"{old * 1000:>14.2f} {ratio - 1:>+8.1%}" if old is not None else f"{'-':>14} {'-':>8}"
+        print(f"{name:<40} {result['Best'] * 1000:>10.2f} {result['Median'] * 1000:>12.2f} {baseline}"
+              + ("  REGRESSED" if regressed else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks each generator method and a whole-dex batch run against a baseline.")
+    parser.add_argument("--baseline", metavar="FILE", default="benchmarks/baseline.json", help="the baseline to compare against (default: benchmarks/baseline.json)")
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline rather than comparing against it")
+    parser.add_argument("--threshold", metavar="RATIO", type=float, default=0.2, help="the slowdown that counts as a regression (default: 0.2, i.e., 20%%)")
+    parser.add_argument("--warmup", metavar="N", type=int, default=2, help="the number of untimed runs of each metric (default: 2)")
+    parser.add_argument("--repeats", metavar="N", type=int, default=7, help="the number of timed runs of each metric (default: 7)")
+    parser.add_argument("--number", metavar="N", type=int, default=20, help="the number of times each method runs over the sample per timed run (default: 20)")
+    parser.add_argument("--no-batch", action="store_true", help="skip the whole-dex batch run")
+    args = parser.parse_args()
+
+    # A missing baseline is found before benchmarking, as nothing could be checked against it
+    if not args.save and not os.path.exists(args.baseline):
+        print(f"No baseline found at '{args.baseline}'; store one with --save.")
+        return 1
+
+    logging.disable(logging.CRITICAL)
+    print(f"Benchmarking {len(BENCHMARKED_SECTIONS)} generator methods on {len(SAMPLE)} Pokémon"
+          + ("" if args.no_batch else " and a whole-dex batch run") + f", best of {args.repeats} runs.\n")
+    results = run_benchmarks(args.warmup, args.repeats, args.number, not args.no_batch)
+
+    if args.save:
+        print_results(results, {})
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1)
+        print(f"\nThe baseline has been written to '{args.baseline}'.")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        comparison = compare_results(results, json.load(f), args.threshold)
+    print_results(results, comparison)
+    regressions = [name for name, (_, _, regressed) in comparison.items() if regressed]
+    if regressions:
+        print(f"\n{len(regressions)} metrics regressed by more than {args.threshold:.0%}: {', '.join(regressions)}.")
+        return 1
+    print(f"\nNo metric regressed by more than {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
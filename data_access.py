@@ -4,10 +4,52 @@ Multiple JSON reference dictionaries are used in the program to match raw string
 either English translations or other information. These are externally made, but as the game's final version has been
 released, they are always up-to-date, not counting human error (my own). The dictionaries are loaded in the functions
 below, and are used in the main program to generate the wiki page.
+
+Each dictionary is only read from disk the first time it is accessed, and is then shared for the rest of the process.
+Every access is tracked, so that anything computed from the dictionaries knows exactly which entries it read.
 """
+import functools
+import glob
 import json
+from dependencies import tracked
+from profiling import count_file_read, count_json_parse, register_cache
+
+
+@register_cache
+@functools.cache
+def load_reference(filename):
+    """
+    Loads a reference dictionary from a JSON file, caching it for any later accesses.
+
+    :param str filename: The path to the JSON file to load.
+    :return dict: The loaded dictionary.
+    """
+    with open(filename, encoding="utf-8") as f:
+        reference = json.load(f)
+    count_file_read(filename)
+    count_json_parse()
+    return reference
+
+
+def preload_references(references_dir="references"):
+    """
+    Loads every reference dictionary up front, rather than the first time each one is accessed.
+
+    :param str references_dir: The directory containing the reference dictionaries.
+    """
+    for filename in sorted(glob.glob(f"{references_dir}/*.json")):
+        load_reference(filename.replace("\\", "/"))
+
+
+def clear_references():
+    """
+    Forgets every reference dictionary loaded so far, so each is read again the next time it is accessed, e.g., after
+    the files have been edited.
+    """
+    load_reference.cache_clear()
 
 
+@tracked
 def gender_code(gender):
     """
     Accesses dictionary of gender codes.
@@ -21,11 +63,11 @@ def gender_code(gender):
     :param string gender: The growth rate represented in pokemon.txt.
     :return string: The corresponding gender code.
     """
-    with open('references/gender_codes.json', encoding="utf-8") as f:
-        switch = json.load(f)
+    switch = load_reference('references/gender_codes.json')
     return switch.get(gender)
 
 
+@tracked
 def growth_rate(rate):
     """
     Accesses a dictionary of growth rates.
@@ -39,11 +81,11 @@ def growth_rate(rate):
     :param string rate: The growth rate as represented in pokemon.txt.
     :return string: The corresponding number representing the related experience group.
     """
-    with open('references/growth_rate.json', encoding="utf-8") as f:
-        switch = json.load(f)
+    switch = load_reference('references/growth_rate.json')
     return switch.get(rate)
 
 
+@tracked
 def tm_info(move):
     """
     Accesses a dictionary of TM info.
@@ -57,11 +99,11 @@ def tm_info(move):
     :param string move: The move represented in pokemon.txt and tm.txt in title case.
     :return string: A dictionary for the TMNo, STAB, and type.
     """
-    with open('references/tm_info.json', encoding="utf-8") as f:
-        switch = json.load(f)
+    switch = load_reference('references/tm_info.json')
     return switch.get(move)
 
 
+@tracked
 def move_info(move):
     """
     Accesses a dictionary of move info.
@@ -74,11 +116,11 @@ def move_info(move):
     :param string move: The move represented in pokemon.txt and tm.txt in title case.
     :return string: A dictionary for the move name, STAB, and type.
     """
-    with open('references/move_info.json', encoding="utf-8") as f:
-        switch = json.load(f)
+    switch = load_reference('references/move_info.json')
     return switch.get(move)
 
 
+@tracked
 def wild_item_info(item):
     """
     Accesses a dictionary of wild item info.
@@ -92,11 +134,11 @@ def wild_item_info(item):
     :param string item: The held item represented in pokemon.txt.
     :return string: The real, English name of the held item.
     """
-    with open('references/wild_item_info.json', encoding="utf-8") as f:
-        switch = json.load(f)
+    switch = load_reference('references/wild_item_info.json')
     return switch.get(item)
 
 
+@tracked
 def pokemon_info(dex):
     """
     Accesses a dictionary of Pokémon info.
@@ -110,11 +152,11 @@ def pokemon_info(dex):
     :param string dex: The dex number relating to the Pokémon.
     :return string: A dictionary for the internal name and display name.
     """
-    with open('references/pokemon_info.json', encoding="utf-8") as f:
-        switch = json.load(f)
+    switch = load_reference('references/pokemon_info.json')
     return switch.get(dex)
 
 
+@tracked
 def location_info(zone):
     """
     Accesses a dictionary of location info.
@@ -128,11 +170,11 @@ def location_info(zone):
     :param string zone: The numbered zone in terms of a string.
     :return string: The English name of the location the zone belongs to.
     """
-    with open('references/location_info.json', encoding="utf-8") as f:
-        switch = json.load(f)
+    switch = load_reference('references/location_info.json')
     return switch.get(zone)
 
 
+@tracked
 def ability_info(ability):
     """
     Accesses a dictionary of ability info.
@@ -146,11 +188,11 @@ def ability_info(ability):
     :param string ability: The ability name as it appears in pokemon.txt.
     :return string: The English, formatted name of the ability.
     """
-    with open('references/ability_info.json', encoding="utf-8") as f:
-        switch = json.load(f)
+    switch = load_reference('references/ability_info.json')
     return switch.get(ability)
 
 
+@tracked
 def ability_immunities(ability):
     """
     Accesses a dictionary of ability immunities.
@@ -163,11 +205,11 @@ def ability_immunities(ability):
     :param string ability: The ability name as it appears in pokemon.txt.
     :return string: The immunity gained by the Pokémon.
     """
-    with open('references/ability_immunities.json', encoding="utf-8") as f:
-        switch = json.load(f)
+    switch = load_reference('references/ability_immunities.json')
     return switch.get(ability)
 
 
+@tracked
 def static_encounters(pokemon):
     """
     Accesses a dictionary of static encounters.
@@ -181,11 +223,11 @@ def static_encounters(pokemon):
     :param string pokemon: The pokemon's internal name as it appears in pokemon.txt.
     :return dict[str, str]: A dictionary with location names as a key and the type of static encounter as a value.
     """
-    with open('references/static_encounters.json', encoding="utf-8") as f:
-        switch = json.load(f)
+    switch = load_reference('references/static_encounters.json')
     return switch.get(pokemon)
 
 
+@tracked
 def species_and_dex_entry(internal_num):
     """
     Accesses a dictionary of species names and entry numbers.
@@ -199,11 +241,11 @@ def species_and_dex_entry(internal_num):
     :param string internal_num: The pokemon's internal number as it appears in pokemon.txt.
     :return dict[str, str]: A dictionary for the species name and dex entry.
     """
-    with open('references/species_and_dex_entry.json', encoding="utf-8") as f:
-        switch = json.load(f)
+    switch = load_reference('references/species_and_dex_entry.json')
     return switch.get(internal_num)
 
 
+@tracked
 def location_order():
     """
     Accesses a dictionary of location names and index numbers.
@@ -216,11 +258,11 @@ def location_order():
 
     :return dict[str, int]: A dictionary of locations and associated indexes.
     """
-    with open('references/location_order.json', encoding="utf-8") as f:
-        switch = json.load(f)
+    switch = load_reference('references/location_order.json')
     return switch
 
 
+@tracked
 def evolution_info(internal_name):
     """
     Accesses a dictionary of evolution info.
@@ -234,6 +276,5 @@ def evolution_info(internal_name):
 
     :return dict[str, str | list[str] | dict[str, str]]: A dictionary of pre-evo, evo, and pre-evo method information.
     """
-    with open('references/evolution_info.json', encoding="utf-8") as f:
-        switch = json.load(f)
+    switch = load_reference('references/evolution_info.json')
     return switch.get(internal_name)
@@ -1,5 +1,8 @@
 # pylint: disable=locally-disabled, line-too-long, missing-module-docstring
+import functools
 import logging
+from dependencies import tracked
+from profiling import count_file_read, register_cache
 
 
 def read_file_lines(filename):
@@ -11,7 +14,9 @@ def read_file_lines(filename):
     :return list: The list of lines read from the file.
     """
     with open(filename, encoding="utf8") as file:
-        return [line.rstrip() for line in file.readlines()]
+        lines = [line.rstrip() for line in file.readlines()]
+    count_file_read(filename)
+    return lines
 
 
 def find_location_indices(idx, line_list):
@@ -37,9 +42,208 @@ def find_location_indices(idx, line_list):
     return start, end
 
 
+@register_cache
+@functools.cache
+def build_pokemon_index(pokemon_path="gamedata/pokemon.txt"):
+    """
+    Build an index of every Pokémon's raw section of pokemon.txt, keyed by internal name.
+
+    Every section starts with a line of the form "[InternalNumber]", followed by the Name and InternalName lines, and
+    runs until the next section. The index is built once per file and cached, so that looking up any one Pokémon no
+    longer needs a scan of the whole file.
+
+    :param str pokemon_path: The path to the file containing Pokémon data.
+    :return dict[str, tuple[str, ...]]: The lines of each Pokémon's section, including its "[InternalNumber]" line.
+    """
+    line_list = read_file_lines(pokemon_path)
+    index = {}
+    start = None
+    for idx, line in enumerate(line_list):
+        if line.startswith("InternalName="):
+            # The section of the previous Pokémon ends where the Number and Name lines of the next one begin
+            if start is not None:
+                index.setdefault(line_list[start + 2].split("=", 1)[1], tuple(line_list[start:idx - 2]))
+            start = idx - 2
+    if start is not None:
+        index.setdefault(line_list[start + 2].split("=", 1)[1], tuple(line_list[start:]))
+
+    return index
+
+
+@register_cache
+@functools.cache
+def build_move_index(tm_path="gamedata/tm.txt"):
+    """
+    Build an index of every TM and tutor move learnable by each Pokémon in tm.txt, keyed by internal name.
+
+    Every move in tm.txt is a "[MOVE]" line followed by a comma-separated line of the Pokémon able to learn it. Only exact
+    matches to an internal name are indexed, as X or other form Pokémon contain the same name (e.g.: SHYLEONX has SHYLEON
+    in it). The index is built once per file and cached.
+
+    :param str tm_path: The path to the file containing TM and tutor move data.
+    :return dict[str, tuple[list[str], list[str]]]: The TM moves and the tutor moves learnable by each Pokémon.
+    """
+    line_list = read_file_lines(tm_path)
+    index = {}
+    for idx, line in enumerate(line_list):
+        for name in dict.fromkeys(line.split(",")):
+            tm_list, tutor_list = index.setdefault(name, ([], []))
+
+            # All moves up to line 194 are TM moves, everything else are tutor moves
+            if idx < 194:
+                tm_list.append(line_list[idx - 1].strip("[]"))
+            else:
+                tutor_list.append(line_list[idx - 1].strip("[]"))
+
+    return index
+
+
+@register_cache
+@functools.cache
+def _encounter_lines(encounters_path="gamedata/encounters.txt"):
+    """
+    Read encounters.txt once, and group the position of every line by its text.
+
+    Many lines in encounters.txt are repeated (the same Pokémon at the same levels), so matching a Pokémon's name against
+    each distinct line is much faster than against every line.
+
+    :param str encounters_path: The path to the file containing encounter data.
+    :return tuple[list[str], dict[str, list[int]]]: The lines of the file, and the indices of each distinct line.
+    """
+    line_list = read_file_lines(encounters_path)
+    line_positions = {}
+    for idx, line in enumerate(line_list):
+        line_positions.setdefault(line, []).append(idx)
+    return line_list, line_positions
+
+
+@register_cache
+@functools.cache
+def build_encounter_index(encounters_path="gamedata/encounters.txt"):
+    """
+    Build an index of every Pokémon found in encounters.txt and the zones it can be encountered in.
+
+    Unlike DataCollection.extract_encounter_data, only exact matches to a Pokémon's internal name are indexed, so e.g.,
+    SHYLEON is not considered to be found in the zones of SHYLEONX. The index is built once per file and cached.
+
+    :param str encounters_path: The path to the file containing encounter data.
+    :return dict[str, list[str]]: The zone IDs each Pokémon can be encountered in, in order of appearance.
+    """
+    index = {}
+    zone_id = ""
+    for line in read_file_lines(encounters_path):
+        # Zone headers are of the form "002 # Relitto Meteora", and are separated by lines of hashes
+        if "#" in line:
+            zone_id = line.split("#")[0].rstrip() or zone_id
+            continue
+
+        # Encounter lines are of the form "NAME,MinLevel,MaxLevel"; biome names and encounter densities are skipped
+        name = line.split(",")[0]
+        if "," not in line or name.isdigit():
+            continue
+
+        zones = index.setdefault(name, [])
+        if zone_id not in zones:
+            zones.append(zone_id)
+
+    return index
+
+
+def preload_indexes(pokemon_path="gamedata/pokemon.txt", tm_path="gamedata/tm.txt", encounters_path="gamedata/encounters.txt"):
+    """
+    Builds every game data index up front, rather than the first time each one is needed.
+
+    :param str pokemon_path: The path to the file containing Pokémon data.
+    :param str tm_path: The path to the file containing TM and tutor move data.
+    :param str encounters_path: The path to the file containing encounter data.
+    """
+    build_pokemon_index(pokemon_path)
+    build_move_index(tm_path)
+    build_encounter_index(encounters_path)
+    _encounter_lines(encounters_path)
+
+
+def clear_indexes():
+    """
+    Forgets every game data index and lookup built so far, so the game data is read again the next time it is needed,
+    e.g., after the files have been edited.
+    """
+    for cached in (build_pokemon_index, build_move_index, build_encounter_index, _encounter_lines,
+                   lookup_encounters.__wrapped__):
+        cached.cache_clear()
+
+
+@tracked
+def lookup_pokemon(name, pokemon_path):
+    """
+    Finds the lines of a Pokémon's section in pokemon.txt.
+
+    :param str name: The internal name of the Pokémon.
+    :param str pokemon_path: The path to the file containing Pokémon data.
+    :return tuple[str]: The lines of the Pokémon's section, starting with its "[InternalNumber]" line, or nothing if the
+        Pokémon could not be found.
+    """
+    return build_pokemon_index(pokemon_path).get(name, ())
+
+
+@tracked
+def lookup_moves(name, tm_path):
+    """
+    Finds the TM and tutor moves a Pokémon can learn in tm.txt.
+
+    :param str name: The internal name of the Pokémon.
+    :param str tm_path: The path to the file containing TM and tutor move data.
+    :return tuple[list[str], list[str]]: The TM moves and tutor moves learnable by the Pokémon.
+    """
+    return build_move_index(tm_path).get(name, ([], []))
+
+
+@tracked
+@register_cache
+@functools.cache
+def lookup_encounters(name, encounters_path):
+    """
+    Finds the encounter tables of every zone a Pokémon appears in within encounters.txt. As many Pokémon share zones,
+    and each zone must be found by searching the file, the tables are cached once found.
+
+    :param str name: The internal name of the Pokémon.
+    :param str encounters_path: The path to the file containing encounter data.
+    :return tuple[list[list[str]], list[str]]: The encounter tables for relevant locations and the locations processed.
+    """
+    line_list, line_positions = _encounter_lines(encounters_path)
+
+    encounter_info = []
+    found_zones = []
+
+    # Any line mentioning the Pokémon, which may be as part of another Pokémon's name, in order of appearance
+    mentions = sorted(idx for line, indices in line_positions.items() if name in line for idx in indices)
+
+    for idx in mentions:
+        start, end = find_location_indices(idx, line_list)
+
+        # Finds the zone ID, which any one location can have multiple of
+        zone_id = line_list[start].split("#")[0].rstrip()
+
+        # Ensures that zones aren't processed multiple times
+        if zone_id not in found_zones:
+            found_zones.append(zone_id)
+
+            # Remove level number, unnecessary for this program
+            zone_encounters = line_list[start:end]
+
+            # Strip numbers from everything and ignore first two lines; unnecessary now
+            formatted_encounters = [''.join(x for x in i if x.isalpha()) for i in zone_encounters[2:]]
+            encounter_info.append(formatted_encounters)
+
+    return encounter_info, found_zones
+
+
 class DataCollection:
     """
     A class that contains methods to extract all related information to a Pokémon from the game's data files.
+
+    The files are only read and indexed once per process, so any number of DataCollection instances may be created
+    cheaply, e.g., when generating the wiki pages for the whole dex in one run.
     """
 
     def __init__(self, name, pokemon_path="gamedata/pokemon.txt", tm_path="gamedata/tm.txt", encounters_path="gamedata/encounters.txt"):
@@ -67,26 +271,7 @@ class DataCollection:
 
         :return dict[str, str]: A dictionary containing all relevant information found in the file for the Pokémon.
         """
-        line_list = read_file_lines(self.pokemon_path)
-        raw_data = []
-        found_pokemon = False
-
-        for idx, line in enumerate(line_list):
-            if line == "InternalName=" + self.name:
-                found_pokemon = True
-                raw_data = line_list[idx - 2:idx + 1]
-                continue
-
-            if found_pokemon:
-                raw_data.append(line)
-
-                # Indicates the start of the next Pokémon's data - stop here
-                if "InternalName" in line:
-                    # Size of Pokémon sections are not constant, but the next InternalName is always 3 lines too far.
-                    raw_data.remove(line)
-                    raw_data.remove(line_list[idx - 1])
-                    raw_data.remove(line_list[idx - 2])
-                    break
+        raw_data = list(lookup_pokemon(self.name, self.pokemon_path))
 
         try:
             raw_data[0] = "InternalNumber=" + raw_data[0].replace("[", "").replace("]", "")
@@ -106,26 +291,8 @@ class DataCollection:
 
         :return tuple[list[str], list[str]]: The list of moves learnable by the Pokémon from the file.
         """
-        line_list = read_file_lines(self.tm_path)
-
-        tm_list = []
-        tutor_list = []
-
-        for idx, line in enumerate(line_list):
-            names = line.split(",")
-
-            # Because X or other form pokemon also will contain the same name (e.g.: SHYLEONX has SHYLEON in it),
-            # this ensures only exact matches to the given internal name are selected
-            matches = set(names).intersection({self.name})
-
-            # All moves up to line 194 are TM moves, everything else are tutor moves
-            if len(matches) > 0:
-                if idx < 194:
-                    tm_list.append(line_list[idx - 1].strip("[]"))
-                else:
-                    tutor_list.append(line_list[idx - 1].strip("[]"))
-
-        return tm_list, tutor_list
+        tm_list, tutor_list = lookup_moves(self.name, self.tm_path)
+        return list(tm_list), list(tutor_list)
 
     def extract_encounter_data(self):
         """
@@ -137,27 +304,5 @@ class DataCollection:
 
         :return tuple[list[list[str]], list[str]]: The encounter tables for relevant locations and the locations processed.
         """
-        line_list = read_file_lines(self.encounters_path)
-
-        encounter_info = []
-        found_zones = []
-
-        for idx, line in enumerate(line_list):
-            if self.name in line:
-                start, end = find_location_indices(idx, line_list)
-
-                # Finds the zone ID, which any one location can have multiple of
-                zone_id = line_list[start].split("#")[0].rstrip()
-
-                # Ensures that zones aren't processed multiple times
-                if zone_id not in found_zones:
-                    found_zones.append(zone_id)
-
-                    # Remove level number, unnecessary for this program
-                    zone_encounters = line_list[start:end]
-
-                    # Strip numbers from everything and ignore first two lines; unnecessary now
-                    formatted_encounters = [''.join(x for x in i if x.isalpha()) for i in zone_encounters[2:]]
-                    encounter_info.append(formatted_encounters)
-
-        return encounter_info, found_zones
+        encounter_info, found_zones = lookup_encounters(self.name, self.encounters_path)
+        return [list(zone) for zone in encounter_info], list(found_zones)
@@ -0,0 +1,114 @@
+# pylint: disable=locally-disabled, line-too-long
+"""
+Records which game data and reference data is read while something is computed, so that it can later be known whether
+it needs computing again.
+
+Every function that reads data, such as the accessors in data_access and the lookups in data_collection, is marked as
+tracked. While a recording is active, each call to a tracked function is recorded along with a digest of its result.
+Since tracked functions only depend on their arguments and the data files, calling a recorded function again later and
+comparing digests shows whether anything read has changed, without needing to know anything else about the
+computation. Recordings nest, with everything recorded in an inner recording also being recorded in the outer one.
+
+Nothing is recorded, and so no digests are made, unless a recording is active.
+"""
+import contextlib
+import functools
+import hashlib
+
+# Every tracked function, by name, so that recorded calls can be made again
+_TRACKED = {}
+
+# The stack of active recordings, each holding the digest of every call recorded so far
+_recordings = []
+
+
+def digest(value):
+    """
+    Creates a digest of a value read from the data, which changes whenever the value changes.
+
+    The digest is made from the value's repr, which is far quicker than encoding it as JSON. Dictionaries read from the
+    same data always keep the same order, so an unchanged value always gives the same digest.
+
+    :param Any value: A value made of dictionaries, lists, tuples, strings, numbers, booleans and None.
+    :return str: The digest of the value.
+    """
+    return hashlib.blake2b(repr(value).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def tracked(func):
+    """
+    Marks a function that reads data as tracked, so its calls are recorded in any active recording.
+
+    A tracked function must only be called with positional arguments that can be stored as JSON, and its result must
+    only depend on those arguments and the contents of the data files.
+
+    :param Callable func: The function to track.
+    :return Callable: The tracked function.
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+    _TRACKED[name] = func
+
+    @functools.wraps(func)
+    def wrapper(*args):
+        result = func(*args)
+        # The same call is often made many times while computing one thing, but only needs recording once
+        if _recordings and (name, args) not in _recordings[-1]:
+            _recordings[-1][(name, args)] = digest(result)
+        return result
+
+    return wrapper
+
+
+def is_recording():
+    """
+    Checks whether a recording is active, so that work only needed for recording can be skipped otherwise.
+
+    :return bool: Whether a recording is active.
+    """
+    return bool(_recordings)
+
+
+@contextlib.contextmanager
+def record_dependencies():
+    """
+    Records every call to a tracked function made within the context.
+
+    Format: ("TrackedFunctionName", (args)) -> "ResultDigest"
+
+    :return Iterator[dict[tuple[str, tuple], str]]: The recorded calls, which are filled in as the context runs.
+    """
+    recording = {}
+    _recordings.append(recording)
+    try:
+        yield recording
+    finally:
+        _recordings.pop()
+        if _recordings:
+            _recordings[-1].update(recording)
+
+
+def include_dependencies(recording):
+    """
+    Adds calls recorded earlier to the active recording, if any, for data that was read before the recording began but
+    is still used within it.
+
+    :param dict[tuple[str, tuple], str] recording: The recorded calls to add.
+    """
+    if _recordings:
+        _recordings[-1].update(recording)
+
+
+def current_digest(name, args):
+    """
+    Makes a recorded call to a tracked function again, finding the digest of its result given the data as it is now.
+
+    :param str name: The name of the tracked function.
+    :param tuple args: The arguments it was called with.
+    :return str | None: The digest of the result, or None if the function no longer exists or now fails.
+    """
+    if name not in _TRACKED:
+        return None
+    try:
+        return digest(_TRACKED[name](*args))
+    except Exception:  # pylint: disable=broad-exception-caught
+        return None
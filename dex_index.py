@@ -0,0 +1,159 @@
+# pylint: disable=locally-disabled, line-too-long
+"""
+An index of every Pokémon across the three regional dexes (the main dex, the Xenodex and the Vintagedex), built once per
+process from pokemon_info.json and pokemon.txt.
+
+Each dex number is linked to its internal name, display name and internal number, and each Pokémon's internal name to
+its dex number, so a Pokémon can be found from any one of them with a single dictionary read. The Pokémon before and
+after each dex number are also worked out once, in dex order, with the first and last Pokémon of each dex wrapping
+around to each other. Alternate forms, e.g., "030_1", share the navigation of their base form.
+
+Format: "DexNumber" -> {"DexNumber": "DexNumber", "InternalName": "InternalName", "DisplayName": "DisplayName",
+                        "InternalNumber": "InternalNumber", "Prev": "DexNumber", "Next": "DexNumber"}
+
+Every lookup is tracked, as with the reference dictionaries, so anything computed from the index knows which entries
+it read.
+"""
+import functools
+from data_access import load_reference
+from data_collection import build_pokemon_index
+from dependencies import tracked
+from profiling import register_cache
+from utility_methods import find_dex_number
+
+
+def split_dex_number(dex):
+    """
+    Splits a dex number, as used as a key in pokemon_info.json, into its region prefix and number.
+
+    :param str dex: A dex number, e.g., "001", "X031", or "V207_1".
+    :return tuple[str, int]: The region prefix ("", "X" or "V") and the number, ignoring any alternate form suffix.
+    """
+    region = dex[0] if dex[0] in ("X", "V") else ""
+    return region, int(dex[len(region):].split("_")[0])
+
+
+class DexIndex:
+    """
+    Simple class linking every dex number, internal name, display name and internal number to each other.
+    """
+    def __init__(self, pokemon_info, pokemon_sections):
+        """
+        The init function of DexIndex.
+
+        :param dict[str, dict[str, str]] pokemon_info: The internal name and display name of each dex number, in dex
+            order, as in pokemon_info.json.
+        :param dict[str, tuple[str, ...]] pokemon_sections: The lines of each Pokémon's section of pokemon.txt, by
+            internal name, as in build_pokemon_index.
+        """
+        # The dex number of each Pokémon with regional numbers, by internal name, including forms that share the page
+        # of their base form
+        self.dex_numbers = {}
+        # The internal name of each internal number
+        self.internal_names = {}
+        for internal_name, lines in pokemon_sections.items():
+            self.internal_names.setdefault(lines[0].strip("[]"), internal_name)
+            # As in DataCollection.extract_pokemon_data, a field given twice takes its last value
+            regional_numbers = next((line.split("=", 1)[1] for line in reversed(lines) if line.startswith("RegionalNumbers=")), None)
+            if regional_numbers is not None:
+                self.dex_numbers[internal_name] = find_dex_number(regional_numbers)
+
+        internal_numbers = {internal_name: number for number, internal_name in self.internal_names.items()}
+        self.entries = {dex: {"DexNumber": dex, "InternalName": info["InternalName"], "DisplayName": info["DisplayName"],
+                              "InternalNumber": internal_numbers.get(info["InternalName"])}
+                        for dex, info in pokemon_info.items()}
+
+        # The first dex number to use each display name, which for forms sharing a name is the base form
+        self.display_names = {}
+        for dex, entry in self.entries.items():
+            self.display_names.setdefault(entry["DisplayName"], dex)
+
+        # The base dex numbers of each dex, in order, from which each Pokémon's neighbours are read. Each dex collects its
+        # base dex numbers as dictionary keys first, so that skipping repeats stays linear in the size of the dex
+        bases = {}
+        for dex in self.entries:
+            region, number = split_dex_number(dex)
+            base = region + str(number).zfill(3)
+            if base in self.entries:
+                bases.setdefault(region, {})[base] = None
+        self.regions = {region: sorted(order, key=lambda dex: split_dex_number(dex)[1]) for region, order in bases.items()}
+        for order in self.regions.values():
+            for idx, dex in enumerate(order):
+                self.entries[dex]["Prev"] = order[idx - 1]
+                self.entries[dex]["Next"] = order[(idx + 1) % len(order)]
+        for dex, entry in self.entries.items():
+            region, number = split_dex_number(dex)
+            base = self.entries.get(region + str(number).zfill(3), {})
+            entry.setdefault("Prev", base.get("Prev"))
+            entry.setdefault("Next", base.get("Next"))
+
+
+@register_cache
+@functools.cache
+def build_dex_index(info_path="references/pokemon_info.json", pokemon_path="gamedata/pokemon.txt"):
+    """
+    Builds the dex index once per pair of files, caching it for any later lookups.
+
+    :param str info_path: The path to the reference dictionary of dex numbers.
+    :param str pokemon_path: The path to the file containing Pokémon data.
+    :return DexIndex: The dex index.
+    """
+    return DexIndex(load_reference(info_path), build_pokemon_index(pokemon_path))
+
+
+@tracked
+def dex_entry(dex):
+    """
+    Finds everything known about a dex number, including the dex numbers of the Pokémon before and after it.
+
+    :param str dex: The dex number, e.g., "X031".
+    :return dict[str, str | None] | None: The dex number's entry, or None if it is not in the dex.
+    """
+    return build_dex_index().entries.get(dex)
+
+
+@tracked
+def species_dex_number(internal_name):
+    """
+    Finds the dex number of a Pokémon from its regional numbers in pokemon.txt.
+
+    :param str internal_name: The internal name of the Pokémon.
+    :return str | None: The dex number, or None if the Pokémon has no regional numbers.
+    """
+    return build_dex_index().dex_numbers.get(internal_name)
+
+
+@tracked
+def find_display_name(display_name):
+    """
+    Finds the dex number shown under a display name.
+
+    :param str display_name: The display name, e.g., "Raichu X".
+    :return str | None: The dex number, or None if no Pokémon has the display name.
+    """
+    return build_dex_index().display_names.get(display_name)
+
+
+@tracked
+def find_internal_number(internal_number):
+    """
+    Finds the Pokémon with an internal number in pokemon.txt.
+
+    :param str internal_number: The internal number, e.g., "25".
+    :return str | None: The internal name, or None if no Pokémon has the internal number.
+    """
+    return build_dex_index().internal_names.get(internal_number)
+
+
+def species_entry(internal_name):
+    """
+    Finds the dex entry of a Pokémon's own dex number.
+
+    :param str internal_name: The internal name of the Pokémon.
+    :return dict[str, str | None] | None: The dex entry, or None if the dex number is not in pokemon_info.json.
+    :raises ValueError: If the Pokémon is missing from pokemon.txt, or has no regional numbers.
+    """
+    dex = species_dex_number(internal_name)
+    if dex is None:
+        raise ValueError(f"Could not find a dex number for internal name '{internal_name}' in the file.")
+    return dex_entry(dex)
@@ -1,7 +1,8 @@
 # pylint: disable=line-too-long, missing-module-docstring, F0401, too-many-branches, too-many-return-statements
-from data_access import evolution_info, pokemon_info, move_info
-from utility_methods import find_dex_number, get_two_types
+from data_access import evolution_info, move_info
+from utility_methods import get_two_types
 from data_collection import DataCollection
+from dex_index import species_entry
 
 
 def _is_in_evolution_chain(evol_info):
@@ -126,8 +127,7 @@ def _populate_evo_chain(evo_chain):
     for key, value in evo_chain.items():
         dc = DataCollection(value["Name"])
         p_data = dc.extract_pokemon_data()
-        display_name = pokemon_info(find_dex_number(p_data["RegionalNumbers"]))["DisplayName"]
-        evo_chain[key]["DisplayName"] = display_name
+        evo_chain[key]["DisplayName"] = species_entry(value["Name"])["DisplayName"]
         first_type, second_type = get_two_types(p_data)
         evo_chain[key]["Type1"] = first_type
         evo_chain[key]["Type2"] = second_type
@@ -176,10 +176,8 @@ def _create_evo_string(method):
         return "{{Item|Rare Candy}} + {{Item|King's Rock}}<br>{{color2|000|Level up}}<br><small>on [[Shinobi Island]]<br>with 3 Pawniards and <br>1 Bisharp X in party</small>"
 
     # Otherwise, the method is "HasInParty"
-    dc = DataCollection(method["HasInParty"])
-    p_data = dc.extract_pokemon_data()
-    dex_num = find_dex_number(p_data["RegionalNumbers"])
-    display_name = pokemon_info(dex_num)["DisplayName"]
+    entry = species_entry(method["HasInParty"])
+    dex_num, display_name = entry["DexNumber"], entry["DisplayName"]
     return "{{EM|" + dex_num + "|" + display_name + "}}<br>'''Level up'''<br>with {{color2|000|" + display_name + "}} in party."
 
 
@@ -225,10 +223,7 @@ def _create_evo_statement_method(method):
         return "if leveled up on [[Shinobi Island]] with 3 Pawniards and 1 [[Bisharp X]] in your party"
 
     # Otherwise, the method is "HasInParty"
-    dc = DataCollection(method["HasInParty"])
-    p_data = dc.extract_pokemon_data()
-    dex_num = find_dex_number(p_data["RegionalNumbers"])
-    display_name = pokemon_info(dex_num)["DisplayName"]
+    display_name = species_entry(method["HasInParty"])["DisplayName"]
     return f"when leveled up with a [[{display_name}]] in the party"
 
 
@@ -236,16 +231,25 @@ class EvolutionHandler:
     """
     A class that handles the evolution information for a Pokémon.
     """
-    def __init__(self, p_data):
+    def __init__(self, context):
         """
         Initialises the EvolutionHandler class.
 
-        :param dict[str, str] p_data: A dictionary containing all the Pokémon's data in pokemon.txt.
+        :param SpeciesContext context: The facts shared by every generator of the Pokémon's wiki page.
         """
-        self.internal_name = pokemon_info(find_dex_number(p_data["RegionalNumbers"]))["InternalName"]
-        self.evol_info = evolution_info(self.internal_name)
-        self.p_data = p_data
-        self.first_type, self.second_type = get_two_types(p_data)
+        self.context = context
+        self.internal_name = context.dex_info["InternalName"]
+        self.evol_info = context.evolution_info
+        self.p_data = context.p_data
+        self.first_type, self.second_type = context.types
+
+    def _get_evolution_chain(self):
+        """
+        Constructs the evolution chain of the Pokémon once per page, sharing it with every generator.
+
+        :return tuple[dict[int, dict[str, str]], str]: The evolution chain of the Pokémon and its branching information.
+        """
+        return self.context.derive("evolution_chain", lambda: _construct_evolution_chain(self.evol_info, self.internal_name))
 
     def create_evolution_box(self):
         """
@@ -257,7 +261,7 @@ class EvolutionHandler:
         if self.internal_name in ["EEVEE", "VAPOREON", "JOLTEON", "FLAREON", "ESPEON", "UMBREON", "LEAFEON", "GLACEON", "SYLVEON", "BANDEON", "SCALEON"]:
             return ""
 
-        evo_chain, branch_info = _construct_evolution_chain(self.evol_info, self.internal_name)
+        evo_chain, branch_info = self._get_evolution_chain()
 
         if branch_info == "Linear":
             evo_box_header = "{{Evobox-" + f"{len(evo_chain)}"
@@ -286,13 +290,16 @@ class EvolutionHandler:
 
         :return int: The position of the Pokémon in the evolution chain.
         """
-        chain_pos = 0
-        evo_chain, _ = _construct_evolution_chain(self.evol_info, self.internal_name)
-        for key, value in evo_chain.items():
-            if value["Name"] == self.internal_name:
-                chain_pos = key
-                break
-        return chain_pos
+        def find_chain_position():
+            chain_pos = 0
+            evo_chain, _ = self._get_evolution_chain()
+            for key, value in evo_chain.items():
+                if value["Name"] == self.internal_name:
+                    chain_pos = key
+                    break
+            return chain_pos
+
+        return self.context.derive("chain_position", find_chain_position)
 
     def create_evolution_statement(self):
         """
@@ -307,7 +314,7 @@ class EvolutionHandler:
         if self.internal_name in ["EEVEE", "VAPOREON", "JOLTEON", "FLAREON", "ESPEON", "UMBREON", "LEAFEON", "GLACEON", "SYLVEON", "BANDEON", "SCALEON"]:
             return ""
 
-        evo_chain, _ = _construct_evolution_chain(self.evol_info, self.internal_name)
+        evo_chain, _ = self._get_evolution_chain()
 
         chain_pos = self.get_chain_position()
 
@@ -346,7 +353,7 @@ class EvolutionHandler:
 
         :return str: The type of the Pokémon after evolution.
         """
-        evo_chain, _ = _construct_evolution_chain(self.evol_info, self.internal_name)
+        evo_chain, _ = self._get_evolution_chain()
         chain_pos = self.get_chain_position()
 
         # If a single stage evo or the final evo, no future type
@@ -376,7 +383,7 @@ class EvolutionHandler:
 
         :return str: The internal name of the first stage of the Pokémon's evolution chain.
         """
-        evo_chain, _ = _construct_evolution_chain(self.evol_info, self.internal_name)
+        evo_chain, _ = self._get_evolution_chain()
         return evo_chain[1]["Name"]
 
     def get_evo_chain(self):
@@ -385,5 +392,5 @@ class EvolutionHandler:
 
         :return dict[str, dict[str, str]]: The evolution chain of the Pokémon.
         """
-        evo_chain, _ = _construct_evolution_chain(self.evol_info, self.internal_name)
+        evo_chain, _ = self._get_evolution_chain()
         return evo_chain
@@ -0,0 +1,180 @@
+# pylint: disable=locally-disabled, line-too-long
+"""
+Writes the wiki pages of many Pokémon into a single MediaWiki export XML file, which can be uploaded through the wiki's
+Special:Import page rather than pasting each page in by hand.
+
+The file is written one page at a time as each is generated, so memory use stays flat no matter how many pages are
+exported. Each Pokémon gets one <page> element holding a single revision with the page's wikitext. Pages are titled
+with the display name in pokemon_info.json of the Pokémon's own dex number, unchanged, as on the page itself. A display
+name shared by two Pokémon would make both import into the same page, so only the first is written and the other is
+reported as an error. Every page is exported whole, as a partial page would replace the whole page on import.
+Everything is built and checked offline; nothing is sent to the wiki.
+
+Format (MediaWiki export schema 0.11):
+    <mediawiki xmlns="http://www.mediawiki.org/xml/export-0.11/" version="0.11" xml:lang="en">
+      <page>
+        <title>DisplayName</title>
+        <ns>0</ns>
+        <revision>
+          <timestamp>YYYY-MM-DDTHH:MM:SSZ</timestamp>
+          <contributor><username>Username</username></contributor>
+          <comment>Comment</comment>
+          <model>wikitext</model>
+          <format>text/x-wiki</format>
+          <text xml:space="preserve" bytes="N">Wikitext</text>
+        </revision>
+      </page>
+    </mediawiki>
+"""
+import os
+import time
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+from batch import generate_page
+from section_cache import SectionCache
+
+# The XML namespace of the MediaWiki export schema written
+EXPORT_NAMESPACE = "http://www.mediawiki.org/xml/export-0.11/"
+
+
+class ExportWriter:
+    """
+    Simple class writing wiki pages into a MediaWiki export XML file one at a time.
+
+    Used as a context manager, the file is written alongside the target and only moved into place once the last page
+    has been written, so an interrupted export never leaves half a file behind.
+    """
+    def __init__(self, path, username="Xenoverse Wiki Generator", comment="Generated from the game files"):
+        """
+        The init function of ExportWriter.
+
+        :param str path: The path of the XML file to write.
+        :param str username: The contributor recorded for every revision.
+        :param str comment: The edit summary recorded for every revision.
+        """
+        self.path = path
+        self.username = username
+        self.comment = comment
+        self.timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        self.pages = 0
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path + ".part", "w", encoding="utf-8")  # pylint: disable=consider-using-with
+        self._file.write(f'<mediawiki xmlns="{EXPORT_NAMESPACE}" version="0.11" xml:lang="en">\n')
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self._file.write("</mediawiki>\n")
+        self._file.close()
+        if exc_type is None:
+            os.replace(self.path + ".part", self.path)
+        else:
+            os.remove(self.path + ".part")
+
+    def write_page(self, title, lines):
+        """
+        Writes a single page, with its wikitext as the only revision.
+
+        :param str title: The title of the page.
+        :param list[str] lines: The lines of the page's wikitext.
+        """
+        text = "\n".join(lines)
+        self._file.write(
+            "  <page>\n"
+            f"    <title>{escape(title)}</title>\n"
+            "    <ns>0</ns>\n"
+            "    <revision>\n"
+            f"      <timestamp>{self.timestamp}</timestamp>\n"
+            f"      <contributor><username>{escape(self.username)}</username></contributor>\n"
+            f"      <comment>{escape(self.comment)}</comment>\n"
+            "      <model>wikitext</model>\n"
+            "      <format>text/x-wiki</format>\n"
+            f'      <text xml:space="preserve" bytes="{len(text.encode("utf-8"))}">{escape(text)}</text>\n'
+            "    </revision>\n"
+            "  </page>\n"
+        )
+        self.pages += 1
+
+
+def export_pages(internal_names, path, cache_dir=None):
+    """
+    Generates the wiki page of every given Pokémon straight into a MediaWiki export XML file.
+
+    :param list[str] internal_names: The internal names of the Pokémon.
+    :param str path: The path of the XML file to write.
+    :param str | None cache_dir: The directory of the section cache to reuse unchanged sections from, if any.
+    :return dict[str, dict[str, str | int | float | None]]: For each Pokémon, the title of its page, the time taken, any
+        error, and the number of sections reused from the cache.
+    """
+    # The Pokémon already exported under each title
+    used_titles = {}
+    section_cache = SectionCache(cache_dir) if cache_dir else None
+    results = {}
+    with ExportWriter(path) as writer:
+        for internal_name in internal_names:
+            page = generate_page(internal_name, None, "wiki", section_cache)
+            title, error = None, page["Error"]
+            if error is None and page["DisplayName"] in used_titles:
+                error = f"The title '{page['DisplayName']}' is already used by {used_titles[page['DisplayName']]}."
+            elif error is None:
+                title = page["DisplayName"]
+                used_titles[title] = internal_name
+                writer.write_page(title, page["Lines"])
+            results[internal_name] = {"File": title, "Time": page["Time"], "Error": error, "Reused": page["Reused"]}
+    return results
+
+
+def validate_export(path):
+    """
+    Checks that a MediaWiki export XML file is well formed and could be imported, reading it one page at a time so
+    that even a very large file is checked in constant memory.
+
+    Every page must have a unique, non-empty title, be in the main namespace, and have a revision with a timestamp, the
+    wikitext model, and text whose recorded size matches its content.
+
+    :param str path: The path of the XML file to check.
+    :return tuple[int, list[str]]: The number of pages checked, and a description of every problem found.
+    """
+    tag = lambda name: f"{{{EXPORT_NAMESPACE}}}{name}"  # pylint: disable=unnecessary-lambda-assignment
+    problems, titles = [], set()
+    pages = 0
+    try:
+        context = ET.iterparse(path, events=("start", "end"))
+        _, root = next(context)
+        if root.tag != tag("mediawiki"):
+            problems.append(f"The root element is {root.tag}, not {tag('mediawiki')}.")
+
+        for event, element in context:
+            if event != "end" or element.tag != tag("page"):
+                continue
+            pages += 1
+            title = element.findtext(tag("title"))
+            if not title:
+                problems.append(f"Page {pages} has no title.")
+            elif title in titles:
+                problems.append(f"Page '{title}' appears more than once.")
+            titles.add(title)
+
+            if element.findtext(tag("ns")) != "0":
+                problems.append(f"Page '{title}' is not in the main namespace.")
+            revision = element.find(tag("revision"))
+            text = revision.find(tag("text")) if revision is not None else None
+            if text is None:
+                problems.append(f"Page '{title}' has no revision text.")
+            else:
+                if not revision.findtext(tag("timestamp")):
+                    problems.append(f"Page '{title}' has no revision timestamp.")
+                if revision.findtext(tag("model")) != "wikitext":
+                    problems.append(f"Page '{title}' is not wikitext.")
+                if text.get("bytes") != str(len((text.text or "").encode("utf-8"))):
+                    problems.append(f"Page '{title}' records {text.get('bytes')} bytes of text, but has {len((text.text or '').encode('utf-8'))}.")
+
+            # Each page is dropped once checked, so only one is ever held in memory
+            element.clear()
+            root.remove(element)
+    except ET.ParseError as e:
+        problems.append(f"The file is not well formed XML: {e}")
+
+    return pages, problems
@@ -1,7 +1,7 @@
 # pylint: disable=locally-disabled, line-too-long, missing-module-docstring, too-few-public-methods
 from data_access import location_info, static_encounters, location_order
-from utility_methods import get_two_types
-from evolution import EvolutionHandler
+from dex_index import species_entry
+from obtainability import obtainability
 
 
 # region Percentages
@@ -461,21 +461,45 @@ def _account_for_static_encounters(p_data, game_locations):
     return False
 
 
+def _account_for_indirect_obtainability(obtain_info, game_locations):
+    """
+    Accounts for Pokémon which cannot be encountered at all, and so must be evolved or bred from another Pokémon.
+
+    The precomputed obtainability table is used to decide between the two. Evolving from the pre-evolution is always
+    preferred, and otherwise the family member closest to a wild source is bred.
+
+    :param dict[str, list[str] | dict[str, str] | str | int | None] obtain_info: The Pokémon's obtainability information.
+    :param list[str] game_locations: The wiki code to produce the availability information.
+    """
+    candidates = ([("Evolve", obtain_info["EvolveFrom"])] if obtain_info["EvolveFrom"] else []) + \
+        [("Breed", member) for member in obtain_info["BreedFrom"]]
+    for method, internal_name in candidates:
+        # A family member without a dex entry of its own has no page to link to, so the next one is tried instead
+        try:
+            display_name = species_entry(internal_name)["DisplayName"]
+        except (ValueError, TypeError):
+            continue
+        game_locations.append(f"|none = {method} [[{display_name}]]")
+        return
+    game_locations.append("|none = Unobtainable")
+
+
 class LocationDataGenerator:
     """
     A class which extracts a Pokémon's data from encounters.txt, calculates the actual percentage of its appearance,
     and formats into a proper string.
     """
-    def __init__(self, p_data, encounter_locs, zone_ids):
+    def __init__(self, context, encounter_locs, zone_ids):
         """
         The init function for LocationDataGenerator.
 
-        :param dict[str, str] p_data: A dictionary containing all the Pokémon's data in pokemon.txt.
+        :param SpeciesContext context: The facts shared by every generator of the Pokémon's wiki page.
         :param list[list[str]] encounter_locs: The encounter information for every location the Pokémon is present in.
         :param list[str] zone_ids: The ID of every zone the Pokémon is available in.
         """
-        self.p_data = p_data
-        self.first_type, self.second_type = get_two_types(p_data)
+        self.context = context
+        self.p_data = context.p_data
+        self.first_type, self.second_type = context.types
         self.encounter_locs = encounter_locs
         self.zone_ids = zone_ids
 
@@ -483,8 +507,8 @@ class LocationDataGenerator:
         """
         Creates the wiki code to produce game locations for the Pokémon to be encountered given relevant information.
 
-        Does not yet account for breeding only, or evolution only, which are sometimes the only way to obtain certain
-        Pokémon.
+        Whether the Pokémon can be found in the wild, or must otherwise be evolved or bred, is read from the dex-wide
+        obtainability table.
 
         :return list[str]: The wiki code to produce the availability information.
         """
@@ -492,16 +516,12 @@ class LocationDataGenerator:
         if self.first_type != self.second_type:
             game_locations.append(f"|type2 = {self.second_type}")
 
-        # If no wild encounters, the Pokémon is static only or evolution only or breeding only, not handled currently
-        if not self.encounter_locs:
+        obtain_info = obtainability(self.p_data["InternalName"])
+
+        # If no wild encounters, the Pokémon is static only or evolution only or breeding only
+        if not obtain_info["Wild"]:
             if not _account_for_static_encounters(self.p_data, game_locations):
-                evh = EvolutionHandler(self.p_data)
-                evo_chain = evh.get_evo_chain()
-                chain_pos = evh.get_chain_position()
-                if chain_pos > 1:
-                    game_locations.append(f"|none = Evolve [[{evo_chain[chain_pos - 1]["DisplayName"]}]]")
-                else:
-                    game_locations.append(f"|none = Breed [[{evo_chain[chain_pos + 1]["DisplayName"]}]]")
+                _account_for_indirect_obtainability(obtain_info, game_locations)
         else:
             _account_for_static_encounters(self.p_data, game_locations)
 
@@ -3,40 +3,194 @@
 Main script for generating a Pokémon's wiki page. The script will ask for the Pokémon's internal name and then access
 other classes and functions to facilitate the generation of the wiki page. The script will then continue repeating until
 the user decides to stop the script.
+
+Alternatively, pages can be generated for many Pokémon at once without any input, by choosing the whole dex, a list file
+of internal names, or a range of dex numbers. Each page is then written to its own file in an output directory, e.g.:
+
+    python main.py --all --out pages
+    python main.py --list names.txt --out pages
+    python main.py --range X001-X044 --out pages
+
+Whole-dex runs can be spread over multiple processes with --jobs N, or run through a staged pipeline with --pipeline,
+which overlaps writing pages with generating the next ones and reports the throughput of each stage.
+
+Only some sections of a page can be generated with --sections, e.g., to refresh just the learnsets after a TM change:
+
+    python main.py --all --out pages --sections learnset
+    python main.py --sections tm,tutor
+
+Batch pages can also be written as JSON or plain text rather than wikitext with --format json or --format text.
+
+With --cache, every section is cached along with exactly the data it read, so a rerun after a small data edit only
+recomputes the sections that read the edited data:
+
+    python main.py --all --out pages --cache
+
+With --watch, the pages are generated once and then kept up to date while the game data and reference dictionaries are
+edited, only regenerating the pages whose sections read changed data. It implies --cache:
+
+    python main.py --all --out pages --watch
+
+With --export, the pages are written into a single MediaWiki export XML file instead, ready for Special:Import, and the
+file is then checked offline. Pages are always exported whole, so --export cannot be combined with --sections:
+
+    python main.py --all --export pages.xml
+
+With --stale, the pages in a local MediaWiki XML dump of the wiki are compared against freshly generated pages, and only
+the pages and sections that differ are reported, e.g., to find which learnsets need updating:
+
+    python main.py --all --stale dump.xml --sections learnset
+
+With --diff, two versions of the game data are compared record by record, every changed field is printed, and the pages
+that need regenerating are listed, optionally into a list file for --list:
+
+    python main.py --diff old/gamedata gamedata --save-list changed.txt
+    python main.py --list changed.txt --out pages
+
+With --profile, the run also reports where its time went: the time spent in each section of each page, the files
+opened and bytes read, the JSON files parsed, and the hit rate of every cache. The report can also be written as JSON
+with --profile-out, for comparison against later runs:
+
+    python main.py --all --out pages --profile --profile-out profile.json
+
+With --serve, a local HTTP server keeps the game data loaded and serves pages, sections, species lists and game data
+queries on request (see server.py for its endpoints):
+
+    python main.py --serve --port 8000
 """
+import argparse
 import logging
-from pokemon import PokemonBoxGenerator
-from moves import MoveListGenerator
-from locations import LocationDataGenerator
-from wiki import WikiPage
-from data_collection import DataCollection
-from pokemontypes import TypeEffectivenessCalculator
-from evolution import EvolutionHandler
+import time
+from wiki import create_wiki_page, select_sections
+from page_model import RENDERERS
+from batch import all_species, species_from_file, species_in_range, run_batch, print_summary
+from pipeline import run_pipeline, print_stage_report
+from watch import watch
+from server import serve
+from export import export_pages, validate_export
+from staleness import find_stale_pages, print_stale_report
+from version_diff import diff_versions, pages_to_regenerate, print_diff
+from profiling import profile, print_profile_report, dump_profile
 
 
-def main():
+def main(selection=None):
     # Get the name of the Pokémon for the wiki page. This must match the Internal Name in the game files.
     internal_name = input("\nInput the name of the pokemon: ").upper()
 
     # Extract data from the game files
-    dc = DataCollection(internal_name)
     try:
-        pokemon_data = dc.extract_pokemon_data()
-        tm_data, tutor_data = dc.extract_move_data()
-        location_data, loc_nums = dc.extract_encounter_data()
+        wiki_page = create_wiki_page(internal_name)
     except ValueError as e:
         print(f"Error: {e}")
         return
 
-    poke_box_gen = PokemonBoxGenerator(pokemon_data)
-    move_list_gen = MoveListGenerator(pokemon_data, tm_data, tutor_data)
-    location_data_gen = LocationDataGenerator(pokemon_data, location_data, loc_nums)
-    type_eff_calc = TypeEffectivenessCalculator(pokemon_data)
-    evo_handler = EvolutionHandler(pokemon_data)
-
     # Generate Wiki page
-    wiki_page = WikiPage(poke_box_gen, move_list_gen, location_data_gen, type_eff_calc, evo_handler)
-    wiki_page.generate_wiki_page()
+    wiki_page.generate_wiki_page(selection)
+
+
+def parse_sections(names):
+    try:
+        return select_sections(names.split(","))
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generates Pokémon wiki pages for the unofficial English Pokémon Xenoverse Wiki.")
+    species = parser.add_mutually_exclusive_group()
+    species.add_argument("--all", action="store_true", help="generate the page of every Pokémon")
+    species.add_argument("--list", metavar="FILE", help="generate the pages of the internal names listed in FILE, one per line")
+    species.add_argument("--range", metavar="DEX-DEX", help="generate the pages of a range of dex numbers, e.g., 001-050 or X001-X044")
+    parser.add_argument("--out", metavar="DIR", default="pages", help="the directory to write pages to (default: pages)")
+    parser.add_argument("--jobs", metavar="N", type=int, default=1, help="the number of processes to generate pages over (default: 1)")
+    parser.add_argument("--sections", metavar="NAMES", type=parse_sections,
+                        help="generate only these comma-separated sections, e.g., learnset or tm,evolution (default: all)")
+    parser.add_argument("--format", choices=RENDERERS, default="wiki", help="the format to write pages in (default: wiki)")
+    parser.add_argument("--cache", metavar="DIR", nargs="?", const=".cache/sections",
+                        help="reuse sections whose inputs are unchanged from a section cache (default DIR: .cache/sections)")
+    parser.add_argument("--pipeline", action="store_true", help="generate pages through a staged pipeline and report each stage's throughput")
+    parser.add_argument("--queue-size", metavar="N", type=int, default=8, help="the most pages held between two pipeline stages (default: 8)")
+    parser.add_argument("--watch", action="store_true", help="keep the pages up to date as gamedata and references are edited, until interrupted")
+    parser.add_argument("--interval", metavar="SECONDS", type=float, default=1.0, help="the time between checks for edits when watching (default: 1)")
+    parser.add_argument("--export", metavar="FILE", help="write the pages into a MediaWiki export XML file rather than one file each")
+    parser.add_argument("--stale", metavar="DUMP", help="report the pages and sections that differ from a MediaWiki XML dump of the wiki")
+    parser.add_argument("--diff", metavar=("OLD", "NEW"), nargs=2, help="compare two game data directories and list the pages to regenerate")
+    parser.add_argument("--save-list", metavar="FILE", help="with --diff, also write the pages to regenerate into FILE for --list")
+    parser.add_argument("--profile", action="store_true", help="report the time, file reads, JSON parses and cache hit rates of each page and section")
+    parser.add_argument("--profile-out", metavar="FILE", help="with --profile, also write the report into FILE as JSON")
+    parser.add_argument("--serve", action="store_true", help="serve pages, sections, lists and queries over HTTP on localhost")
+    parser.add_argument("--port", metavar="N", type=int, default=8000, help="the port to serve on (default: 8000)")
+    args = parser.parse_args()
+    if args.export and args.sections:
+        parser.error("--export writes whole pages, which --sections would replace on import with only those sections")
+    return args
+
+
+def find_species(args):
+    if args.list:
+        return species_from_file(args.list)
+    if args.range:
+        return species_in_range(args.range)
+    return all_species()
+
+
+def diff_main(args):
+    old_dir, new_dir = args.diff
+    diff = diff_versions(old_dir, new_dir)
+    print_diff(diff)
+
+    internal_names = pages_to_regenerate(old_dir, new_dir, diff, all_species())
+    print(f"\n{len(internal_names)} pages to regenerate:")
+    print("  " + ", ".join(internal_names) if internal_names else "  None")
+    if args.save_list:
+        with open(args.save_list, "w", encoding="utf-8") as f:
+            f.write("".join(name + "\n" for name in internal_names))
+
+
+def batch_main(args):
+    if args.watch:
+        watch(args.out, args.cache or ".cache/sections", args.interval, args.sections, args.format, lambda: find_species(args))
+        return
+
+    internal_names = find_species(args)
+    if args.stale:
+        start = time.perf_counter()
+        print(f"Comparing {len(internal_names)} pages against '{args.stale}'...")
+        print_stale_report(find_stale_pages(args.stale, internal_names, selection=args.sections, jobs=args.jobs))
+        print(f"Wall time: {time.perf_counter() - start:.2f}s.")
+        return
+
+    print(f"Generating {len(internal_names)} pages into '{args.export or args.out}'...")
+    start = time.perf_counter()
+    if args.export:
+        results = export_pages(internal_names, args.export, cache_dir=args.cache)
+        print_summary(results, time.perf_counter() - start)
+        pages, problems = validate_export(args.export)
+        print(f"\nChecked {pages} pages in '{args.export}': " + ("ready to import." if not problems else f"{len(problems)} problems:"))
+        for problem in problems:
+            print(f"  {problem}")
+    elif args.pipeline:
+        results, counters = run_pipeline(internal_names, args.out, queue_size=args.queue_size, selection=args.sections,
+                                         page_format=args.format, cache_dir=args.cache)
+        wall_time = time.perf_counter() - start
+        print_summary(results, wall_time)
+        print_stage_report(counters, wall_time)
+    else:
+        results = run_batch(internal_names, args.out, jobs=args.jobs, selection=args.sections, page_format=args.format,
+                            cache_dir=args.cache)
+        print_summary(results, time.perf_counter() - start)
+
+
+def profile_main(args, run):
+    if args.jobs > 1:
+        print("Profiling generates every page in this process, ignoring --jobs.")
+        args.jobs = 1
+    with profile() as run_profile:
+        run(args)
+    print_profile_report(run_profile)
+    if args.profile_out:
+        dump_profile(run_profile, args.profile_out)
+        print(f"\nThe profile has been written to '{args.profile_out}'.")
 
 
 if __name__ == "__main__":
@@ -47,5 +201,19 @@ if __name__ == "__main__":
     logger = logging.getLogger(__name__)
     logging.basicConfig(filename='example.log', encoding='utf-8', level=logging.DEBUG)
 
-    while True:
-        main()
+    arguments = parse_args()
+    if arguments.serve:
+        serve(arguments.port)
+    elif arguments.diff:
+        diff_main(arguments)
+    elif arguments.all or arguments.list or arguments.range or arguments.watch:
+        if arguments.profile and not arguments.watch:
+            profile_main(arguments, batch_main)
+        else:
+            batch_main(arguments)
+    else:
+        while True:
+            if arguments.profile:
+                profile_main(arguments, lambda args: main(args.sections))
+            else:
+                main(arguments.sections)
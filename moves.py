@@ -1,7 +1,5 @@
 # pylint: disable=too-many-lines, line-too-long, missing-module-docstring, import-error, too-many-arguments
-from data_access import (pokemon_info, move_info, tm_info)
-from utility_methods import find_dex_number, get_two_types
-from evolution import EvolutionHandler
+from data_access import (move_info, tm_info)
 from data_collection import DataCollection
 
 
@@ -120,19 +118,20 @@ class MoveListGenerator:
     A class that generates the different lists of moves that a Pokémon can learn by all methods available, given the
     relevant data. This includes moves learned by level up, TM, breeding, and tutoring. This is all done in wiki format.
     """
-    def __init__(self, p_data, tm_list, tutor_list):
+    def __init__(self, context, tm_list, tutor_list):
         """
         The init method for MoveListGenerator.
 
-        :param dict[str, str] p_data: A dictionary containing all the Pokémon's data in pokemon.txt.
+        :param SpeciesContext context: The facts shared by every generator of the Pokémon's wiki page.
         :param list[str] tm_list: A list of TMs the Pokémon can learn.
         :param list[str] tutor_list: A list of moves the Pokémon can be tutored in.
         """
-        self.p_data = p_data
-        self.level_list = p_data["Moves"].split(",")
+        self.context = context
+        self.p_data = context.p_data
+        self.level_list = self.p_data["Moves"].split(",")
         self.tm_list = tm_list
         self.tutor_list = tutor_list
-        self.first_type, self.second_type = get_two_types(p_data)
+        self.first_type, self.second_type = context.types
 
     def _get_dex_data(self):
         """
@@ -141,7 +140,7 @@ class MoveListGenerator:
 
         :return list[str]: The information for a specific Pokémon from pokemon_info.json.
         """
-        return pokemon_info(find_dex_number(self.p_data["RegionalNumbers"]))
+        return self.context.dex_info
 
     def _create_move_list(self, list_type):
         """
@@ -161,7 +160,7 @@ class MoveListGenerator:
                      self.second_type + "}}"]
 
         breed_string = ""
-        evh = EvolutionHandler(self.p_data)
+        evh = self.context.evolution
         chain_pos = evh.get_chain_position()
         # Breeding moves need to be handled differently, as they require a breed string, and may not always be needed.
         if list_type == "breed":
@@ -0,0 +1,171 @@
+# pylint: disable=locally-disabled, line-too-long
+"""
+Resolves how every Pokémon in the game can be obtained, and how far removed it is from a wild source.
+
+The game data alone does not say whether a Pokémon is, for example, evolution only or breeding only. Instead, this is
+resolved once over the whole dex by combining the encounter index built from encounters.txt, the static encounters
+reference dictionary, and the evolution family graph in the evolution info reference dictionary. The resultant table is
+then used by anything that needs to know about a Pokémon's availability, such as the wiki page's Availability box.
+"""
+import functools
+from data_access import load_reference
+from data_collection import build_encounter_index, build_pokemon_index
+from dependencies import tracked
+from profiling import register_cache
+
+# Static encounters which are handed to the player, rather than battled and caught
+GIFT_TYPES = ("Gift", "Trade", "Egg", "Revive", "If Male PC", "If Female PC")
+
+
+def _split_static_encounters(static_enc):
+    """
+    Splits the static encounters of a Pokémon into those which are battled and those which are gifted or traded.
+
+    :param dict[str, str] static_enc: The Pokémon's static encounters, as in static_encounters.json.
+    :return tuple[dict[str, str], dict[str, str]]: The battled static encounters, and the gift or trade encounters.
+    """
+    static, gift = {}, {}
+    for location, static_type in static_enc.items():
+        if static_type.startswith(GIFT_TYPES):
+            gift[location] = static_type
+        else:
+            static[location] = static_type
+    return static, gift
+
+
+def _next_stages(name, evo_info):
+    """
+    Finds the next evolution stage(s) of a Pokémon, ignoring any malformed entries in the evolution info dictionary.
+
+    :param str name: The internal name of the Pokémon.
+    :param dict[str, dict[str, str | list[str] | dict[str, str]]] evo_info: The full evolution info dictionary.
+    :return list[str]: The internal names of the next evolution stage(s), if any.
+    """
+    evolutions = evo_info[name]["Evolution"] if name in evo_info else []
+    # A handful of entries store a lone "no" rather than a list
+    if isinstance(evolutions, str):
+        evolutions = [evolutions]
+    return [evo for evo in evolutions if evo in evo_info]
+
+
+def _family_order(name, evo_info):
+    """
+    Finds every member of a Pokémon's evolution family, in order of evolution stage.
+
+    :param str name: The internal name of any member of the family.
+    :param dict[str, dict[str, str | list[str] | dict[str, str]]] evo_info: The full evolution info dictionary.
+    :return list[str]: The internal names of the family, starting with the first stage.
+    """
+    first = name
+    while first in evo_info and evo_info[first]["PreEvolution"] != "no":
+        first = evo_info[first]["PreEvolution"]
+
+    family = []
+    stage = [first]
+    while stage:
+        family.extend(stage)
+        stage = [evo for member in stage for evo in _next_stages(member, evo_info)]
+    return family
+
+
+@register_cache
+@functools.cache
+def resolve_obtainability(encounters_path="gamedata/encounters.txt", evolution_path="references/evolution_info.json",
+                          static_path="references/static_encounters.json", pokemon_path="gamedata/pokemon.txt"):
+    """
+    Resolves how every Pokémon in the evolution family graph can be obtained.
+
+    Every Pokémon found in the wild, as a static encounter, or as a gift or trade is a source of that Pokémon. From
+    these sources, a breadth-first search is run over the family graph: a Pokémon may be obtained by evolving its
+    pre-evolution, and the first stage of a family may be obtained by breeding any other member of the family. The
+    distance is the number of evolutions or breedings needed from the nearest direct source, and is None if the Pokémon
+    cannot be reached at all. Family members missing from pokemon.txt, e.g., cut evolutions, are never given as a
+    Pokémon to evolve or breed from, as they have no page to link to.
+
+    The table is built once per set of files and cached.
+
+    Format: "PokémonInternalName" -> {"Wild": ["ZoneID"], "Static": {"LocationName": "EncounterType"},
+    "Gift": {"LocationName": "EncounterType"}, "EvolveFrom": "PreEvolution" | None, "BreedFrom": ["FamilyMember"],
+    "Distance": int | None}
+
+    :param str encounters_path: The path to the file containing encounter data.
+    :param str evolution_path: The path to the evolution info reference dictionary.
+    :param str static_path: The path to the static encounters reference dictionary.
+    :param str pokemon_path: The path to the file containing Pokémon data.
+    :return dict[str, dict[str, list[str] | dict[str, str] | str | int | None]]: The obtainability of every Pokémon.
+    """
+    encounter_index = build_encounter_index(encounters_path)
+    pokemon_index = build_pokemon_index(pokemon_path)
+    evo_info = load_reference(evolution_path)
+    static_info = load_reference(static_path)
+
+    table = {}
+    for name in evo_info.keys() | encounter_index.keys() | static_info.keys():
+        static, gift = _split_static_encounters(static_info.get(name) or {})
+        table[name] = {"Wild": encounter_index.get(name, []), "Static": static, "Gift": gift, "EvolveFrom": None,
+                       "BreedFrom": [], "Distance": None}
+
+    # Every Pokémon may be evolved from its pre-evolution, and the first stage may be bred from any other family member
+    for name in evo_info:
+        if name not in pokemon_index:
+            continue
+        family = _family_order(name, evo_info)
+        for evo in _next_stages(name, evo_info):
+            table[evo]["EvolveFrom"] = name
+        if name != family[0]:
+            table[family[0]]["BreedFrom"].append(name)
+
+    # Direct sources are the starting points of the search
+    queue = [name for name, entry in table.items() if entry["Wild"] or entry["Static"] or entry["Gift"]]
+    for name in queue:
+        table[name]["Distance"] = 0
+
+    # Breadth-first search, as every step (evolving or breeding) costs the same
+    for name in queue:
+        family = _family_order(name, evo_info)
+        next_steps = _next_stages(name, evo_info) + ([family[0]] if name != family[0] else [])
+        for target in next_steps:
+            if table[target]["Distance"] is None:
+                table[target]["Distance"] = table[name]["Distance"] + 1
+                queue.append(target)
+
+    # Family members that can breed the first stage are ordered by closeness to a source, unobtainable ones last
+    for entry in table.values():
+        entry["BreedFrom"].sort(key=lambda member: (table[member]["Distance"] is None, table[member]["Distance"] or 0))
+
+    return table
+
+
+@tracked
+def obtainability(internal_name, encounters_path="gamedata/encounters.txt", evolution_path="references/evolution_info.json",
+                  static_path="references/static_encounters.json", pokemon_path="gamedata/pokemon.txt"):
+    """
+    Accesses the obtainability table for a single Pokémon.
+
+    :param str internal_name: The internal name of the Pokémon.
+    :param str encounters_path: The path to the file containing encounter data.
+    :param str evolution_path: The path to the evolution info reference dictionary.
+    :param str static_path: The path to the static encounters reference dictionary.
+    :param str pokemon_path: The path to the file containing Pokémon data.
+    :return dict[str, list[str] | dict[str, str] | str | int | None]: The obtainability of the Pokémon.
+    """
+    table = resolve_obtainability(encounters_path, evolution_path, static_path, pokemon_path)
+    return table.get(internal_name, {"Wild": [], "Static": {}, "Gift": {}, "EvolveFrom": None, "BreedFrom": [],
+                                     "Distance": None})
+
+
+def is_encounterable(internal_name, encounters_path="gamedata/encounters.txt",
+                     evolution_path="references/evolution_info.json", static_path="references/static_encounters.json",
+                     pokemon_path="gamedata/pokemon.txt"):
+    """
+    Decides if a Pokémon can be encountered in battle, either in the wild or as a static encounter.
+
+    :param str internal_name: The internal name of the Pokémon.
+    :param str encounters_path: The path to the file containing encounter data.
+    :param str evolution_path: The path to the evolution info reference dictionary.
+    :param str static_path: The path to the static encounters reference dictionary.
+    :param str pokemon_path: The path to the file containing Pokémon data.
+    :return bool: If the Pokémon can be encountered.
+    """
+    entry = obtainability(internal_name, encounters_path, evolution_path, static_path, pokemon_path)
+    return bool(entry["Wild"] or entry["Static"])
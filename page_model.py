@@ -0,0 +1,373 @@
+# pylint: disable=locally-disabled, line-too-long
+"""
+Contains the structured model of a wiki page, and the renderers that turn it into wikitext, JSON or plain text.
+
+A page model holds every section of a page as a list of blocks, where each block is either a template with its
+parameters or a plain line of text. The model is built once from the generators, and can then be rendered into any
+number of formats without creating the page again. It only holds plain dictionaries, lists and strings, so it can also be
+saved and loaded on its own as JSON.
+
+Format: {"InternalName": "PokémonInternalName", "DisplayName": "PokémonDisplayName",
+"Sections": [{"Key": "SectionKey", "Title": "Title" | None, "Subtitle": "Subtitle" | None, "Blocks": [Block]}]}
+
+A block is one of:
+    {"Template": "TemplateName", "Params": [["Key" | None, "Value"]], "Inline": bool}
+    {"Text": "Line"}
+
+Inline templates take up a single line, e.g., {{MoveLevel+|1|Tackle}}, while others give one parameter per line.
+Positional parameters have a key of None.
+"""
+import json
+import re
+
+# Keys of template parameters are plain names, without any markup of their own
+_PARAM_PATTERNS = {separator: re.compile(r"([^{}\[\]|'=\n]+?)" + re.escape(separator) + r"(.*)", re.DOTALL) for separator in (" = ", "=")}
+
+# The template of the infobox, whose types are the Pokémon's own rather than only the colours of the template
+_INFOBOX_TEMPLATE = "Pokemon Infobox"
+
+# Parameters colouring a section's template by the Pokémon's types, which plain text has no use for
+_STYLE_PARAMS = {"type", "type1", "type2"}
+
+# Icons within text, such as items, along with the " + " between two of them, which have no plain text
+_ICON_PATTERN = re.compile(r"(?:\{\{[Ii]tem\|[^{}]*\}\}|\[\[File:[^\[\]]*\]\])(?: \+ )?")
+
+# Templates within text that colour or mark their last parameter, which is all a reader sees, e.g., {{color|000|Level 16}}
+_LAST_PARAM_TEMPLATES = {"color", "color2", "mcolor", "em"}
+
+# The shown name of each parameter of the Availability template
+_AVAILABILITY_LABELS = {"always": "Always", "common": "Common", "uncommon": "Uncommon", "rare": "Rare", "one": "One-time",
+                        "none": "Not in the wild"}
+
+
+def _split_params(text):
+    """
+    Splits the inside of a template on its top-level "|" characters, ignoring those within nested templates or links.
+
+    :param str text: The inside of a template, e.g., "MoveBreed+|{{EM|107|Smeargle}} '''WIP'''|Curse".
+    :return list[str]: The template name followed by each raw parameter.
+    """
+    if "{{" not in text and "[[" not in text:
+        return text.split("|")
+
+    parts, depth, current = [], 0, ""
+    i = 0
+    while i < len(text):
+        pair = text[i:i + 2]
+        if pair in ("{{", "[[") or (pair in ("}}", "]]") and depth > 0):
+            depth += 1 if pair in ("{{", "[[") else -1
+            current += pair
+            i += 2
+            continue
+
+        if text[i] == "|" and depth == 0:
+            parts.append(current)
+            current = ""
+        else:
+            current += text[i]
+        i += 1
+
+    parts.append(current)
+    return parts
+
+
+def _split_param(param, separator):
+    """
+    Splits a raw template parameter into its key and value, where it has a key.
+
+    :param str param: The raw parameter, e.g., "type = Grass" or "Tackle".
+    :param str separator: The separator between a key and value, which is " = " for one parameter per line.
+    :return list[str | None]: The key, or None if the parameter is positional, and the value.
+    """
+    match = _PARAM_PATTERNS[separator].match(param)
+    return [match[1], match[2]] if match else [None, param]
+
+
+def render_block(block):
+    """
+    Renders a single block of a page model back into wikitext.
+
+    :param dict[str, str | list[list[str | None]] | bool] block: The block to render.
+    :return list[str]: The lines of wikitext.
+    """
+    if "Text" in block:
+        return [block["Text"]]
+
+    if block["Inline"]:
+        params = "".join(f"|{value}" if key is None else f"|{key}={value}" for key, value in block["Params"])
+        return ["{{" + block["Template"] + params + "}}"]
+
+    lines = ["{{" + block["Template"]]
+    lines.extend(f"|{value}" if key is None else f"|{key} = {value}" for key, value in block["Params"])
+    lines.append("}}")
+    return lines
+
+
+def _find_closing_line(lines, start):
+    """
+    Finds the closing line of a template giving one parameter per line.
+
+    :param list[str] lines: The lines of wikitext of a section.
+    :param int start: The index of the template's opening line.
+    :return int | None: The index of the closing line, or None if there is none.
+    """
+    try:
+        return lines.index("}}", start + 1)
+    except ValueError:
+        return None
+
+
+def parse_blocks(lines):
+    """
+    Splits the wikitext lines of a section into blocks of templates and text.
+
+    Parsing is lossless: any line or template that would not render back into exactly the same wikitext is instead kept
+    as text.
+
+    :param list[str] lines: The lines of wikitext of a section.
+    :return list[dict[str, str | list[list[str | None]] | bool]]: The blocks of the section.
+    """
+    blocks = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+
+        # A template giving one parameter per line runs until its closing line
+        end = _find_closing_line(lines, i) if line.startswith("{{") and "}}" not in line and "|" not in line else None
+        if end is not None:
+            params = lines[i + 1:end]
+            if all(param.startswith("|") for param in params):
+                block = {"Template": line[2:], "Params": [_split_param(param[1:], " = ") for param in params], "Inline": False}
+                if render_block(block) == lines[i:end + 1]:
+                    blocks.append(block)
+                    i = end + 1
+                    continue
+
+        # A template on a single line
+        if line.startswith("{{") and line.endswith("}}"):
+            name, *params = _split_params(line[2:-2])
+            block = {"Template": name, "Params": [_split_param(param, "=") for param in params], "Inline": True}
+            if render_block(block) == [line]:
+                blocks.append(block)
+                i += 1
+                continue
+
+        blocks.append({"Text": line})
+        i += 1
+
+    return blocks
+
+
+def layout_lines(sections):
+    """
+    Lays out the sections of a wiki page in order, with the heading of every titled section, and the header repeated as
+    the footer. Each line is given as soon as its section is reached, so only one section needs to exist at a time.
+
+    :param Iterable[tuple[str, str | None, str | None, list[str]]] sections: The key, title, subtitle and lines of each
+        section, in page order.
+    :return Iterator[str]: The lines of the wiki page.
+    """
+    header_footer = []
+    current_title = None
+    for key, title, subtitle, content in sections:
+        if key == "header":
+            header_footer = content
+        elif title is not None and title != current_title:
+            yield f"=='''{title}'''=="
+            current_title = title
+        if subtitle is not None:
+            yield f"==='''{subtitle}'''==="
+
+        yield from content
+        if key == "opening":
+            yield ""
+
+    if header_footer:
+        yield from ["", ""]
+        yield from header_footer
+
+
+def render_wikitext(model):
+    """
+    Renders a page model into wikitext, exactly as the page would be printed to the console.
+
+    :param dict model: The page model.
+    :return Iterator[str]: The lines of wikitext.
+    """
+    yield from layout_lines((section["Key"], section["Title"], section["Subtitle"],
+                             [line for block in section["Blocks"] for line in render_block(block)])
+                            for section in model["Sections"])
+
+
+def render_json(model):
+    """
+    Renders a page model into JSON.
+
+    :param dict model: The page model.
+    :return Iterator[str]: The lines of JSON.
+    """
+    yield from json.dumps(model, ensure_ascii=False, indent=1).split("\n")
+
+
+def strip_markup(text):
+    """
+    Removes the wiki markup from a string, keeping only the text a reader would see.
+
+    Links are replaced by their shown text, icons are dropped, templates within text are replaced by the parameters they
+    show, and line breaks, bold, italics and small text are dropped.
+
+    :param str text: The string of wikitext.
+    :return str: The plain text.
+    """
+    text = _ICON_PATTERN.sub("", text)
+    text = re.sub(r"<br ?/?>|<hr>", " ", text)
+    text = re.sub(r"</?small>", "", text)
+    # Innermost templates first, so nested templates are flattened from the inside out
+    while True:
+        new_text = re.sub(r"\{\{([^{}]*)\}\}", lambda m: _template_text(*_split_params(m.group(1))), text)
+        if new_text == text:
+            break
+        text = new_text
+    # Any brace left over is from a template closed with one too many
+    text = text.replace("{", "").replace("}", "")
+    text = re.sub(r"\[\[(?:[^\[\]|]*\|)?([^\[\]]*)\]\]", r"\1", text)
+    text = text.replace("'''", "").replace("''", "")
+    return " ".join(text.split())
+
+
+def _template_text(name, *params):
+    """
+    :param str name: The name of a template within text, e.g., "color".
+    :param str params: The template's raw parameters.
+    :return str: The text the template shows a reader.
+    """
+    positional = [param for param in params if "=" not in param]
+    if name.lower() in _LAST_PARAM_TEMPLATES:
+        return positional[-1] if positional else ""
+    return " ".join(positional)
+
+
+def _availability_text(params):
+    """
+    :param list[list[str | None]] params: The parameters of the Availability template, without its colours.
+    :return Iterator[str]: A line per group of locations, e.g., "Common: Route 1, Route 2 (Surfing)".
+    """
+    for key, value in params:
+        for group in value.split("<hr>"):
+            group = strip_markup(group)
+            if group:
+                yield f"{_AVAILABILITY_LABELS.get(key, key)}: {group}"
+
+
+def _evobox_text(params):
+    """
+    :param list[list[str | None]] params: The parameters of an Evobox template, without its colours.
+    :return Iterator[str]: A line per stage of the evolution chain, with its types, followed by how it evolves.
+    """
+    stages = {}
+    for key, value in params:
+        match = re.fullmatch(r"([a-z]+\d?-?)(\d+)", key or "")
+        if match:
+            stages.setdefault(match[2], {})[match[1]] = value
+
+    for stage in stages.values():
+        if "name" not in stage:
+            continue
+        types = [stage[key] for key in ("type1-", "type2-") if key in stage]
+        yield f"{stage['name']} ({'/'.join(types)})" if types else stage["name"]
+        if "evo" in stage:
+            yield f"  evolves: {strip_markup(stage['evo'])}"
+
+
+def _block_text(block):
+    """
+    Renders a single template block of a page model into plain text.
+
+    :param dict[str, str | list[list[str | None]] | bool] block: The block to render.
+    :return Iterator[str]: The lines of plain text.
+    """
+    name = block["Template"]
+    # The start and end of a learnset only repeat the Pokémon's name and types
+    if name.endswith(("Start", "End")):
+        return
+    params = [[key, value] for key, value in block["Params"] if name == _INFOBOX_TEMPLATE or key not in _STYLE_PARAMS]
+
+    section_renderer = _SECTION_TEXT_RENDERERS.get(name.split("-")[0])
+    if section_renderer is not None:
+        yield from section_renderer(params)
+    elif block["Inline"]:
+        text = " ".join(filter(None, (strip_markup(value) for key, value in params if key is None)))
+        if text:
+            yield text
+    else:
+        for key, value in params:
+            value = strip_markup(value)
+            yield value if key is None else f"{key}: {value}"
+
+
+def render_text(model):
+    """
+    Renders a page model into plain text, which is easier to read, search and compare than wikitext.
+
+    Each template gives a line per parameter, with a single-line template's parameters joined together, other than the
+    game locations and evolution box, which give a line per group of locations and per stage. The Pokémon's name and
+    types are only given once, at the top of the page, rather than with every section.
+
+    :param dict model: The page model.
+    :return Iterator[str]: The lines of plain text.
+    """
+    yield model["DisplayName"]
+    yield "=" * len(model["DisplayName"])
+    current_title = None
+    for section in model["Sections"]:
+        if section["Title"] is not None and section["Title"] != current_title:
+            yield ""
+            yield section["Title"]
+            yield "-" * len(section["Title"])
+            current_title = section["Title"]
+        if section["Subtitle"] is not None:
+            yield f"{section['Subtitle']}:"
+
+        for block in section["Blocks"]:
+            if "Text" in block:
+                text = strip_markup(block["Text"])
+                if text:
+                    yield text
+            else:
+                yield from _block_text(block)
+
+
+# The plain text renderer of each section's template with a structure of its own, by template name without its size
+_SECTION_TEXT_RENDERERS = {
+    "Availability": _availability_text,
+    "Evobox": _evobox_text
+}
+
+# Every renderer, by format, along with the file extension of a page in that format
+RENDERERS = {
+    "wiki": (render_wikitext, ".wiki"),
+    "json": (render_json, ".json"),
+    "text": (render_text, ".txt")
+}
+
+
+def save_model(model, path):
+    """
+    Saves a page model to a JSON file, so it can be rendered again later without creating the page.
+
+    :param dict model: The page model.
+    :param str path: The path of the file to write.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(model, f, ensure_ascii=False)
+
+
+def load_model(path):
+    """
+    Loads a page model saved by save_model.
+
+    :param str path: The path of the file to read.
+    :return dict: The page model.
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
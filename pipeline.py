@@ -0,0 +1,211 @@
+# pylint: disable=locally-disabled, line-too-long, broad-exception-caught
+"""
+Generates the wiki pages for many Pokémon as a staged pipeline, in which each page moves through four stages in turn:
+
+    lookup   - extracts the Pokémon's data needed by the chosen sections from the game files
+    compute  - creates the page model from every chosen section of each generator
+    render   - renders the page model into the lines of the page, in the chosen format
+    write    - writes the page to its file
+
+Each stage runs as its own asyncio task, taking pages from a bounded queue and putting them onto the next, so every
+stage works on a different page at once. File writes are handed off to a thread, so a page is being written while the
+next ones are looked up and computed. As every queue is bounded, only a handful of pages are ever held in memory, no
+matter how many pages are generated; a stage that gets ahead of the next simply waits for space, and the time spent
+waiting is counted so the slowest stage can be seen.
+"""
+import asyncio
+import logging
+import os
+import time
+from batch import page_filename, write_page
+from page_model import RENDERERS
+from section_cache import SectionCache
+from wiki import create_wiki_page
+
+# Marks the end of the pages on a queue
+_DONE = object()
+
+
+class StageCounter:
+    """
+    Simple class counting the work done by a single stage of the pipeline.
+    """
+    def __init__(self, name):
+        """
+        The init function of StageCounter.
+
+        :param str name: The name of the stage.
+        """
+        self.name = name
+        self.processed = 0
+        self.failed = 0
+        self.busy_time = 0.0
+        self.idle_time = 0.0
+        self.blocked_time = 0.0
+        self.max_queue = 0
+
+    def throughput(self):
+        """
+        Calculates the number of pages the stage could process per second, were it never kept waiting.
+
+        :return float: The number of pages per second of busy time.
+        """
+        return self.processed / self.busy_time if self.busy_time else 0.0
+
+
+class Pipeline:
+    """
+    Simple class generating and writing wiki pages through the lookup, compute, render and write stages.
+    """
+    def __init__(self, out_dir, queue_size=8, selection=None, page_format="wiki", cache_dir=None):
+        """
+        The init function of Pipeline.
+
+        :param str out_dir: The directory to write pages to, which is created if needed.
+        :param int queue_size: The most pages held in the queue between any two stages.
+        :param tuple[str] | None selection: The keys of the sections to generate, or None for every section.
+        :param str page_format: The format to write pages in, as in page_model.RENDERERS.
+        :param str | None cache_dir: The directory of the section cache to reuse unchanged sections from, if any.
+        """
+        self.out_dir = out_dir
+        self.queue_size = queue_size
+        self.selection = selection
+        self.renderer, self.extension = RENDERERS[page_format]
+        self.section_cache = SectionCache(cache_dir) if cache_dir else None
+        self.counters = {name: StageCounter(name) for name in ("lookup", "compute", "render", "write")}
+        self.results = {}
+        self._used_names = set()
+
+    def _lookup(self, item):
+        wiki_page = create_wiki_page(item["InternalName"], self.section_cache)
+        wiki_page.load_game_data(self.selection)
+        item["Page"] = wiki_page
+
+    def _compute(self, item):
+        item["Model"] = item.pop("Page").create_model(self.selection)
+
+    def _render(self, item):
+        item["DisplayName"] = item["Model"]["DisplayName"]
+        item["Lines"] = list(self.renderer(item.pop("Model")))
+
+    async def _write(self, item):
+        filename = page_filename(item["DisplayName"], item["InternalName"], self._used_names, self.extension)
+        await asyncio.to_thread(write_page, item.pop("Lines"), os.path.join(self.out_dir, filename))
+        item["File"] = filename
+
+    async def _run_stage(self, name, work, in_queue, out_queue=None):
+        """
+        Runs a single stage, taking each page from its input queue, working on it, and passing it on to the next stage.
+
+        A page which fails at any stage is passed on untouched with its error, so it is still recorded at the end.
+
+        :param str name: The name of the stage.
+        :param Callable work: The work done on each page, which is either a plain function or a coroutine function.
+        :param asyncio.Queue in_queue: The queue to take pages from.
+        :param asyncio.Queue | None out_queue: The queue to put pages onto, or None if this is the last stage.
+        """
+        counter = self.counters[name]
+        while True:
+            start = time.perf_counter()
+            item = await in_queue.get()
+            counter.idle_time += time.perf_counter() - start
+            counter.max_queue = max(counter.max_queue, in_queue.qsize() + 1)
+
+            if item is not _DONE and item["Error"] is None:
+                start = time.perf_counter()
+                try:
+                    result = work(item)
+                    if asyncio.iscoroutine(result):
+                        await result
+                    counter.processed += 1
+                except Exception as e:
+                    logging.error("Error in the %s stage of the wiki page for %s:", name, item["InternalName"], exc_info=True)
+                    item["Error"] = f"{type(e).__name__}: {e}"
+                    counter.failed += 1
+                elapsed = time.perf_counter() - start
+                counter.busy_time += elapsed
+                item["Time"] += elapsed
+
+            if out_queue is None:
+                if item is _DONE:
+                    return
+                self.results[item["InternalName"]] = {"File": item.get("File"), "Time": item["Time"], "Error": item["Error"]}
+                continue
+
+            # Waiting for space in the next queue is backpressure from a slower stage further on
+            start = time.perf_counter()
+            await out_queue.put(item)
+            counter.blocked_time += time.perf_counter() - start
+            if item is _DONE:
+                return
+
+    async def _feed(self, internal_names, queue):
+        """
+        Puts every Pokémon onto the first queue, waiting for space whenever the lookup stage falls behind.
+
+        :param list[str] internal_names: The internal names of the Pokémon to generate pages for.
+        :param asyncio.Queue queue: The input queue of the lookup stage.
+        """
+        for internal_name in internal_names:
+            await queue.put({"InternalName": internal_name, "Time": 0.0, "Error": None})
+        await queue.put(_DONE)
+
+    async def run(self, internal_names):
+        """
+        Runs every page through the pipeline.
+
+        :param list[str] internal_names: The internal names of the Pokémon to generate pages for.
+        :return dict[str, dict[str, str | float | None]]: For each Pokémon, the file written, the time taken, and any
+            error, in the same format as batch.run_batch.
+        """
+        os.makedirs(self.out_dir, exist_ok=True)
+        queues = [asyncio.Queue(self.queue_size) for _ in range(len(self.counters))]
+        stages = [("lookup", self._lookup), ("compute", self._compute), ("render", self._render), ("write", self._write)]
+
+        tasks = [self._feed(internal_names, queues[0])]
+        for i, (name, work) in enumerate(stages):
+            out_queue = queues[i + 1] if i + 1 < len(queues) else None
+            tasks.append(self._run_stage(name, work, queues[i], out_queue))
+        await asyncio.gather(*tasks)
+
+        # Pages are recorded in the order they were given, the same as a batch run
+        return {name: self.results[name] for name in internal_names if name in self.results}
+
+
+def run_pipeline(internal_names, out_dir, queue_size=8, selection=None, page_format="wiki", cache_dir=None):
+    """
+    Generates and writes the wiki page of every given Pokémon to the output directory through the staged pipeline.
+
+    :param list[str] internal_names: The internal names of the Pokémon to generate pages for.
+    :param str out_dir: The directory to write pages to, which is created if needed.
+    :param int queue_size: The most pages held in the queue between any two stages.
+    :param tuple[str] | None selection: The keys of the sections to generate, or None for every section.
+    :param str page_format: The format to write pages in, as in page_model.RENDERERS.
+    :param str | None cache_dir: The directory of the section cache to reuse unchanged sections from, if any.
+    :return tuple[dict[str, dict[str, str | float | None]], dict[str, StageCounter]]: The results of every Pokémon, in
+        the same format as batch.run_batch, and the counters of every stage.
+    """
+    pipeline = Pipeline(out_dir, queue_size, selection, page_format, cache_dir)
+    results = asyncio.run(pipeline.run(internal_names))
+    return results, pipeline.counters
+
+
+def print_stage_report(counters, wall_time=None):
+    """
+    Prints the work done by each stage of the pipeline.
+
+    Busy time is time spent working on pages, idle time is time spent waiting for a page from the previous stage, and
+    blocked time is time spent waiting for space in the next stage's queue. A stage with a lot of idle time is waiting
+    on a slower stage before it, and a stage with a lot of blocked time is being held back by a slower stage after it.
+
+    :param dict[str, StageCounter] counters: The counters of every stage.
+    :param float | None wall_time: The wall time of the whole run.
+    """
+    print(f"\n{'Stage':<8} {'Pages':>6} {'Failed':>6} {'Busy (s)':>9} {'Idle (s)':>9} {'Blocked (s)':>11} {'Max queue':>9} {'Pages/s':>9}")
+    for counter in counters.values():
+        print(f"{counter.name:<8} {counter.processed:>6} {counter.failed:>6} {counter.busy_time:>9.2f} {counter.idle_time:>9.2f} "
+              f"{counter.blocked_time:>11.2f} {counter.max_queue:>9} {counter.throughput():>9.1f}")
+
+    if wall_time:
+        bottleneck = max(counters.values(), key=lambda counter: counter.busy_time)
+        print(f"Bottleneck: {bottleneck.name} ({bottleneck.busy_time / wall_time:.0%} of wall time busy).")
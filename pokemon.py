@@ -1,23 +1,22 @@
 # pylint: disable=line-too-long, too-many-boolean-expressions, missing-module-docstring, F0401, too-many-locals
 import logging
-from data_access import gender_code, growth_rate, pokemon_info, wild_item_info, ability_info, species_and_dex_entry
-from utility_methods import make_three_digits, find_dex_number, get_two_types
-from evolution import EvolutionHandler
+from data_access import gender_code, growth_rate, wild_item_info, species_and_dex_entry
 
 
 class PokemonBoxGenerator:
     """
     A class containing all the methods related to formatting extracted data from pokemon.txt for wiki display.
     """
-    def __init__(self, p_data):
+    def __init__(self, context):
         """
         The init function of PokemonBoxGenerator.
 
-        :param p_data: A dictionary containing all the Pokémon's data in pokemon.txt.
+        :param SpeciesContext context: The facts shared by every generator of the Pokémon's wiki page.
         """
-        self.p_data = p_data
-        self.first_type, self.second_type = get_two_types(p_data)
-        self.name = pokemon_info(find_dex_number(p_data["RegionalNumbers"]))["DisplayName"]
+        self.context = context
+        self.p_data = context.p_data
+        self.first_type, self.second_type = context.types
+        self.name = context.display_name
 
     def create_header_footer(self):
         """
@@ -30,41 +29,10 @@ class PokemonBoxGenerator:
         if self.second_type != self.first_type:
             head_foot.append("|type2 = " + self.second_type)
 
-        dex_num = find_dex_number(self.p_data["RegionalNumbers"])
-
-        # Each dex has different lengths and thus different rules in deciding next/prev.
-        def get_prev_next(num, region):
-            prev_num = make_three_digits(str(num - 1))
-            next_num = make_three_digits(str(num + 1))
-
-            # Defines the boundaries of the dexes
-            dex_bounds = {"": 583, "X": 44, "V": 207}
-
-            if num > 1:
-                head_foot.append(f"|prev = {pokemon_info(region + prev_num)["DisplayName"]}")
-                head_foot.append(f"|prevnum = {region + prev_num}")
-            # If the number is 1, it will go to the last number of the dex
-            else:
-                for reg, bound in dex_bounds.items():
-                    if region == reg:
-                        head_foot.append(f"|prev = {pokemon_info(reg + make_three_digits(str(bound)))["DisplayName"]}")
-                        head_foot.append(f"|prevnum = {reg + make_three_digits(str(bound))}")
-
-            # Deciding next number & pokémon, accounting for the different bounds of each dex
-            if num < dex_bounds[region]:
-                head_foot.append(f"|next = {pokemon_info(region + next_num)["DisplayName"]}")
-                head_foot.append(f"|nextnum = {region + next_num}")
-            else:
-                head_foot.append(f"|next = {pokemon_info(region + "001")["DisplayName"]}")
-                head_foot.append(f"|nextnum = {region + '001'}")
-
-        # Specific range is chosen to obtain only digits and ignore either the region or any alt forms i.e., ABC_1
-        if dex_num[0] == "X":
-            get_prev_next(int(dex_num[1:4]), "X")
-        elif dex_num[0] == "V":
-            get_prev_next(int(dex_num[1:4]), "V")
-        else:
-            get_prev_next(int(dex_num[:3]), "")
+        # Each dex has different lengths, and the first and last Pokémon of each wrap around to each other
+        neighbours = self.context.neighbours
+        head_foot.extend([f"|prev = {neighbours["PrevName"]}", f"|prevnum = {neighbours["PrevNumber"]}",
+                          f"|next = {neighbours["NextName"]}", f"|nextnum = {neighbours["NextNumber"]}"])
 
         head_foot.append("}}")
 
@@ -90,17 +58,12 @@ class PokemonBoxGenerator:
             infobox.append("|species = WIP")
 
         # Dex & Image
-        dex_nums = find_dex_number(self.p_data["RegionalNumbers"])
-        infobox.append("|ndex = " + dex_nums)
+        infobox.append("|ndex = " + self.context.dex_number)
         infobox.append("|image = " + self.name.replace(" ", "") + ".png")
 
         # Abilities
-        reg_abilities = self.p_data["Abilities"].split(",")
-        infobox.append("|ability1 = " + ability_info(reg_abilities[0]))
-        if len(reg_abilities) > 1:
-            infobox.append("|ability2 = " + ability_info(reg_abilities[1]))
-        if "HiddenAbility" in self.p_data:
-            infobox.append("|hiddenability = " + ability_info(self.p_data["HiddenAbility"]))
+        for field, ability_name in self.context.ability_names.items():
+            infobox.append(f"|{field} = " + ability_name)
 
         # Gender, Catch Rate
         infobox.extend(["|gendercode = " + gender_code(self.p_data["GenderRate"]),
@@ -112,7 +75,7 @@ class PokemonBoxGenerator:
         if len(egg_groups) > 1:
             infobox.append("|egggroup2 = " + egg_groups[1])
         infobox.append("|eggsteps = " + self.p_data["StepsToHatch"])
-        chain_pos = EvolutionHandler(self.p_data).get_chain_position()
+        chain_pos = self.context.evolution.get_chain_position()
         if chain_pos > 1:
             infobox.append("|egggroupn = 0 <!-- 0 if can't legitimately obtain this as an egg -->")
 
@@ -186,8 +149,7 @@ class PokemonBoxGenerator:
         determiner = "an" if typing[7] in ["E", "I"] else "a"
         opening_paragraph = [f"'''{self.name}''' is {determiner} {dual_type}{typing}-type Pokémon.", ""]
 
-        evh = EvolutionHandler(self.p_data)
-        evo_statement = evh.create_evolution_statement()
+        evo_statement = self.context.evolution.create_evolution_statement()
         opening_paragraph.append(evo_statement)
 
         return opening_paragraph
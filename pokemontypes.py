@@ -1,6 +1,5 @@
 # pylint: disable=locally-disabled, line-too-long, missing-module-docstring, too-few-public-methods
 from data_access import ability_immunities
-from utility_methods import get_two_types
 
 
 def _generate_type_chart():
@@ -80,18 +79,17 @@ class TypeEffectivenessCalculator:
     that grant immunities and otherwise indicating extra information if some immunities are removed in the course of a
     battle.
     """
-    def __init__(self, p_data):
+    def __init__(self, context):
         """
         The init function for TypeEffectivenessCalculator
 
-        :param p_data: A dictionary containing all the Pokémon's data in pokemon.txt.
+        :param SpeciesContext context: The facts shared by every generator of the Pokémon's wiki page.
         """
-        self.p_data = p_data
-        self.first_type, self.second_type = get_two_types(p_data)
+        self.context = context
+        self.p_data = context.p_data
+        self.first_type, self.second_type = context.types
 
-        self.abilities = p_data["Abilities"].split(",")
-        if "HiddenAbility" in p_data:
-            self.abilities.append(p_data["HiddenAbility"])
+        self.abilities = context.abilities
 
         # Indicates if a note box is needed
         self.notes = False
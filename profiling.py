@@ -0,0 +1,265 @@
+# pylint: disable=locally-disabled, line-too-long, global-statement
+"""
+Measures where the time of a run goes: the wall time of every section of every wiki page, the files opened and bytes
+read through read_file_lines and load_reference, the JSON files parsed, and the hits and misses of every cache.
+
+Profiling is opt-in. Nothing is measured unless a profile is active, and every hook below does nothing otherwise, e.g.:
+
+    with profile() as run:
+        create_wiki_page("BULBASAUR").create_sections()
+    print_profile_report(run)
+    dump_profile(run, "profile.json")
+
+Everything measured while a section is being created is counted towards that section's page, and anything else, such as
+loading the game data up front, is counted towards the run as a whole.
+
+Format of each page, and of the rest of the run:
+{"Time": float, "Sections": {"SectionKey": float}, "FileOpens": int, "BytesRead": int, "Files": {"Filename": int},
+ "JsonParses": int, "Caches": {"CacheName": {"Hits": int, "Misses": int}}}
+"""
+import contextlib
+import json
+import os
+import time
+
+# Every functools cache whose hits are counted, by name
+_CACHES = {}
+
+# The active profile, if any
+_profile = None
+
+
+def register_cache(func):
+    """
+    Marks a function cached with functools.cache as one whose hits and misses are counted while profiling.
+
+    :param Callable func: The cached function, which must have a cache_info method.
+    :return Callable: The same function.
+    """
+    _CACHES[f"{func.__module__}.{func.__qualname__}"] = func
+    return func
+
+
+def _new_counts():
+    return {"Time": 0.0, "Sections": {}, "FileOpens": 0, "BytesRead": 0, "Files": {}, "JsonParses": 0, "Caches": {}}
+
+
+def _cache_snapshot():
+    return {name: func.cache_info() for name, func in _CACHES.items()}
+
+
+def _cache_deltas(before):
+    """
+    :param dict[str, Any] before: An earlier snapshot of every counted cache.
+    :return Iterator[tuple[str, int, int]]: The name of each cache, with the hits and misses since the snapshot. A cache
+        cleared since then counts from zero again.
+    """
+    for name, info in _cache_snapshot().items():
+        earlier = before.get(name)
+        if earlier is None or info.hits < earlier.hits or info.misses < earlier.misses:
+            yield name, info.hits, info.misses
+        else:
+            yield name, info.hits - earlier.hits, info.misses - earlier.misses
+
+
+def _add_cache_counts(caches, name, hits, misses):
+    if hits or misses:
+        counts = caches.setdefault(name, {"Hits": 0, "Misses": 0})
+        counts["Hits"] += hits
+        counts["Misses"] += misses
+
+
+class Profile:
+    """
+    Simple class collecting everything measured while it is active, for each page and for the rest of the run.
+    """
+    def __init__(self):
+        """
+        The init function of Profile.
+        """
+        # The counts of each page, by internal name, in the order pages were first profiled
+        self.pages = {}
+        # The counts of everything outside a page's sections
+        self.other = _new_counts()
+        self.wall_time = 0.0
+        self._current = self.other
+
+    def counts(self):
+        """
+        :return dict: The counts that anything measured now is added to.
+        """
+        return self._current
+
+    @contextlib.contextmanager
+    def section(self, internal_name, key):
+        """
+        Counts everything measured within the context towards a section of a page, including the time it takes.
+
+        :param str internal_name: The internal name of the page's Pokémon.
+        :param str key: The key of the section.
+        """
+        page = self.pages.setdefault(internal_name, _new_counts())
+        previous, self._current = self._current, page
+        before = _cache_snapshot()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            page["Time"] += elapsed
+            page["Sections"][key] = page["Sections"].get(key, 0.0) + elapsed
+            for name, hits, misses in _cache_deltas(before):
+                _add_cache_counts(page["Caches"], name, hits, misses)
+            self._current = previous
+
+    def aggregate(self):
+        """
+        Adds up the counts of every page and the rest of the run.
+
+        :return dict: The total counts, with the total and mean time of each section across every page, and the hit
+            rate of each cache.
+        """
+        total = _new_counts()
+        for counts in (*self.pages.values(), self.other):
+            total["Time"] += counts["Time"]
+            for key, elapsed in counts["Sections"].items():
+                section = total["Sections"].setdefault(key, {"Time": 0.0, "Count": 0})
+                section["Time"] += elapsed
+                section["Count"] += 1
+            for field in ("FileOpens", "BytesRead", "JsonParses"):
+                total[field] += counts[field]
+            for filename, opens in counts["Files"].items():
+                total["Files"][filename] = total["Files"].get(filename, 0) + opens
+            for name, cache in counts["Caches"].items():
+                _add_cache_counts(total["Caches"], name, cache["Hits"], cache["Misses"])
+
+        for section in total["Sections"].values():
+            section["Mean"] = section["Time"] / section["Count"]
+        for cache in total["Caches"].values():
+            cache["HitRate"] = cache["Hits"] / (cache["Hits"] + cache["Misses"])
+        total["Pages"] = len(self.pages)
+        total["WallTime"] = self.wall_time
+        return total
+
+    def to_dict(self):
+        """
+        :return dict: Everything measured, as stored by dump_profile.
+        """
+        return {"Aggregate": self.aggregate(), "Other": self.other, "Pages": self.pages}
+
+
+def is_profiling():
+    """
+    :return bool: Whether a profile is active.
+    """
+    return _profile is not None
+
+
+@contextlib.contextmanager
+def profile():
+    """
+    Profiles everything run within the context. Profiles do not nest, with an inner profile replacing any outer one
+    until it ends.
+
+    :return Iterator[Profile]: The profile, which is filled in as the context runs.
+    """
+    global _profile
+    previous, _profile = _profile, Profile()
+    run = _profile
+    before = _cache_snapshot()
+    start = time.perf_counter()
+    try:
+        yield run
+    finally:
+        run.wall_time = time.perf_counter() - start
+        _profile = previous
+
+        # Cache accesses made outside of every section are counted towards the rest of the run
+        for name, hits, misses in _cache_deltas(before):
+            in_pages = [page["Caches"].get(name, {"Hits": 0, "Misses": 0}) for page in run.pages.values()]
+            hits -= sum(cache["Hits"] for cache in in_pages)
+            misses -= sum(cache["Misses"] for cache in in_pages)
+            _add_cache_counts(run.other["Caches"], name, max(hits, 0), max(misses, 0))
+
+
+def profile_section(internal_name, key):
+    """
+    Counts everything measured within the context towards a section of a page, if a profile is active.
+
+    :param str internal_name: The internal name of the page's Pokémon.
+    :param str key: The key of the section.
+    :return ContextManager: The context.
+    """
+    if _profile is None:
+        return contextlib.nullcontext()
+    return _profile.section(internal_name, key)
+
+
+def count_file_read(filename):
+    """
+    Counts a file being opened and read in full, if a profile is active.
+
+    :param str filename: The path of the file.
+    """
+    if _profile is not None:
+        counts = _profile.counts()
+        counts["FileOpens"] += 1
+        counts["BytesRead"] += os.path.getsize(filename)
+        counts["Files"][filename] = counts["Files"].get(filename, 0) + 1
+
+
+def count_json_parse():
+    """
+    Counts a JSON file being parsed, if a profile is active.
+    """
+    if _profile is not None:
+        _profile.counts()["JsonParses"] += 1
+
+
+def count_cache_lookup(name, hit):
+    """
+    Counts a lookup in a cache that is not a functools cache, e.g., the section cache, if a profile is active.
+
+    :param str name: The name of the cache.
+    :param bool hit: Whether the lookup was a hit.
+    """
+    if _profile is not None:
+        _add_cache_counts(_profile.counts()["Caches"], name, int(hit), int(not hit))
+
+
+def print_profile_report(run, slowest=10):
+    """
+    Prints where the time of a run went: the time, file reads, JSON parses and cache hit rates of the run as a whole and
+    of each section, then the same for the slowest pages.
+
+    :param Profile run: The profile of the run.
+    :param int slowest: The number of slowest pages to show.
+    """
+    total = run.aggregate()
+    print(f"\nProfiled {total['Pages']} pages in {total['WallTime']:.2f}s, {total['Time']:.2f}s of which in sections.")
+    print(f"Opened {total['FileOpens']} files, reading {total['BytesRead'] / 1024:.1f}KiB, and parsed {total['JsonParses']} JSON files.")
+
+    print("\nTime by section:")
+    for key, section in sorted(total["Sections"].items(), key=lambda x: -x[1]["Time"]):
+        print(f"  {key:<14}{section['Time']:>8.3f}s  {section['Mean'] * 1000:>7.2f}ms per page")
+
+    print("\nCache hit rates:")
+    for name, cache in sorted(total["Caches"].items()):
+        print(f"  {name:<48}{cache['HitRate']:>7.1%}  ({cache['Hits']} hits, {cache['Misses']} misses)")
+
+    print(f"\nSlowest {min(slowest, len(run.pages))} pages:")
+    for internal_name, page in sorted(run.pages.items(), key=lambda x: -x[1]["Time"])[:slowest]:
+        sections = ", ".join(f"{key} {elapsed * 1000:.1f}ms" for key, elapsed in sorted(page["Sections"].items(), key=lambda x: -x[1])[:3])
+        print(f"  {internal_name}: {page['Time'] * 1000:.1f}ms ({sections}); {page['FileOpens']} files, {page['JsonParses']} JSON parses")
+
+
+def dump_profile(run, path):
+    """
+    Writes everything measured in a run to a JSON file, for comparison against later runs.
+
+    :param Profile run: The profile of the run.
+    :param str path: The path of the JSON file.
+    """
+    with open(path + ".part", "w", encoding="utf-8") as f:
+        json.dump(run.to_dict(), f, ensure_ascii=False, indent=1)
+    os.replace(path + ".part", path)
@@ -0,0 +1,138 @@
+# pylint: disable=locally-disabled, line-too-long
+"""
+Caches the output of every section of every wiki page on disk, so that a later run only computes the sections whose
+inputs have changed.
+
+Each cached section is stored along with every tracked data access made while computing it (see dependencies), and a
+digest of the program's own code. A cached section is only reused if the code is unchanged, and if making each recorded
+access again gives the same result as before. As only what the section actually read is checked, a change to one
+Pokémon's data does not invalidate the sections of every other Pokémon, e.g., BULBASAUR's learnsets are reused after an
+edit to another Pokémon's TMs, but recomputed after an edit to its own.
+
+The cache holds one JSON file per Pokémon.
+
+Format: "SectionKey" -> {"Code": "CodeDigest", "Dependencies": [["TrackedFunctionName", [args], "ResultDigest"]],
+"Content": ["Line"]}
+"""
+import functools
+import glob
+import hashlib
+import json
+import os
+from dependencies import current_digest
+from profiling import count_cache_lookup, count_file_read, count_json_parse
+
+
+@functools.cache
+def code_digest(source_dir="."):
+    """
+    Creates a digest of every Python module that creates a wiki page, so that any change to the code invalidates every
+    cached section.
+
+    :param str source_dir: The directory containing the modules.
+    :return str: The digest of the code.
+    """
+    code = hashlib.blake2b(digest_size=16)
+    for filename in sorted(glob.glob(os.path.join(source_dir, "*.py"))):
+        with open(filename, "rb") as f:
+            code.update(f.read())
+    return code.hexdigest()
+
+
+class SectionCache:
+    """
+    Simple class storing and checking the cached sections of wiki pages in a cache directory.
+    """
+    def __init__(self, cache_dir=".cache/sections"):
+        """
+        The init function of SectionCache.
+
+        :param str cache_dir: The directory to store cached sections in, which is created if needed.
+        """
+        self.cache_dir = cache_dir
+        self.code = code_digest()
+        self.hits = 0
+        self.misses = 0
+        # The current digest of each recorded data access, as many sections make the same accesses
+        self._digests = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, internal_name):
+        return os.path.join(self.cache_dir, f"{internal_name}.json")
+
+    def load(self, internal_name):
+        """
+        Loads every cached section of a Pokémon's page.
+
+        :param str internal_name: The internal name of the Pokémon.
+        :return dict[str, dict[str, str | list]]: The cached sections, by section key.
+        """
+        try:
+            with open(self._path(internal_name), encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        count_file_read(self._path(internal_name))
+        count_json_parse()
+        return entries
+
+    def store(self, internal_name, entries):
+        """
+        Stores every cached section of a Pokémon's page, replacing any stored before.
+
+        :param str internal_name: The internal name of the Pokémon.
+        :param dict[str, dict[str, str | list]] entries: The cached sections, by section key.
+        """
+        path = self._path(internal_name)
+        with open(path + ".part", "w", encoding="utf-8") as f:
+            f.write(json.dumps(entries, ensure_ascii=False))
+        os.replace(path + ".part", path)
+
+    def current_digest(self, name, args):
+        """
+        Finds the digest of a recorded data access given the data as it is now, remembering it for later checks.
+
+        :param str name: The name of the tracked function.
+        :param list | tuple args: The arguments it was called with.
+        :return str | None: The digest of the result, or None if the call now fails.
+        """
+        key = (name, tuple(args))
+        if key not in self._digests:
+            self._digests[key] = current_digest(name, tuple(args))
+        return self._digests[key]
+
+    def is_fresh(self, entry):
+        """
+        Decides if a cached section can be reused, which is only if the code and every input it read are unchanged.
+
+        :param dict[str, str | list] entry: The cached section.
+        :return bool: If the section can be reused.
+        """
+        fresh = entry.get("Code") == self.code and all(self.current_digest(name, args) == result
+                                                      for name, args, result in entry["Dependencies"])
+        if fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+        count_cache_lookup("section_cache.SectionCache", fresh)
+        return fresh
+
+    def create_entry(self, content, recording):
+        """
+        Creates the cached form of a newly computed section.
+
+        :param list[str] content: The lines of the section.
+        :param dict[tuple[str, tuple], str] recording: Every data access made while computing the section.
+        :return dict[str, str | list]: The cached section.
+        """
+        for (name, args), result in recording.items():
+            self._digests[(name, args)] = result
+        dependencies = sorted([name, list(args), result] for (name, args), result in recording.items())
+        return {"Code": self.code, "Dependencies": dependencies, "Content": list(content)}
+
+    def forget_data(self):
+        """
+        Forgets the current digest of every data access, which must be done whenever the data may have changed within
+        the lifetime of the cache.
+        """
+        self._digests.clear()
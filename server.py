@@ -0,0 +1,225 @@
+# pylint: disable=locally-disabled, line-too-long, broad-exception-caught
+"""
+Serves wiki pages, sections, species lists and game data queries over HTTP on localhost, from a single long-lived
+process that keeps the game data and reference dictionaries loaded between requests.
+
+Every file is read once when the server starts, so each request only does the work of its own page, usually within a
+few milliseconds. Once the files have been edited, a reload request reads them again without restarting the server.
+
+Endpoints, all answered with UTF-8 text or JSON:
+
+    GET  /page/BULBASAUR                    The full wiki page.
+    GET  /page/BULBASAUR?format=json        The page in any format of page_model.RENDERERS.
+    GET  /page/BULBASAUR?sections=learnset  Only some sections of the page, as with --sections.
+    GET  /section/BULBASAUR/tm              The content of one section (or all sections under a title), without headings.
+    GET  /list                              The internal name of every Pokémon, in dex order.
+    GET  /list?range=X001-X044              The internal names within a range of dex numbers.
+    GET  /query/pokemon/BULBASAUR           The Pokémon's data from pokemon.txt, or any other query in QUERIES.
+    GET  /query/move_info/TACKLE            An entry of a reference dictionary.
+    POST /reload                            Reads every file again if any has changed since the last load.
+    POST /reload?force=1                    Reads every file again regardless.
+
+Requests are handled one at a time, as creating a page is pure CPU work that would not gain from threads, and tracking
+data accesses is not thread-safe. Run from the root of the repository, e.g.:
+
+    python main.py --serve
+    python main.py --serve --port 8080
+"""
+import json
+import logging
+import time
+import urllib.parse
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import data_access
+from batch import all_species, preload_game_data, reload_game_data, species_in_range
+from data_collection import DataCollection
+from obtainability import obtainability
+from page_model import RENDERERS
+from watch import changed_files, snapshot
+from wiki import SECTIONS, create_wiki_page, select_sections
+
+# Every game data query, by name, each taking a single key
+QUERIES = {
+    "pokemon": lambda name: DataCollection(name.upper()).extract_pokemon_data(),
+    "moves": lambda name: DataCollection(name.upper()).extract_move_data(),
+    "encounters": lambda name: DataCollection(name.upper()).extract_encounter_data(),
+    "obtainability": lambda name: obtainability(name.upper()),
+    "gender_code": data_access.gender_code,
+    "growth_rate": data_access.growth_rate,
+    "tm_info": data_access.tm_info,
+    "move_info": data_access.move_info,
+    "wild_item_info": data_access.wild_item_info,
+    "pokemon_info": data_access.pokemon_info,
+    "location_info": data_access.location_info,
+    "ability_info": data_access.ability_info,
+    "ability_immunities": data_access.ability_immunities,
+    "static_encounters": data_access.static_encounters,
+    "species_and_dex_entry": data_access.species_and_dex_entry,
+    "evolution_info": data_access.evolution_info
+}
+
+
+class RequestError(Exception):
+    """
+    Raised when a request cannot be answered, carrying the HTTP status to answer with instead.
+    """
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class PageRequestHandler(BaseHTTPRequestHandler):
+    """
+    Simple class answering each request to the page server from the data already loaded in the process.
+    """
+    server_version = "XenoverseWikiServer/1.0"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self._handle({"page": self.get_page, "section": self.get_section, "list": self.get_list, "query": self.get_query})
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self._handle({"reload": self.post_reload})
+
+    def _handle(self, routes):
+        """
+        Answers a request with the route named by the first part of its path.
+
+        :param dict[str, Callable[[list[str], dict[str, str]], tuple[str, str]]] routes: Each route, by name, taking
+            the rest of the path and the query parameters, and giving the content type and body of the answer.
+        """
+        url = urllib.parse.urlsplit(self.path)
+        parts = [urllib.parse.unquote(part) for part in url.path.strip("/").split("/")]
+        params = dict(urllib.parse.parse_qsl(url.query))
+        try:
+            if parts[0] not in routes:
+                raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown endpoint '/{parts[0]}'.")
+            content_type, body = routes[parts[0]](parts[1:], params)
+            self._answer(HTTPStatus.OK, content_type, body)
+        except RequestError as e:
+            self._answer(e.status, "text/plain", f"Error: {e}\n")
+        except Exception as e:
+            logging.error("Error in answering %s %s:", self.command, self.path, exc_info=True)
+            self._answer(HTTPStatus.INTERNAL_SERVER_ERROR, "text/plain", f"Error: {type(e).__name__}: {e}\n")
+
+    def _answer(self, status, content_type, body):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        logging.info("%s - %s", self.address_string(), format % args)
+
+    @staticmethod
+    def _wiki_page(parts):
+        if not parts or not parts[0]:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "No Pokémon given.")
+        try:
+            return create_wiki_page(parts[0].upper())
+        except ValueError as e:
+            raise RequestError(HTTPStatus.NOT_FOUND, str(e)) from e
+
+    @staticmethod
+    def _selection(names):
+        try:
+            return select_sections(names.split(","))
+        except ValueError as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, str(e)) from e
+
+    def get_page(self, parts, params):
+        """
+        Answers /page/INTERNALNAME with a wiki page, in any format and limited to any sections.
+        """
+        page_format = params.get("format", "wiki")
+        if page_format not in RENDERERS:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Unknown format '{page_format}'; choose from {', '.join(RENDERERS)}.")
+        selection = self._selection(params["sections"]) if "sections" in params else None
+
+        wiki_page = self._wiki_page(parts)
+        if page_format == "wiki":
+            lines = wiki_page.iter_lines(wiki_page.iter_sections(selection))
+        else:
+            lines = RENDERERS[page_format][0](wiki_page.create_model(selection))
+        return "application/json" if page_format == "json" else "text/plain", "".join(line + "\n" for line in lines)
+
+    def get_section(self, parts, _):
+        """
+        Answers /section/INTERNALNAME/SECTION with the content of the chosen sections, without any headings.
+        """
+        if len(parts) < 2:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"No section given; choose from {', '.join(SECTIONS)} or learnset.")
+        selection = self._selection(parts[1])
+        wiki_page = self._wiki_page(parts)
+        return "text/plain", "".join(line + "\n" for _, content in wiki_page.iter_sections(selection) for line in content)
+
+    @staticmethod
+    def get_list(_, params):
+        """
+        Answers /list with the internal names of the Pokémon in the whole dex, or in a range of dex numbers.
+        """
+        try:
+            internal_names = species_in_range(params["range"]) if "range" in params else all_species()
+        except ValueError as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, str(e)) from e
+        return "application/json", json.dumps(internal_names, ensure_ascii=False)
+
+    @staticmethod
+    def get_query(parts, _):
+        """
+        Answers /query/QUERY/KEY with the result of a game data query as JSON, or null if the key is not found.
+        """
+        if len(parts) < 2 or parts[0] not in QUERIES:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown query; choose from {', '.join(QUERIES)}.")
+        try:
+            result = QUERIES[parts[0]](parts[1])
+        except ValueError as e:
+            raise RequestError(HTTPStatus.NOT_FOUND, str(e)) from e
+        return "application/json", json.dumps(result, ensure_ascii=False)
+
+    def post_reload(self, _, params):
+        """
+        Answers /reload by reading every file again, if any has changed or if forced.
+        """
+        start = time.perf_counter()
+        files = snapshot()
+        changed = changed_files(self.server.files, files)
+        reloaded = bool(changed) or params.get("force") == "1"
+        if reloaded:
+            reload_game_data()
+            self.server.files = files
+        return "application/json", json.dumps({"Changed": changed, "Reloaded": reloaded, "Time": time.perf_counter() - start})
+
+
+class PageServer(HTTPServer):
+    """
+    Simple class serving wiki pages from the game data loaded in the process, remembering the state of the data files
+    as of the last load so a reload can tell if anything has changed.
+    """
+    def __init__(self, port=8000, host="127.0.0.1"):
+        """
+        The init function of PageServer, which loads every file before listening.
+
+        :param int port: The port to listen on.
+        :param str host: The address to listen on, which should stay local as nothing is protected.
+        """
+        self.files = snapshot()
+        preload_game_data()
+        super().__init__((host, port), PageRequestHandler)
+
+
+def serve(port=8000, host="127.0.0.1"):
+    """
+    Runs the page server until interrupted.
+
+    :param int port: The port to listen on.
+    :param str host: The address to listen on.
+    """
+    with PageServer(port, host) as server:
+        print(f"Serving wiki pages on http://{host}:{server.server_address[1]}/; press Ctrl+C to stop.")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nStopped serving.")
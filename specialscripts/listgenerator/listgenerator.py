@@ -1,6 +1,9 @@
 # pylint: disable=line-too-long, missing-module-docstring, import-error, too-many-arguments
+import argparse
 import json
-from data_collection import DataCollection
+import multiprocessing
+from data_collection import build_pokemon_index
+from obtainability import resolve_obtainability
 
 # Print iterations progress
 def print_progress_bar(iteration, total, prefix='', suffix='', decimals=1, length=100, fill='█', print_end="\r"):
@@ -36,97 +39,260 @@ def load_dictionary_data(filename):
         return json.load(f)
 
 
-if __name__ == "__main__":
-    print("This is a special script to create lists of certain types for all Pokémon in Xenoverse.")
+# The columns every species table has, whichever fields are read
+IDENTITY_COLUMNS = ("Key", "InternalName", "DisplayName")
 
-    # Local versions of reference dictionaries are used here
-    pokemon = load_dictionary_data("pokemon_info.json")
-    ability_info = load_dictionary_data("ability_info.json")
-    wild_item_info = load_dictionary_data("wild_item_info.json")
-    static_encounters = load_dictionary_data("static_encounters.json")
-
-    # Set up the list types
-    list_types = {
-        "EVYield": [],
-        "Ability": [],
-        "BaseStats": [],
-        "EncDropList": [],
-        "UnEncDropList": []
-    }
+# Every list type, in the order they are registered
+# Format: "ListType" -> (fields of pokemon.txt read, function building the list)
+LIST_BUILDERS = {}
 
-    print("Starting data extraction...")
-    l = len(pokemon)
-    print_progress_bar(0, l, prefix='Progress:', suffix='Complete', length=50)
-    for i, (key, value) in enumerate(pokemon.items()):
-        print_progress_bar(i+1, l, prefix='Progress:', suffix='Complete', length=50)
-        internal_name = value.split(",")[0]
-        display_name = value.split(",")[1]
-        dc = DataCollection(internal_name, "../../gamedata/pokemon.txt", encounters_path="../../gamedata/encounters.txt")
-        p_data = dc.extract_pokemon_data()
-        e_data, _ = dc.extract_encounter_data()
-
-        # List by EV Yield
-        EVYield = p_data["EffortPoints"].split(",")
-        EVYield[3], EVYield[5] = EVYield[5], EVYield[3]  # Order is currently HP/ATK/DEF/SPE/SPA/SPDEF
-        EVYield[3], EVYield[4] = EVYield[4], EVYield[3]  # Order is now HP/ATK/DEF/SPA/SPDEF/SPE
-        list_types["EVYield"].append("{{BaseStatsListEntry|" + key + "|" + display_name + "|" + "|".join(EVYield) + "}}")
-
-        # List by Ability
+
+def list_builder(name, *fields):
+    """
+    Registers a function building a list type, along with the fields of pokemon.txt it reads. The function is given
+    the rows of the species table, each holding the identity columns and the declared fields the Pokémon has, and a
+    dictionary of references, and gives back the entries of the list.
+
+    :param name: The name of the list type, which also names its file, e.g., "EVYield" for "evyield_list.txt".
+    :param fields: The fields of pokemon.txt the list is built from.
+    :return: The decorator registering the function.
+    """
+    def register(build):
+        LIST_BUILDERS[name] = (fields, build)
+        return build
+    return register
+
+
+def load_species_table(pokemon, pokemon_path, fields):
+    """
+    Reads the chosen fields of every chosen Pokémon from pokemon.txt in a single pass over its index, into one column
+    per field, so that adding a list only adds the columns it reads.
+
+    :param pokemon: The internal name and display name of each chosen Pokémon, as "INTERNALNAME,Display Name", by
+        dex number.
+    :param pokemon_path: The path to the file containing Pokémon data.
+    :param fields: The fields of pokemon.txt to read.
+    :return: The values of each column, in dex order, with None where a Pokémon does not have a field.
+    """
+    index = build_pokemon_index(pokemon_path)
+    fields = set(fields)
+    table = {column: [] for column in (*IDENTITY_COLUMNS, *fields)}
+    for key, value in pokemon.items():
+        internal_name, display_name = value.split(",")[:2]
+        if internal_name not in index:
+            raise ValueError(f"Could not find internal name '{internal_name}' in the file.")
+        # As in DataCollection.extract_pokemon_data, a field given twice takes its last value
+        p_data = dict(pair for line in index[internal_name][1:] if (pair := line.split("=", 1))[0] in fields)
+        for column, column_value in zip(IDENTITY_COLUMNS, (key, internal_name, display_name)):
+            table[column].append(column_value)
+        for field in fields:
+            table[field].append(p_data.get(field))
+    return table
+
+
+def table_rows(columns):
+    """
+    :param columns: The values of each column of a species table.
+    :return: A dictionary per Pokémon of the columns it has a value in.
+    """
+    names = list(columns)
+    return [{name: value for name, value in zip(names, values) if value is not None} for values in zip(*columns.values())]
+
+
+def find_encounterable(encounters_path, evolution_path, static_path, pokemon_path):
+    """
+    Finds every Pokémon that can be encountered in battle, either in the wild or as a static encounter, from the
+    dex-wide obtainability table; gifts, trades, and fossils are not encounters.
+
+    :param encounters_path: The path to the file containing encounter data.
+    :param evolution_path: The path to the evolution info reference dictionary.
+    :param static_path: The path to the static encounters reference dictionary.
+    :param pokemon_path: The path to the file containing Pokémon data.
+    :return: The internal names of every encounterable Pokémon.
+    """
+    table = resolve_obtainability(encounters_path, evolution_path, static_path, pokemon_path)
+    return {internal_name for internal_name, entry in table.items() if entry["Wild"] or entry["Static"]}
+
+
+@list_builder("EVYield", "EffortPoints")
+def build_ev_yield_list(rows, references):  # pylint: disable=unused-argument
+    """
+    :return: The entries of the list by EV yield.
+    """
+    entries = []
+    for p_data in rows:
+        ev_yield = p_data["EffortPoints"].split(",")
+        ev_yield[3], ev_yield[5] = ev_yield[5], ev_yield[3]  # Order is currently HP/ATK/DEF/SPE/SPA/SPDEF
+        ev_yield[3], ev_yield[4] = ev_yield[4], ev_yield[3]  # Order is now HP/ATK/DEF/SPA/SPDEF/SPE
+        entries.append("{{BaseStatsListEntry|" + p_data["Key"] + "|" + p_data["DisplayName"] + "|" + "|".join(ev_yield) + "}}")
+    return entries
+
+
+@list_builder("Ability", "Abilities", "HiddenAbility")
+def build_ability_list(rows, references):
+    """
+    :return: The entries of the list by ability.
+    """
+    entries = []
+    for p_data in rows:
         abilities = p_data["Abilities"].split(",")
         if len(abilities) == 1:
             abilities.append("")
         abilities.append(p_data.get("HiddenAbility", ""))
-        formatted_abilities = [ability_info[ability] for ability in abilities]
-        list_types["Ability"].append("{{AbilityListEntry|" + key + "|" + display_name + "|" + "|".join(formatted_abilities) + "}}")
+        formatted_abilities = [references["ability_info"][ability] for ability in abilities]
+        entries.append("{{AbilityListEntry|" + p_data["Key"] + "|" + p_data["DisplayName"] + "|" + "|".join(formatted_abilities) + "}}")
+    return entries
+
 
-        # List by Base Stats
+@list_builder("BaseStats", "BaseStats")
+def build_base_stats_list(rows, references):  # pylint: disable=unused-argument
+    """
+    :return: The entries of the list by base stats.
+    """
+    entries = []
+    for p_data in rows:
         base_stats = p_data["BaseStats"].split(",")
         base_stats[3], base_stats[5] = base_stats[5], base_stats[3]  # Make sure the order is HP, Atk, Def, SpA, SpD, Spe
-        list_types["BaseStats"].append("{{BaseStatsListEntry|" + key + "|" + display_name + "|" + "|".join(base_stats) + "}}")
-
-        # Pokémon Drop List
-        item_slots = ["Common", "Uncommon", "Rare"]
-        item_found = False
-        items = []
-        for slot in item_slots:
-            if f"WildItem{slot}" in p_data:
-                wild_item = wild_item_info[p_data[f"WildItem{slot}"]]
-                items.append("{{Item|{{{1|" + wild_item + "}}}}}")
-                item_found = True
-            else:
-                items.append("")
-        if not item_found:
-            continue
+        entries.append("{{BaseStatsListEntry|" + p_data["Key"] + "|" + p_data["DisplayName"] + "|" + "|".join(base_stats) + "}}")
+    return entries
 
-        # Check if all items are the same; then it's guaranteed, which is represented as the 4th position
-        if len(set(items)) == 1 and len(items) == 3:
-            items = ["", "", "", items[0]]
-
-        # Some names need to be edited such that they don't break the template
-        display_name = "Bremand_V" if display_name == "Bremand" else display_name
-        display_name = "Zorua_H" if display_name == "Zorua" else display_name
-        split_name = display_name.split(" ")
-        if split_name[-1] == "X":
-            display_name = split_name[0] + "X"
-            if split_name[0] == "Pikachu":
-                display_name += "M"
-
-        # Account for some vintage pokémon
-        if split_name[0] == "Vintage":
-            v_e_data = DataCollection(split_name[1], encounters_path="../../gamedata/encounters.txt").extract_encounter_data()
-            if not e_data:
-                e_data = v_e_data
-
-        # Encounterable test
-        unencounterable_statics = ("Gift", "Trade", "Fossil")
-        if (internal_name in static_encounters and static_encounters[internal_name] not in unencounterable_statics) or e_data:
-            list_types["EncDropList"].append("{{HeldItemsEntry|" + display_name + "|" + "|".join(items) + "}}")
+
+def drop_list_entry(p_data, wild_item_info):
+    """
+    :return: The Pokémon's entry in a drop list, or None if it holds no items in the wild.
+    """
+    item_slots = ["Common", "Uncommon", "Rare"]
+    item_found = False
+    items = []
+    for slot in item_slots:
+        if f"WildItem{slot}" in p_data:
+            wild_item = wild_item_info[p_data[f"WildItem{slot}"]]
+            items.append("{{Item|{{{1|" + wild_item + "}}}}}")
+            item_found = True
         else:
-            list_types["UnEncDropList"].append("{{HeldItemsEntry|" + display_name + "|" + "|".join(items) + "}}")
+            items.append("")
+    if not item_found:
+        return None
 
-    print("Saving data...")
+    # Check if all items are the same; then it's guaranteed, which is represented as the 4th position
+    if len(set(items)) == 1 and len(items) == 3:
+        items = ["", "", "", items[0]]
+
+    # Some names need to be edited such that they don't break the template
+    display_name = p_data["DisplayName"]
+    display_name = "Bremand_V" if display_name == "Bremand" else display_name
+    display_name = "Zorua_H" if display_name == "Zorua" else display_name
+    split_name = display_name.split(" ")
+    if split_name[-1] == "X":
+        display_name = split_name[0] + "X"
+        if split_name[0] == "Pikachu":
+            display_name += "M"
+
+    return "{{HeldItemsEntry|" + display_name + "|" + "|".join(items) + "}}"
+
+
+def build_drop_list(rows, references, encounterable):
+    """
+    :param encounterable: Whether the list is of encounterable Pokémon, or of Pokémon that cannot be encountered.
+    :return: The entries of the drop list.
+    """
+    entries = []
+    for p_data in rows:
+        if (p_data["InternalName"] in references["encounterable"]) != encounterable:
+            continue
+        entry = drop_list_entry(p_data, references["wild_item_info"])
+        if entry is not None:
+            entries.append(entry)
+    return entries
+
+
+@list_builder("EncDropList", "WildItemCommon", "WildItemUncommon", "WildItemRare")
+def build_enc_drop_list(rows, references):
+    """
+    :return: The entries of the drop list of encounterable Pokémon.
+    """
+    return build_drop_list(rows, references, True)
+
+
+@list_builder("UnEncDropList", "WildItemCommon", "WildItemUncommon", "WildItemRare")
+def build_unenc_drop_list(rows, references):
+    """
+    :return: The entries of the drop list of Pokémon that cannot be encountered.
+    """
+    return build_drop_list(rows, references, False)
+
+
+def _run_list_builder(job):
+    name, columns, references = job
+    return LIST_BUILDERS[name][1](table_rows(columns), references)
+
+
+def run_list_builders(table, references, names=None, processes=1):
+    """
+    Builds the entries of every chosen list type from the species table, each reading only its own columns. The lists
+    may be built in parallel over a pool of forked worker processes.
+
+    :param table: The species table, as in load_species_table, holding every column the chosen lists read.
+    :param references: The references every list may use, by name.
+    :param names: The list types to build, or None for every registered list type.
+    :param processes: The number of worker processes to use, where 1 builds every list in this process.
+    :return: The entries of each list type, in the order chosen.
+    """
+    names = list(names or LIST_BUILDERS)
+    jobs = [(name, {column: table[column] for column in (*IDENTITY_COLUMNS, *LIST_BUILDERS[name][0])}, references)
+            for name in names]
+
+    l = len(jobs)
+    lists = []
+    print_progress_bar(0, l, prefix='Progress:', suffix='Complete', length=50)
+    if processes > 1 and "fork" in multiprocessing.get_all_start_methods():
+        with multiprocessing.get_context("fork").Pool(min(processes, l)) as pool:
+            for i, entries in enumerate(pool.imap(_run_list_builder, jobs)):
+                lists.append(entries)
+                print_progress_bar(i+1, l, prefix='Progress:', suffix='Complete', length=50)
+    else:
+        for i, job in enumerate(jobs):
+            lists.append(_run_list_builder(job))
+            print_progress_bar(i+1, l, prefix='Progress:', suffix='Complete', length=50)
+    return dict(zip(names, lists))
+
+
+def write_lists(list_types):
+    """
+    Writes each list to its own file, e.g., "evyield_list.txt", joining its entries so that each file is written at
+    once.
+
+    :param list_types: The entries of each list type.
+    """
     for key, value in list_types.items():
         with open(key.lower() + "_list.txt", "w", encoding="utf-8") as file:
             file.write("\n".join(value))
 
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Creates lists of certain types for all Pokémon. Run from this directory.")
+    parser.add_argument("--lists", nargs="+", choices=LIST_BUILDERS, metavar="LIST", help=f"the list types to create (default: all of {', '.join(LIST_BUILDERS)})")
+    parser.add_argument("--processes", metavar="N", type=int, default=1, help="the number of processes to build lists over (default: 1)")
+    args = parser.parse_args()
+
+    print("This is a special script to create lists of certain types for all Pokémon in Xenoverse.")
+
+    # Local versions of reference dictionaries are used here
+    pokemon = load_dictionary_data("pokemon_info.json")
+    references = {
+        "ability_info": load_dictionary_data("ability_info.json"),
+        "wild_item_info": load_dictionary_data("wild_item_info.json"),
+        "encounterable": find_encounterable("../../gamedata/encounters.txt", "../../references/evolution_info.json", "static_encounters.json", "../../gamedata/pokemon.txt")
+    }
+
+    print("Reading every Pokémon...")
+    chosen_lists = args.lists or list(LIST_BUILDERS)
+    species_table = load_species_table(pokemon, "../../gamedata/pokemon.txt", {field for name in chosen_lists for field in LIST_BUILDERS[name][0]})
+
+    print("Starting data extraction...")
+    list_types = run_list_builders(species_table, references, chosen_lists, args.processes)
+
+    print("Saving data...")
+    write_lists(list_types)
+
     print("Finished! The lists have been exported to appropriate files.")
@@ -0,0 +1,184 @@
+# pylint: disable=line-too-long, missing-module-docstring, import-error, too-many-arguments
+import argparse
+import bisect
+import itertools
+import numpy as np
+from speedfinder import SPEED_BOOSTS, SPEED_CONFIGURATIONS, build_speed_tiers, load_base_stats, load_dictionary_data
+from stat_calculator import calculate_stat
+
+# The name of each configuration in SPEED_CONFIGURATIONS, from slowest to fastest
+CONFIGURATION_NAMES = ("min", "dump", "neutral", "invested", "max")
+
+# Every stage of boosts a stat can be at
+BOOSTS = range(-6, 7)
+
+
+class SpeedTierIndex:
+    """
+    Simple class answering speed tier questions, e.g., "does X outspeed Y at +1?", from the speed tiers held in memory.
+
+    Entries are kept from fastest to slowest alongside their negated speeds, which are in ascending order, so that every
+    query is a binary search rather than a scan of the tiers.
+    """
+    def __init__(self, names, base_speeds):
+        """
+        The init function of SpeedTierIndex.
+
+        :param names: The name of each Pokémon.
+        :param base_speeds: The base speed of each Pokémon.
+        """
+        self.base_speeds = dict(zip(names, map(int, base_speeds)))
+        self.entries = build_speed_tiers(names, base_speeds).tolist()
+        self._keys = [-entry[0] for entry in self.entries]
+
+        # The speed of every Pokémon in every configuration at every boost in SPEED_BOOSTS, so looking one up is a
+        # dictionary read rather than a calculation
+        bases = np.array(list(self.base_speeds.values()), dtype=np.int64)[:, None, None]
+        speeds = calculate_stat(bases, 50, SPEED_CONFIGURATIONS["IVs"], SPEED_CONFIGURATIONS["EVs"],
+                                SPEED_CONFIGURATIONS["Nature"], SPEED_BOOSTS[None, :, None]).tolist()
+        self._speeds = {(name, configuration, int(boost)): speeds[row][column][idx]
+                        for row, name in enumerate(self.base_speeds) for column, boost in enumerate(SPEED_BOOSTS)
+                        for idx, configuration in enumerate(CONFIGURATION_NAMES)}
+
+    def speed(self, name, configuration="max", boosts=0):
+        """
+        Calculates the speed of a Pokémon in a given configuration.
+
+        :param name: The name of the Pokémon.
+        :param configuration: The configuration, as in CONFIGURATION_NAMES.
+        :param boosts: The boosts to the Pokémon's speed, from -6 to +6.
+        :return: The speed stat at level 50.
+        :raises KeyError: If the Pokémon, configuration or boosts are unknown.
+        """
+        if (name, configuration, boosts) in self._speeds:
+            return self._speeds[(name, configuration, boosts)]
+        if name not in self.base_speeds:
+            raise KeyError(f"Unknown Pokémon '{name}'.")
+        if configuration not in CONFIGURATION_NAMES:
+            raise KeyError(f"Unknown configuration '{configuration}'; choose from {', '.join(CONFIGURATION_NAMES)}.")
+        if boosts not in BOOSTS:
+            raise KeyError(f"Unknown boosts {boosts}; choose from {BOOSTS[0]} to +{BOOSTS[-1]}.")
+        ivs, evs, nature = SPEED_CONFIGURATIONS[CONFIGURATION_NAMES.index(configuration)].tolist()
+        return int(calculate_stat(self.base_speeds[name], 50, ivs, evs, nature, boosts))
+
+    def in_range(self, low, high):
+        """
+        :return: Every entry with a speed from low to high inclusive, from fastest to slowest.
+        """
+        return self.entries[bisect.bisect_left(self._keys, -high):bisect.bisect_right(self._keys, -low)]
+
+    def faster_than(self, speed):
+        """
+        :return: Every entry that outspeeds the given speed, from fastest to slowest.
+        """
+        return self.entries[:bisect.bisect_left(self._keys, -speed)]
+
+    def slower_than(self, speed):
+        """
+        :return: Every entry that the given speed outspeeds, from fastest to slowest.
+        """
+        return self.entries[bisect.bisect_right(self._keys, -speed):]
+
+    def ties(self, speed):
+        """
+        :return: Every entry with exactly the given speed.
+        """
+        return self.in_range(speed, speed)
+
+    def rank(self, speed):
+        """
+        Counts the entries faster than, tied with and slower than a speed, without gathering the entries themselves.
+
+        :return: The number of entries that are faster, tied and slower.
+        """
+        first, last = bisect.bisect_left(self._keys, -speed), bisect.bisect_right(self._keys, -speed)
+        return first, last - first, len(self._keys) - last
+
+    def tie_groups(self, min_size=2):
+        """
+        Finds every speed shared by several different Pokémon.
+
+        :param min_size: The fewest different Pokémon a speed must be shared by.
+        :return: The names of the Pokémon at each shared speed, by speed, from fastest to slowest.
+        """
+        groups = {}
+        for speed, entries in itertools.groupby(self.entries, key=lambda entry: entry[0]):
+            names = list(dict.fromkeys(entry[1] for entry in entries))
+            if len(names) >= min_size:
+                groups[speed] = names
+        return groups
+
+    def outspeeds(self, name, configuration="max", boosts=0, other=None, other_configuration="max", other_boosts=0):
+        """
+        Decides if a Pokémon outspeeds another, or finds everything it outspeeds and everything that outspeeds it.
+
+        :param name: The name of the Pokémon.
+        :param configuration: The Pokémon's configuration, as in CONFIGURATION_NAMES.
+        :param boosts: The boosts to the Pokémon's speed.
+        :param other: The name of the other Pokémon, or None to compare against every entry.
+        :param other_configuration: The other Pokémon's configuration.
+        :param other_boosts: The boosts to the other Pokémon's speed.
+        :return: Given another Pokémon, 1 if the Pokémon is faster, -1 if slower and 0 on a speed tie. Otherwise, the
+            entries it outspeeds, ties and is outsped by.
+        """
+        speed = self.speed(name, configuration, boosts)
+        if other is not None:
+            other_speed = self.speed(other, other_configuration, other_boosts)
+            return (speed > other_speed) - (speed < other_speed)
+        return {"Outspeeds": self.slower_than(speed), "Ties": self.ties(speed), "OutspedBy": self.faster_than(speed)}
+
+
+def build_speed_index(pokemon_info_path="pokemon_info.json", alt_forms_path="alternate_forms.json", pokemon_path="../../gamedata/pokemon.txt"):
+    """
+    Builds the speed tier index of every Pokémon and alternate form used by speedfinder.
+
+    :param pokemon_info_path: The path to speedfinder's version of pokemon_info.json.
+    :param alt_forms_path: The path to the base speeds of alternate forms.
+    :param pokemon_path: The path to the file containing Pokémon data.
+    :return: The speed tier index.
+    """
+    names, base_stats = load_base_stats(load_dictionary_data(pokemon_info_path), pokemon_path)
+    alt_forms = load_dictionary_data(alt_forms_path)
+    return SpeedTierIndex(names + list(alt_forms), np.concatenate([base_stats[:, 3], list(alt_forms.values())]))
+
+
+def _print_entries(entries):
+    for entry in entries:
+        print(f"  {entry[0]:>4}  {entry[1]} ({entry[3]} IVs, {entry[4]} EVs, {entry[5]}, {entry[6]})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Answers speed tier questions at level 50. Run from this directory.")
+    parser.add_argument("name", nargs="?", help="the Pokémon to compare, by its name on the sheets, e.g., 'Shyleon (Base)'")
+    parser.add_argument("--config", choices=CONFIGURATION_NAMES, default="max", help="the Pokémon's configuration (default: max)")
+    parser.add_argument("--boost", type=int, choices=BOOSTS, default=0, metavar="N", help="the boosts to the Pokémon's speed, from -6 to 6 (default: 0)")
+    parser.add_argument("--against", metavar="NAME", help="decide only whether the Pokémon outspeeds this one")
+    parser.add_argument("--against-config", choices=CONFIGURATION_NAMES, default="max", help="the other Pokémon's configuration (default: max)")
+    parser.add_argument("--against-boost", type=int, choices=BOOSTS, default=0, metavar="N", help="the boosts to the other Pokémon's speed, from -6 to 6 (default: 0)")
+    parser.add_argument("--range", nargs=2, type=int, metavar=("LOW", "HIGH"), help="list every entry with a speed from LOW to HIGH")
+    parser.add_argument("--ties", action="store_true", help="list every speed shared by several Pokémon")
+    args = parser.parse_args()
+
+    index = build_speed_index()
+    if args.range:
+        _print_entries(index.in_range(*args.range))
+    elif args.ties:
+        for tied_speed, tied_names in index.tie_groups().items():
+            print(f"  {tied_speed:>4}  {', '.join(tied_names)}")
+    elif args.name is None:
+        parser.error("give a Pokémon, --range or --ties")
+    else:
+        try:
+            result = index.outspeeds(args.name, args.config, args.boost, args.against, args.against_config, args.against_boost)
+        except KeyError as e:
+            parser.error(e.args[0])
+        own_speed = index.speed(args.name, args.config, args.boost)
+        if args.against:
+            other_speed = index.speed(args.against, args.against_config, args.against_boost)
+            verdict = {1: "outspeeds", 0: "speed ties with", -1: "is outsped by"}[result]
+            print(f"{args.name} ({own_speed}) {verdict} {args.against} ({other_speed}).")
+        else:
+            print(f"{args.name} ({own_speed}) is outsped by {len(result['OutspedBy'])} entries, ties {len(result['Ties'])} "
+                  f"and outspeeds {len(result['Outspeeds'])}.")
+            print("Ties:")
+            _print_entries(result["Ties"])
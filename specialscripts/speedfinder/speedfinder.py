@@ -1,7 +1,31 @@
 # pylint: disable=line-too-long, missing-module-docstring, import-error, too-many-arguments
+import argparse
+import csv
+import itertools
 import json
+import numpy as np
 from openpyxl import Workbook
-from data_collection import DataCollection
+from data_collection import build_pokemon_index
+from stat_calculator import STATS, calculate_stat
+
+# Every speed configuration, each repeated for every speed boost from -2 to +2:
+# - absolute minimum speed (-spe nature and 0 IVs for trick room)
+# - minimum dump speed (-spe nature but maxed IVs)
+# - neutral dump speed (neutral speed nature and maxed IVs)
+# - neutral speed invested (neutral speed nature maxed IVs and maxed EVs)
+# - maximum speed (maxed evs ivs and positive speed nature)
+SPEED_CONFIGURATIONS = np.array([(0, 0, 0.9), (31, 0, 0.9), (31, 0, 1), (31, 252, 1), (31, 252, 1.1)],
+                                dtype=[("IVs", "i8"), ("EVs", "i8"), ("Nature", "f8")])
+SPEED_BOOSTS = np.arange(-2, 3)
+
+# The configurations of every other stat, which are only given without boosts, and the levels they are given at. HP is
+# never affected by natures.
+STAT_CONFIGURATIONS = SPEED_CONFIGURATIONS
+HP_CONFIGURATIONS = np.array([(0, 0, 1), (31, 0, 1), (31, 252, 1)], dtype=SPEED_CONFIGURATIONS.dtype)
+STAT_LEVELS = (50, 100)
+
+# The display of each nature multiplier on the sheets
+NATURE_EFFECTS = {0.9: "Negative", 1: "Neutral", 1.1: "Positive"}
 
 
 def load_dictionary_data(filename):
@@ -15,149 +39,201 @@ def load_dictionary_data(filename):
         return json.load(f)
 
 
-def calculate_speed_stat_at_50(base, ivs, evs, nature, boosts):
+def load_singles_tierlist(filename):
     """
-    Calculate a Pokémon's speed stat at level 50 given certain conditions.
+    Load the names of every Pokémon in the singles tier list, skipping tier headings and blank lines.
 
-    :param base: The base speed of the Pokémon.
-    :param ivs: The Speed IVs of the Pokémon.
-    :param evs: The Speed EVs of the Pokémon.
-    :param nature: The nature of the Pokémon.
-    :param boosts: The boosts to the Pokémon's speed.
-    :return: The calculated speed stat.
+    :param filename: The name of the tier list file.
+    :return: The names of the Pokémon in the tier list.
     """
-    # Correctly accounts for boosts
-    boost_modifier = 1 + abs(boosts) / 2
-    if boosts < 0:
-        boost_modifier = boost_modifier ** -1
+    with open(filename, encoding="utf-8") as f:
+        return [line.strip() for line in f if not line.startswith("=") and line != "\n"]
 
-    return int(((2 * base + ivs + evs / 4) * 50 / 100 + 5) * nature * boost_modifier)
 
+def load_base_stats(pokemon, pokemon_path):
+    """
+    Reads the base stats of every chosen Pokémon from pokemon.txt in a single pass over its index.
 
-def add_speed_entry(name, base, ivs, evs, nature, boosts):
+    :param pokemon: The internal name and display name of each chosen Pokémon, as "INTERNALNAME,Display Name", by
+        dex number.
+    :param pokemon_path: The path to the file containing Pokémon data.
+    :return: The display names, and a (species, 6) array of base stats in pokemon.txt order (HP, Attack, Defense,
+        Speed, Special Attack, Special Defense).
+    """
+    index = build_pokemon_index(pokemon_path)
+    names, base_stats = [], []
+    for value in pokemon.values():
+        internal_name, name = value.split(",")[:2]
+        if internal_name not in index:
+            raise ValueError(f"Could not find internal name '{internal_name}' in the file.")
+        # As in DataCollection.extract_pokemon_data, a field given twice takes its last value
+        stats = next(line for line in reversed(index[internal_name]) if line.startswith("BaseStats="))
+        names.append(name)
+        base_stats.append(stats.split("=", 1)[1].split(","))
+    return names, np.array(base_stats, dtype=np.int64).reshape(-1, 6)
+
+
+def build_stat_tiers(names, bases, stat="Speed", level=50, configurations=SPEED_CONFIGURATIONS, boosts=SPEED_BOOSTS):
+    """
+    Constructs every tier entry of a stat for every Pokémon at once, and sorts them from highest to lowest.
+
+    Each Pokémon gets every configuration at every boost. Entries are sorted by the stat, then the base stat, both
+    descending, then by name.
+
+    :param names: The name of each Pokémon.
+    :param bases: The base stat of each Pokémon.
+    :param stat: The stat, as in stat_calculator.STATS.
+    :param level: The level of every Pokémon.
+    :param configurations: The IVs, EVs and nature multiplier of each configuration.
+    :param boosts: The boosts to give each configuration at.
+    :return: A structured array with one sorted entry per row, with the fields named by the stat, then Name, Base, IVs,
+        EVs, Nature and Boosts, as displayed on the sheet.
+    """
+    names = np.asarray(names, dtype=str)
+    bases = np.asarray(bases, dtype=np.int64)[:, None, None]
+    configs = configurations[None, None, :]
+    boosts = np.asarray(boosts)
+    labels = np.array([f"+{boost}" if boost > 0 else str(boost) for boost in boosts])
+    boosts = boosts[None, :, None]
+    shape = (len(names), boosts.size, len(configurations))
+
+    natures = np.array([NATURE_EFFECTS[nature] for nature in configurations["Nature"]])
+    tiers = np.empty(int(np.prod(shape)), dtype=[(stat, "i8"), ("Name", names.dtype), ("Base", "i8"), ("IVs", "i8"),
+                                                 ("EVs", "i8"), ("Nature", natures.dtype), ("Boosts", labels.dtype)])
+    tiers[stat] = calculate_stat(bases, level, configs["IVs"], configs["EVs"], configs["Nature"], boosts, hp=stat == "HP").ravel()
+    tiers["Name"] = np.broadcast_to(names[:, None, None], shape).ravel()
+    tiers["Base"] = np.broadcast_to(bases, shape).ravel()
+    tiers["IVs"] = np.broadcast_to(configs["IVs"], shape).ravel()
+    tiers["EVs"] = np.broadcast_to(configs["EVs"], shape).ravel()
+    tiers["Nature"] = np.broadcast_to(natures[None, None, :], shape).ravel()
+    tiers["Boosts"] = np.broadcast_to(labels[None, :, None], shape).ravel()
+
+    # lexsort is stable and sorts by its last key first
+    return tiers[np.lexsort((tiers["Name"], -tiers["Base"], -tiers[stat]))]
+
+
+def build_speed_tiers(names, base_speeds):
     """
-    Adds a speed entry with the correct format to the all_data list. This is what is fully displayed on the sheet.
+    Constructs every speed tier entry of every Pokémon at level 50, with every configuration in SPEED_CONFIGURATIONS at
+    every boost in SPEED_BOOSTS.
 
-    :param name: The name of the Pokémon.
-    :param base: The base speed of the Pokémon.
-    :param ivs: The Speed IVs of the Pokémon.
-    :param evs: The Speed EVs of the Pokémon.
-    :param nature: The nature of the Pokémon.
-    :param boosts: The boosts to the Pokémon's speed.
+    :param names: The name of each Pokémon.
+    :param base_speeds: The base speed of each Pokémon.
+    :return: A structured array with one sorted entry per row, as in build_stat_tiers.
     """
-    speed = calculate_speed_stat_at_50(base, ivs, evs, nature, boosts)
+    return build_stat_tiers(names, base_speeds)
 
-    # Converts Nature from a float multiplier to a string for a display
-    for multiplier, effect in {0.9: "Negative", 1: "Neutral", 1.1: "Positive"}.items():
-        if nature == multiplier:
-            nature = effect
 
-    if boosts > 0:
-        boosts = "+" + str(boosts)
+def build_other_stat_tiers(names, base_stats):
+    """
+    Constructs the tiers of every stat other than Speed at every level in STAT_LEVELS, without boosts.
 
-    master_data.append([speed, name, base, ivs, evs, nature, str(boosts)])
+    :param names: The name of each Pokémon.
+    :param base_stats: A (species, 6) array of base stats, in the order of stat_calculator.STATS.
+    :return: The tiers of each stat and level, by sheet title, e.g., "Attack 100".
+    """
+    tiers = {}
+    for column, stat in enumerate(STATS):
+        if stat == "Speed":
+            continue
+        configurations = HP_CONFIGURATIONS if stat == "HP" else STAT_CONFIGURATIONS
+        for level in STAT_LEVELS:
+            tiers[f"{stat} {level}"] = build_stat_tiers(names, base_stats[:, column], stat, level, configurations, [0])
+    return tiers
 
-    if name in singles_pokemon:
-        singles_data.append([speed, name, base, ivs, evs, nature, str(boosts)])
 
+def group_speed_tiers(entries):
+    """
+    Groups together the names of consecutive Pokémon with the same speed stat and base speed, in a single pass over
+    sorted speed tier entries. Every other field of a group is that of its first entry.
 
-def construct_speed_tier_entry(name, base_speed):
+    :param entries: The speed tier entries, sorted as by build_speed_tiers.
+    :return: The grouped entries, in the same order.
     """
-    Fully constructs all the speed tier entries for a Pokémon, given its base speed, and adds them to the all_data list.
+    grouped = []
+    for _, group in itertools.groupby(entries, key=lambda entry: (entry[0], entry[2])):
+        first, *rest = group
+        grouped.append([first[0], ", ".join([first[1], *(entry[1] for entry in rest)]), *first[2:]])
+    return grouped
 
-    Configurations include the following:
-    - absolute minimum speed (-spe nature and 0 IVs for trick room)
-    - minimum dump speed (-spe nature but maxed IVs)
-    - neutral dump speed (neutral speed nature and maxed IVs)
-    - neutral speed invested (neutral speed nature maxed IVs and maxed EVs)
-    - maximum speed (maxed evs ivs and positive speed nature)
 
-    Every configuration is then repeated for every possible speed boost from -2 to +2.
+def write_workbook(filename, sheets):
+    """
+    Writes every sheet to an Excel file in write-only mode, which streams each row to the file as it is appended rather
+    than keeping every cell in memory until saving.
 
-    :param base_speed: The base speed of the Pokémon.
-    :param name: The name of the Pokémon.
+    :param filename: The name of the Excel file.
+    :param sheets: The header row and rows of each sheet, by sheet title, in sheet order.
     """
+    workbook = Workbook(write_only=True)
+    for title, (header, rows) in sheets.items():
+        sheet = workbook.create_sheet(title)
+        sheet.append(header)
+        for row in rows:
+            sheet.append(row)
+    workbook.save(filename)
 
-    # Speed tiers, and accounting for boosts
-    for boost in range(-2, 3):
-        add_speed_entry(name, int(base_speed), 0, 0, 0.9, boost)
-        add_speed_entry(name, int(base_speed), 31, 0, 0.9, boost)
-        add_speed_entry(name, int(base_speed), 31, 0, 1, boost)
-        add_speed_entry(name, int(base_speed), 31, 252, 1, boost)
-        add_speed_entry(name, int(base_speed), 31, 252, 1.1, boost)
+
+def write_csv_files(prefix, sheets):
+    """
+    Writes every sheet to its own CSV file, named by the sheet title, e.g., "speedtiers_base_stats.csv".
+
+    :param prefix: The start of each file name.
+    :param sheets: The header row and rows of each sheet, by sheet title.
+    :return: The names of the files written.
+    """
+    filenames = []
+    for title, (header, rows) in sheets.items():
+        filename = f"{prefix}_{title.lower().replace(' ', '_')}.csv"
+        with open(filename, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+        filenames.append(filename)
+    return filenames
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Establishes the speed tiers of the game's metagame.")
+    parser.add_argument("--csv", action="store_true", help="also write each sheet to its own CSV file")
+    parser.add_argument("--all-stats", action="store_true", help=f"also write the tiers of every other stat at levels {' and '.join(map(str, STAT_LEVELS))}")
+    args = parser.parse_args()
+
     print("This is a special script to establish the different speed tiers present in the game's metagame.")
     print("This will fill up one excel file: speedtiers.xlsx.\n")
 
-    master_data = []
-    singles_data = []
-    base_data = []
-
     print("Accessing the singles tier list...")
-    singles_pokemon = []
-    with open("singles_tierlist.txt", encoding="utf-8") as f:
-        for line in f:
-            if line.startswith("=") or line == "\n":
-                continue
-
-            line = line.strip()
-            singles_pokemon.append(line)
+    singles_pokemon = load_singles_tierlist("singles_tierlist.txt")
 
-    print("Constructing the speed tiers for normal Pokémon...")
+    print("Constructing the speed tiers for normal Pokémon and alternate forms...")
     # A modified version of pokemon_info.json is used here, as we do not care about every Pokémon.
     pokemon = load_dictionary_data("pokemon_info.json")
-
-    for key, value in pokemon.items():
-        dc = DataCollection(value.split(",")[0], "../../gamedata/pokemon.txt")
-        data = dc.extract_pokemon_data()
-
-        base_stats = data["BaseStats"].split(",")
-        base_data.append([key, value.split(",")[1], base_stats[0], base_stats[1], base_stats[2], base_stats[4], base_stats[5], base_stats[3]])
-
-        base_spd = data["BaseStats"].split(",")[3]
-        construct_speed_tier_entry(value.split(",")[1], base_spd)
-
-    print("Constructing the speed tiers for alternate forms...")
+    pokemon_names, base_stats = load_base_stats(pokemon, "../../gamedata/pokemon.txt")
     alt_forms = load_dictionary_data("alternate_forms.json")
 
-    for key, value in alt_forms.items():
-        construct_speed_tier_entry(key, value)
-
-    print("Sorting the data...")
-    master_data.sort(key=lambda x: (-x[0], -x[2], x[1]), reverse=False)
-    singles_data.sort(key=lambda x: (-x[0], -x[2], x[1]), reverse=False)
+    speed_tiers = build_speed_tiers(pokemon_names + list(alt_forms), np.concatenate([base_stats[:, 3], list(alt_forms.values())]))
+    master_data = speed_tiers.tolist()
+    singles_data = speed_tiers[np.isin(speed_tiers["Name"], singles_pokemon)].tolist()
+    # Base stats are displayed in the order HP, Attack, Defense, Special Attack, Special Defense, Speed
+    base_data = [[key, name, *map(str, stats[[0, 1, 2, 4, 5, 3]])] for key, name, stats in zip(pokemon, pokemon_names, base_stats)]
 
     print("Grouping the data by base speed...")
-    n = 1
-    while n < len(singles_data):
-        # If the Pokémon have the same speed stat and base speed, group them together
-        if singles_data[n][0] == singles_data[n - 1][0] and singles_data[n][2] == singles_data[n - 1][2]:
-            singles_data[n - 1][1] += ", " + singles_data[n][1]
-            singles_data.remove(singles_data[n])
-        else:
-            n += 1
+    # If the Pokémon have the same speed stat and base speed, group them together
+    singles_data = group_speed_tiers(singles_data)
+
+    tier_header = ["Speed", "Name", "Base", "IVs", "EVs", "Nature", "Boosts"]
+    sheets = {
+        "Singles": (tier_header, singles_data),
+        "Master": (tier_header, master_data),
+        "Base Stats": (["Dex", "Name", "HP", "Attack", "Defense", "Special Attack", "Special Defense", "Speed"], base_data)
+    }
+    if args.all_stats:
+        print("Constructing the tiers of every other stat for normal Pokémon...")
+        for title, tiers in build_other_stat_tiers(pokemon_names, base_stats).items():
+            sheets[title] = (list(tiers.dtype.names), tiers.tolist())
 
     print("Writing the data to an Excel file...")
-    workbook = Workbook()
-    singles_sheet = workbook.create_sheet("Singles")
-    master_sheet = workbook.create_sheet("Master")
-    base_sheet = workbook.create_sheet("Base Stats")
-    workbook.remove(workbook["Sheet"])
-
-    singles_sheet.append(["Speed", "Name", "Base", "IVs", "EVs", "Nature", "Boosts"])
-    master_sheet.append(["Speed", "Name", "Base", "IVs", "EVs", "Nature", "Boosts"])
-    base_sheet.append(["Dex", "Name", "HP", "Attack", "Defense", "Special Attack", "Special Defense", "Speed"])
-
-    for entry in singles_data:
-        singles_sheet.append(entry)
-
-    for entry in master_data:
-        master_sheet.append(entry)
-
-    for entry in base_data:
-        base_sheet.append(entry)
-
-    workbook.save("speedtiers.xlsx")
+    write_workbook("speedtiers.xlsx", sheets)
+    if args.csv:
+        print(f"Writing the data to {', '.join(write_csv_files('speedtiers', sheets))}...")
     print("Finished! The speed tiers have been written to speedtiers.xlsx.")
@@ -0,0 +1,49 @@
+# pylint: disable=line-too-long, missing-module-docstring, too-many-arguments
+import numpy as np
+
+# The six stats, in the order of BaseStats in pokemon.txt
+STATS = ("HP", "Attack", "Defense", "Speed", "Special Attack", "Special Defense")
+
+
+def calculate_stat(base, level, ivs, evs, nature=1, boosts=0, hp=False):
+    """
+    Calculate a stat given certain conditions, as the game does: in integers, rounding down after the level is applied,
+    again after the nature multiplier, and again after the boosts.
+
+    HP uses its own formula, and is never affected by natures or boosts. Every argument may be a number or an array,
+    and arrays are broadcast against each other, so every combination of Pokémon and configuration can be calculated
+    at once.
+
+    :param base: The base stat of the Pokémon.
+    :param level: The level of the Pokémon.
+    :param ivs: The IVs of the Pokémon in the stat.
+    :param evs: The EVs of the Pokémon in the stat.
+    :param nature: The nature multiplier of the stat (0.9, 1 or 1.1).
+    :param boosts: The boosts to the stat.
+    :param hp: Whether the stat is HP, as a boolean or an array of booleans.
+    :return: The calculated stat, as an integer array.
+    """
+    scaled = (2 * np.asarray(base, dtype=np.int64) + ivs + np.asarray(evs, dtype=np.int64) // 4) * level // 100
+    # Natures and boosts are applied as integer fractions, so that no floating point error can change the rounding
+    stat = (scaled + 5) * np.rint(np.asarray(nature) * 10).astype(np.int64) // 10
+    boosts = np.asarray(boosts, dtype=np.int64)
+    stat = stat * (2 + np.maximum(boosts, 0)) // (2 + np.maximum(-boosts, 0))
+    return np.where(hp, scaled + level + 10, stat).astype(np.int64)
+
+
+def calculate_stats(base_stats, level, ivs, evs, natures=1, boosts=0):
+    """
+    Calculate all six stats of any number of Pokémon at once.
+
+    The last axis of every array argument is the stat, in the order of STATS, and every other axis is broadcast, e.g.,
+    base stats of shape (species, 1, 6) and levels of shape (1, levels, 1) give every species at every level.
+
+    :param base_stats: The base stats of the Pokémon, with a last axis of length 6.
+    :param level: The level of the Pokémon.
+    :param ivs: The IVs of the Pokémon.
+    :param evs: The EVs of the Pokémon.
+    :param natures: The nature multipliers of the stats.
+    :param boosts: The boosts to the stats.
+    :return: The calculated stats, as an integer array with a last axis of length 6.
+    """
+    return calculate_stat(base_stats, level, ivs, evs, natures, boosts, hp=np.arange(len(STATS)) == STATS.index("HP"))
@@ -0,0 +1,152 @@
+# pylint: disable=locally-disabled, line-too-long
+"""
+Holds the facts about a Pokémon that more than one part of its wiki page needs, such as its types, dex number and
+display name, so that each is worked out once per page rather than once per generator.
+
+Every fact is only worked out the first time it is asked for, so a page limited to a few sections does no more work
+than before, and a fact that cannot be worked out, e.g., as the Pokémon's data is incomplete, fails in every section
+that asks for it, just as it would without sharing. A fact that fails is not kept, and is tried again when next asked
+for.
+
+Given an active dependency recording, the data read while working out a fact is recorded along with it, and added to
+the recording of every later section that uses the fact, so that the section cache still knows every section's inputs.
+"""
+from data_access import ability_info, evolution_info
+from dependencies import include_dependencies, is_recording, record_dependencies
+from dex_index import dex_entry, species_entry
+from evolution import EvolutionHandler
+from utility_methods import get_two_types
+
+
+class SpeciesContext:
+    """
+    Simple class holding the facts about a Pokémon shared by every generator of its wiki page.
+    """
+    def __init__(self, p_data):
+        """
+        The init function of SpeciesContext.
+
+        :param dict[str, str] p_data: A dictionary containing all the Pokémon's data in pokemon.txt.
+        """
+        self.p_data = p_data
+        # Format: "FactName" -> (value, recording or None)
+        self._facts = {}
+
+    def derive(self, name, compute):
+        """
+        Works out a fact the first time it is asked for, and gives the same value every time after.
+
+        A fact worked out while no recording was active is worked out again the first time it is asked for within one,
+        so its data accesses are known.
+
+        :param str name: The name of the fact.
+        :param Callable[[], Any] compute: Works out the fact.
+        :return Any: The value of the fact.
+        """
+        if name in self._facts:
+            value, recording = self._facts[name]
+            if recording is not None:
+                include_dependencies(recording)
+                return value
+            if not is_recording():
+                return value
+
+        if is_recording():
+            with record_dependencies() as recording:
+                value = compute()
+        else:
+            value, recording = compute(), None
+        self._facts[name] = (value, recording)
+        return value
+
+    @property
+    def internal_name(self):
+        return self.p_data["InternalName"]
+
+    @property
+    def types(self):
+        """
+        :return tuple[str, str]: The two types of the Pokémon, which are the same if it is single-typed.
+        """
+        return self.derive("types", lambda: get_two_types(self.p_data))
+
+    @property
+    def dex_info(self):
+        """
+        :return dict[str, str | None]: The dex index entry of the Pokémon's dex number, as in dex_index.dex_entry.
+        """
+        return self.derive("dex_info", lambda: species_entry(self.internal_name))
+
+    @property
+    def dex_number(self):
+        """
+        :return str: The dex number of the Pokémon, e.g., "X031".
+        """
+        return self.dex_info["DexNumber"]
+
+    @property
+    def display_name(self):
+        return self.dex_info["DisplayName"]
+
+    @property
+    def evolution_info(self):
+        """
+        The evolution information is found by the internal name of the Pokémon's dex number, which for alternate forms
+        sharing a number is that of the form listed in pokemon_info.json.
+
+        :return dict[str, str | list[str] | dict[str, str]]: The information in evolution_info.json.
+        """
+        return self.derive("evolution_info", lambda: evolution_info(self.dex_info["InternalName"]))
+
+    @property
+    def evolution(self):
+        """
+        :return EvolutionHandler: The handler of the Pokémon's evolution chain, shared by every generator.
+        """
+        return self.derive("evolution", lambda: EvolutionHandler(self))
+
+    @property
+    def neighbours(self):
+        """
+        Finds the Pokémon before and after this one in its dex, wrapping around at either end.
+
+        :return dict[str, str]: The display names and dex numbers of the previous and next Pokémon.
+        """
+        def find_neighbours():
+            prev_num, next_num = self.dex_info["Prev"], self.dex_info["Next"]
+            return {"PrevName": dex_entry(prev_num)["DisplayName"], "PrevNumber": prev_num,
+                    "NextName": dex_entry(next_num)["DisplayName"], "NextNumber": next_num}
+
+        return self.derive("neighbours", find_neighbours)
+
+    @property
+    def abilities(self):
+        """
+        :return list[str]: The internal names of the Pokémon's abilities, with any hidden ability last.
+        """
+        def find_abilities():
+            abilities = self.p_data["Abilities"].split(",")
+            if "HiddenAbility" in self.p_data:
+                abilities.append(self.p_data["HiddenAbility"])
+            return abilities
+
+        return list(self.derive("abilities", find_abilities))
+
+    @property
+    def ability_names(self):
+        """
+        Resolves the first two regular abilities and any hidden ability to their display names, which are None for any
+        ability missing from ability_info.json.
+
+        :return dict[str, str | None]: The display name of each ability, by infobox field.
+        """
+        def resolve_abilities():
+            regular = self.p_data["Abilities"].split(",")
+            names = {"ability1": ability_info(regular[0])}
+            if len(regular) > 1:
+                names["ability2"] = ability_info(regular[1])
+            if "HiddenAbility" in self.p_data:
+                names["hiddenability"] = ability_info(self.p_data["HiddenAbility"])
+            return names
+
+        return self.derive("ability_names", resolve_abilities)
@@ -0,0 +1,221 @@
+# pylint: disable=locally-disabled, line-too-long
+"""
+Finds which wiki pages are out of date, by comparing the pages in a local MediaWiki XML dump of the wiki against freshly
+generated pages, and reporting only the pages and sections that differ.
+
+The dump is read with iterparse one page at a time, and every page that is not a Pokémon's page is dropped as soon as
+its title is read, so even a dump of hundreds of megabytes is read in constant memory. Only the text of Pokémon pages is
+kept until their generated page is ready. Pages are generated in a forked worker process (or several) at the same time
+as the dump is read, so the whole audit takes little longer than whichever of the two is slower.
+
+Both pages are split into sections by their headings, and compared section by section, ignoring trailing whitespace and
+blank lines around a section, which the wiki drops on saving. The untitled start of a page is split into the header,
+infobox and opening paragraph, and the footer is compared along with the header it repeats.
+"""
+import functools
+import logging
+import multiprocessing
+import re
+import xml.etree.ElementTree as ET
+from batch import generate_page, page_filename, preload_game_data
+from data_access import load_reference
+from wiki import SECTIONS
+
+# A section heading, e.g., =='''Stats'''== or === By TM/HM ===, with or without bold
+_HEADING = re.compile(r"^(={2,3})\s*(?:''')?(.*?)(?:''')?\s*\1\s*$")
+
+# The key of every titled section, by its lowercase title and subtitle
+_SECTION_KEYS = {(title.lower(), (subtitle or "").lower()): key for key, (title, subtitle, _, _) in SECTIONS.items() if title}
+
+
+def _tidy(lines):
+    """
+    Drops trailing whitespace from each line, and blank lines from either end, as the wiki does on saving.
+
+    :param list[str] lines: The lines of a section.
+    :return list[str]: The tidied lines.
+    """
+    lines = [line.rstrip() for line in lines]
+    while lines and not lines[0]:
+        lines.pop(0)
+    while lines and not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def _split_lead(lines):
+    """
+    Splits the untitled start of a page into its header, infobox and opening paragraph, where the header and infobox are
+    each a template closing on a line of its own.
+
+    :param list[str] lines: The lines before the first heading.
+    :return dict[str, list[str]]: The lines of each part found, by section key.
+    """
+    sections, start = {}, 0
+    for key in ("header", "infobox"):
+        if start < len(lines) and lines[start].startswith("{{") and "}}" in lines[start:]:
+            end = lines.index("}}", start) + 1
+            sections[key] = lines[start:end]
+            start = end
+    sections["opening"] = lines[start:]
+    return sections
+
+
+def split_sections(text):
+    """
+    Splits the wikitext of a Pokémon page into its sections.
+
+    Titled sections are found by their headings, with each learnset subsection separate. A section not made by this
+    program, e.g., Trivia, is kept under its own title. The footer, which repeats the header, is added to the header.
+
+    :param str text: The wikitext of the page.
+    :return dict[str, list[str]]: The tidied lines of each non-empty section, by section key, in page order.
+    """
+    lines = text.split("\n")
+    chunks, key, title = {"lead": []}, "lead", ""
+    for line in lines:
+        match = _HEADING.match(line)
+        if match is None:
+            chunks.setdefault(key, []).append(line)
+            continue
+
+        if len(match[1]) == 2:
+            title = match[2].strip().lower()
+            key = _SECTION_KEYS.get((title, ""), match[2].strip())
+        else:
+            key = _SECTION_KEYS.get((title, match[2].strip().lower()), match[2].strip())
+        chunks.setdefault(key, [])
+
+    sections = _split_lead(chunks.pop("lead"))
+    # The footer is the header repeated at the very end of the page
+    header = _tidy(sections.get("header", []))
+    last = list(chunks)[-1] if chunks else None
+    if header and last is not None and header[0] in chunks[last]:
+        start = len(chunks[last]) - 1 - chunks[last][::-1].index(header[0])
+        sections["header"] = header + [""] + chunks[last][start:]
+        chunks[last] = chunks[last][:start]
+    sections.update(chunks)
+
+    return {key: tidied for key, section in sections.items() if (tidied := _tidy(section))}
+
+
+def compare_sections(current, generated):
+    """
+    Finds the sections of a page that differ between the wiki and a newly generated page.
+
+    :param dict[str, list[str]] current: The sections of the page on the wiki.
+    :param dict[str, list[str]] generated: The sections of the generated page.
+    :return list[str]: The keys of every generated section that is missing from, or differs on, the wiki.
+    """
+    return [key for key, lines in generated.items() if current.get(key) != lines]
+
+
+def iter_dump_pages(path, titles):
+    """
+    Reads the pages of a MediaWiki XML dump one at a time, giving only those with a wanted title, or a wanted title with
+    an internal name added, e.g., "Meowth (MEOWTHELDIW)".
+
+    Any version of the export schema is read, as elements are matched by their local name alone. Every element is
+    cleared once read, so memory use does not grow with the size of the dump.
+
+    :param str path: The path of the XML dump.
+    :param set[str] titles: The titles of the wanted pages.
+    :return Iterator[tuple[str, str]]: The title and latest wikitext of each wanted page, in dump order.
+    """
+    context = ET.iterparse(path, events=("start", "end"))
+    _, root = next(context)
+    title, text = None, None
+    for event, element in context:
+        if event != "end":
+            continue
+        name = element.tag.rpartition("}")[2]
+        if name == "title":
+            title = element.text
+        elif name == "text" and (title in titles or (title or "").rpartition(" (")[0] in titles):
+            text = element.text or ""
+        elif name == "page":
+            if text is not None:
+                yield title, text
+            title, text = None, None
+            root.clear()
+
+
+def _generate(internal_name, selection=None):
+    """
+    Generates the wiki page of a single Pokémon in a worker process.
+
+    :param str internal_name: The internal name of the Pokémon.
+    :param tuple[str] | None selection: The keys of the sections to generate, or None for every section.
+    :return tuple[str, dict[str, str | list[str] | int | float | None]]: The Pokémon with its generated page.
+    """
+    return internal_name, generate_page(internal_name, selection)
+
+
+def find_stale_pages(dump_path, internal_names, selection=None, jobs=1):
+    """
+    Compares the Pokémon pages in a MediaWiki XML dump against freshly generated pages.
+
+    :param str dump_path: The path of the XML dump of the wiki.
+    :param list[str] internal_names: The internal names of the Pokémon whose pages are checked.
+    :param tuple[str] | None selection: The keys of the sections to compare, or None for every section.
+    :param int jobs: The number of worker processes to generate pages in while the dump is read.
+    :return dict[str, dict[str, str | list[str] | None]]: For each Pokémon, the title of its page, its status (one of
+        "current", "stale", "missing" or "failed"), and the keys of the sections that differ.
+    """
+    # Any Pokémon page is titled by a display name, so all other pages can be dropped unread
+    titles = {value["DisplayName"] for value in load_reference('references/pokemon_info.json').values()}
+    generate = functools.partial(_generate, selection=selection)
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        preload_game_data()
+        pool = multiprocessing.get_context("fork").Pool(max(1, jobs))
+        # Tasks are handed to the workers straight away, so pages are generated while the dump is being read
+        pages = pool.imap(generate, internal_names, chunksize=max(1, len(internal_names) // (max(1, jobs) * 4)))
+    else:
+        logging.warning("Forking processes is not supported on this platform; generating pages after reading the dump.")
+        pool, pages = None, None
+
+    try:
+        current = {title: split_sections(text) for title, text in iter_dump_pages(dump_path, titles)}
+        pages = pages if pages is not None else map(generate, internal_names)
+
+        report, used_titles = {}, set()
+        for internal_name, page in pages:
+            if page["Error"] is not None:
+                report[internal_name] = {"Title": None, "Status": "failed", "Sections": [], "Error": page["Error"]}
+                continue
+
+            title = page_filename(page["DisplayName"], internal_name, used_titles, "")
+            if title not in current:
+                report[internal_name] = {"Title": title, "Status": "missing", "Sections": [], "Error": None}
+                continue
+            differing = compare_sections(current[title], split_sections("\n".join(page["Lines"])))
+            report[internal_name] = {"Title": title, "Status": "stale" if differing else "current", "Sections": differing,
+                                     "Error": None}
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    return report
+
+
+def print_stale_report(report):
+    """
+    Prints the pages that are out of date, along with the sections that differ, and the pages missing from the wiki.
+
+    :param dict[str, dict[str, str | list[str] | None]] report: The report made by find_stale_pages.
+    """
+    by_status = {}
+    for internal_name, result in report.items():
+        by_status.setdefault(result["Status"], []).append((internal_name, result))
+
+    print(f"\n{len(by_status.get('current', []))} current, {len(by_status.get('stale', []))} stale, "
+          f"{len(by_status.get('missing', []))} missing, {len(by_status.get('failed', []))} failed.")
+    if by_status.get("stale"):
+        print("\nStale pages:")
+        for _, result in by_status["stale"]:
+            print(f"  {result['Title']}: {', '.join(result['Sections'])}")
+    if by_status.get("missing"):
+        print("\nMissing from the wiki:")
+        for _, result in by_status["missing"]:
+            print(f"  {result['Title']}")
@@ -0,0 +1,244 @@
+# pylint: disable=locally-disabled, line-too-long
+"""
+Compares two versions of the game data, e.g., before and after a game update, and finds which wiki pages need
+regenerating.
+
+Each version is split into records: one per Pokémon section of pokemon.txt, one per move row of tm.txt, and one per zone
+of encounters.txt. A digest is made of every record, so unchanged records are skipped without comparing their contents,
+and only the records whose digests differ are compared field by field.
+
+A Pokémon's page needs regenerating if its own record, TM rows or zones changed, or if its obtainability changed as a
+result. As a page also shows the pokemon.txt data of the rest of its evolution family (in its evolution box, opening
+paragraph and breeding learnset), and of any Pokémon it must have in the party to evolve, a changed record also
+regenerates those pages.
+"""
+import collections
+import os
+from data_access import load_reference
+from data_collection import build_pokemon_index, read_file_lines
+from dependencies import digest
+from obtainability import resolve_obtainability
+
+# Every move row of tm.txt before this line is a TM, and every row after it is a tutor move, as in build_move_index
+_TUTOR_START = 194
+
+
+def species_records(gamedata_dir):
+    """
+    Splits pokemon.txt into one record per Pokémon.
+
+    :param str gamedata_dir: The directory containing the game data files.
+    :return dict[str, dict[str, str]]: The fields of each Pokémon's section, by internal name.
+    """
+    records = {}
+    for name, lines in build_pokemon_index(os.path.join(gamedata_dir, "pokemon.txt")).items():
+        records[name] = {"InternalNumber": lines[0].strip("[]")}
+        records[name].update(line.split("=", 1) for line in lines[1:] if "=" in line)
+    return records
+
+
+def tm_records(gamedata_dir):
+    """
+    Splits tm.txt into one record per move row.
+
+    :param str gamedata_dir: The directory containing the game data files.
+    :return dict[str, dict[str, str | list[str]]]: Whether each move is taught by TM or tutor, and the Pokémon that can
+        learn it, by move.
+    """
+    line_list = read_file_lines(os.path.join(gamedata_dir, "tm.txt"))
+    return {line_list[idx - 1].strip("[]"): {"Kind": "TM" if idx < _TUTOR_START else "Tutor", "Pokemon": line.split(",")}
+            for idx, line in enumerate(line_list) if idx > 0 and line_list[idx - 1].startswith("[")}
+
+
+def zone_records(gamedata_dir):
+    """
+    Splits encounters.txt into one record per zone. A zone ID found twice has its later zones numbered, e.g., "023 (2)".
+
+    :param str gamedata_dir: The directory containing the game data files.
+    :return dict[str, dict[str, str | list[str]]]: The name, encounter densities and encounters by method (e.g., "Cave")
+        of each zone, by zone ID.
+    """
+    records, record, method = {}, None, None
+    for line in read_file_lines(os.path.join(gamedata_dir, "encounters.txt")):
+        # Zone headers are of the form "002 # Relitto Meteora", and are separated by lines of hashes
+        if "#" in line:
+            zone_id, _, zone_name = line.partition("#")
+            zone_id = zone_id.strip()
+            if not zone_id:
+                continue
+            key, count = zone_id, 1
+            while key in records:
+                count += 1
+                key = f"{zone_id} ({count})"
+            record = records[key] = {"Name": zone_name.strip(), "Densities": ""}
+            method = None
+        elif record is None:
+            continue
+        elif line[:1].isdigit():
+            record["Densities"] = line
+        elif "," not in line:
+            method = line
+            record.setdefault(method, [])
+        elif method is not None:
+            record[method].append(line)
+    return records
+
+
+def diff_fields(old, new, ordered=False):
+    """
+    Finds every field that differs between two versions of a record.
+
+    A list field gives the items added and removed, counting repeats, and any other field gives its old and new value.
+    If the order of a list matters, e.g., the slots of an encounter table, whose position decides their rarity, a list
+    field also gives the items kept but moved to or from a different position.
+
+    :param dict old: The old version of the record.
+    :param dict new: The new version of the record.
+    :param bool ordered: Whether the position of each item in a list field matters.
+    :return dict[str, dict[str, list] | list]: The change to each differing field.
+    """
+    changes = {}
+    for field in dict.fromkeys([*old, *new]):
+        old_value, new_value = old.get(field), new.get(field)
+        if old_value == new_value:
+            continue
+        if isinstance(old_value, list) or isinstance(new_value, list):
+            old_items, new_items = collections.Counter(old_value or []), collections.Counter(new_value or [])
+            changes[field] = {"Added": list((new_items - old_items).elements()), "Removed": list((old_items - new_items).elements())}
+            if ordered:
+                old_value, new_value = old_value or [], new_value or []
+                positions = [idx for idx in range(max(len(old_value), len(new_value)))
+                             if old_value[idx:idx + 1] != new_value[idx:idx + 1]]
+                changes[field]["Moved"] = list(dict.fromkeys(item for idx in positions for item in old_value[idx:idx + 1] + new_value[idx:idx + 1]
+                                                             if item in old_items and item in new_items))
+        else:
+            changes[field] = [old_value, new_value]
+    return changes
+
+
+def diff_records(old, new, ordered=False):
+    """
+    Compares two versions of a set of records, only comparing the fields of records whose digests differ.
+
+    :param dict[str, dict] old: The old records, by key.
+    :param dict[str, dict] new: The new records, by key.
+    :param bool ordered: Whether the position of each item in a list field matters, as in diff_fields.
+    :return dict[str, list[str] | dict[str, dict]]: The keys of added and removed records, and the changed fields of
+        every changed record.
+    """
+    old_digests = {key: digest(record) for key, record in old.items()}
+    new_digests = {key: digest(record) for key, record in new.items()}
+    return {
+        "Added": [key for key in new if key not in old],
+        "Removed": [key for key in old if key not in new],
+        "Changed": {key: diff_fields(old[key], new[key], ordered) for key in new if key in old and old_digests[key] != new_digests[key]}
+    }
+
+
+def diff_versions(old_dir, new_dir):
+    """
+    Compares the species records, TM rows and zones of two versions of the game data.
+
+    :param str old_dir: The directory containing the old game data files.
+    :param str new_dir: The directory containing the new game data files.
+    :return dict[str, dict[str, list[str] | dict[str, dict]]]: The differences of each kind of record.
+    """
+    return {
+        "Species": diff_records(species_records(old_dir), species_records(new_dir)),
+        "TMs": diff_records(tm_records(old_dir), tm_records(new_dir)),
+        # The rarity of an encounter is decided by its slot's position in the zone's table
+        "Zones": diff_records(zone_records(old_dir), zone_records(new_dir), ordered=True)
+    }
+
+
+def _changed_names(diff, old, new):
+    """
+    Finds every Pokémon affected by the changes to a set of TM rows or zones: every Pokémon added, removed or moved to a
+    different slot, or every Pokémon in the record if anything else about it changed, e.g., a zone's encounter
+    densities.
+
+    :param dict[str, list[str] | dict[str, dict]] diff: The differences of the records.
+    :param dict[str, dict] old: The old records, by key.
+    :param dict[str, dict] new: The new records, by key.
+    :return set[str]: The internal names of the Pokémon.
+    """
+    def names_in(*records):
+        return {entry.split(",")[0] for record in records for field in record.values() if isinstance(field, list) for entry in field}
+
+    names = set()
+    for key in diff["Added"]:
+        names |= names_in(new[key])
+    for key in diff["Removed"]:
+        names |= names_in(old[key])
+    for key, changes in diff["Changed"].items():
+        if any(not isinstance(change, dict) for change in changes.values()):
+            names |= names_in(old[key], new[key])
+            continue
+        for change in changes.values():
+            names.update(entry.split(",")[0] for entry in change["Added"] + change["Removed"] + change.get("Moved", []))
+    return names
+
+
+def pages_to_regenerate(old_dir, new_dir, diff, internal_names):
+    """
+    Finds every Pokémon whose wiki page shows data that differs between two versions of the game data.
+
+    :param str old_dir: The directory containing the old game data files.
+    :param str new_dir: The directory containing the new game data files.
+    :param dict[str, dict[str, list[str] | dict[str, dict]]] diff: The differences found by diff_versions.
+    :param list[str] internal_names: The internal names of every Pokémon with a page, in dex order.
+    :return list[str]: The internal names of the Pokémon whose pages need regenerating, in dex order.
+    """
+    # Every page shows the pokemon.txt data of its whole evolution family, and of any Pokémon needed in the party to
+    # evolve, but only its own TMs and encounters
+    evo_info = load_reference('references/evolution_info.json')
+    families = {}
+    for name in evo_info:
+        first = name
+        while evo_info.get(first, {}).get("PreEvolution", "no") != "no":
+            first = evo_info[first]["PreEvolution"]
+        families.setdefault(first, set()).add(name)
+    family_of = {name: family for family in families.values() for name in family}
+
+    changed = set(diff["Species"]["Added"] + diff["Species"]["Removed"]) | set(diff["Species"]["Changed"])
+    affected = set(changed)
+    for name in changed:
+        affected |= family_of.get(name, set())
+    for name, info in evo_info.items():
+        if info.get("PreEvolutionMethod", {}).get("HasInParty") in changed:
+            affected |= family_of.get(name, {name})
+
+    affected |= _changed_names(diff["TMs"], tm_records(old_dir), tm_records(new_dir))
+
+    # Encounters are found by searching for a Pokémon's name within each line, so e.g., SHYLEON is also shown the zones
+    # of SHYLEONX
+    zone_names = _changed_names(diff["Zones"], zone_records(old_dir), zone_records(new_dir))
+    affected |= {name for name in internal_names if any(name in zone_name for zone_name in zone_names)}
+
+    old_table = resolve_obtainability(os.path.join(old_dir, "encounters.txt"), pokemon_path=os.path.join(old_dir, "pokemon.txt"))
+    new_table = resolve_obtainability(os.path.join(new_dir, "encounters.txt"), pokemon_path=os.path.join(new_dir, "pokemon.txt"))
+    affected |= {name for name in old_table.keys() | new_table.keys() if old_table.get(name) != new_table.get(name)}
+
+    return [name for name in internal_names if name in affected]
+
+
+def print_diff(diff):
+    """
+    Prints every difference between two versions of the game data, field by field.
+
+    :param dict[str, dict[str, list[str] | dict[str, dict]]] diff: The differences found by diff_versions.
+    """
+    for kind, records in diff.items():
+        print(f"\n{kind}: {len(records['Added'])} added, {len(records['Removed'])} removed, {len(records['Changed'])} changed.")
+        for key in records["Added"]:
+            print(f"  + {key}")
+        for key in records["Removed"]:
+            print(f"  - {key}")
+        for key, changes in records["Changed"].items():
+            print(f"  ~ {key}")
+            for field, change in changes.items():
+                if isinstance(change, dict):
+                    print(f"      {field}: " + ", ".join([f"+{item}" for item in change["Added"]] + [f"-{item}" for item in change["Removed"]]
+                                                         + [f"~{item}" for item in change.get("Moved", [])]))
+                else:
+                    print(f"      {field}: {change[0]!r} -> {change[1]!r}")
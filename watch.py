@@ -0,0 +1,157 @@
+# pylint: disable=locally-disabled, line-too-long
+"""
+Keeps the wiki pages in an output directory up to date while the game data and reference dictionaries are edited.
+
+Every page is generated once with a section cache, and the process then stays alive, polling the data directories for
+changes. The game data and reference dictionaries stay loaded between changes, and are only reloaded once a file has
+changed. Every data access recorded in the section cache is then made again, and only the pages with a section that
+read changed data are regenerated; every other page is left untouched. Polling only needs the standard library, so this
+works the same on any platform.
+"""
+import logging
+import os
+import time
+from batch import all_species, reload_game_data, run_batch
+from section_cache import SectionCache
+from wiki import SECTIONS
+
+# The directories read to create wiki pages
+WATCHED_DIRS = ("gamedata", "references")
+
+
+def snapshot(directories=WATCHED_DIRS):
+    """
+    Records the modification time and size of every file in the given directories.
+
+    :param tuple[str] directories: The directories to look in, including any subdirectories.
+    :return dict[str, tuple[int, int]]: The modification time and size of each file, by path.
+    """
+    files = {}
+    for directory in directories:
+        for root, _, filenames in os.walk(directory):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                stat = os.stat(path)
+                files[path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def changed_files(before, after):
+    """
+    Finds every file added, removed or modified between two snapshots.
+
+    :param dict[str, tuple[int, int]] before: The earlier snapshot.
+    :param dict[str, tuple[int, int]] after: The later snapshot.
+    :return list[str]: The paths of the changed files.
+    """
+    return sorted(path for path in before.keys() | after.keys() if before.get(path) != after.get(path))
+
+
+class DependencyMap:
+    """
+    Simple class mapping every data access recorded in a section cache to the pages whose sections made it.
+    """
+    def __init__(self, section_cache, selection=None):
+        """
+        The init function of DependencyMap.
+
+        :param SectionCache section_cache: The section cache holding the recorded data accesses.
+        :param tuple[str] | None selection: The keys of the sections generated, or None for every section.
+        """
+        self.section_cache = section_cache
+        self.keys = selection or tuple(SECTIONS)
+        # Format: ("TrackedFunctionName", (args)) -> {"PokémonInternalName": "ResultDigest"}
+        self.accesses = {}
+        # The data accesses recorded for each Pokémon, so they can be replaced when its page is regenerated
+        self.page_accesses = {}
+        # The Pokémon whose pages are missing a section, e.g., as generating them failed, and so must always be generated
+        self.incomplete = set()
+
+    def update(self, internal_names):
+        """
+        Reads the recorded data accesses of the given Pokémon from the section cache, replacing any read before.
+
+        :param list[str] internal_names: The internal names of the Pokémon.
+        """
+        for internal_name in internal_names:
+            for access in self.page_accesses.pop(internal_name, ()):
+                self.accesses[access].pop(internal_name, None)
+            self.incomplete.discard(internal_name)
+
+            entries = self.section_cache.load(internal_name)
+            page_accesses = self.page_accesses[internal_name] = set()
+            for key in self.keys:
+                if key not in entries or entries[key].get("Code") != self.section_cache.code:
+                    self.incomplete.add(internal_name)
+                    continue
+                for name, args, result in entries[key]["Dependencies"]:
+                    access = (name, tuple(args))
+                    self.accesses.setdefault(access, {})[internal_name] = result
+                    page_accesses.add(access)
+
+    def affected(self, internal_names):
+        """
+        Finds every given Pokémon with a page that read data which has since changed, by making each recorded data
+        access again. Each distinct access is only made once, no matter how many pages made it. Pokémon never seen
+        before, or with a section missing from the cache, are always affected.
+
+        :param list[str] internal_names: The internal names of the Pokémon to check.
+        :return list[str]: The internal names of the affected Pokémon, in the order given.
+        """
+        self.section_cache.forget_data()
+        affected = set(self.incomplete)
+        for (name, args), pages in self.accesses.items():
+            current = self.section_cache.current_digest(name, args)
+            affected.update(internal_name for internal_name, result in pages.items() if result != current)
+        return [name for name in internal_names if name in affected or name not in self.page_accesses]
+
+
+def watch(out_dir, cache_dir=".cache/sections", interval=1.0, selection=None, page_format="wiki", species=None):
+    """
+    Generates every page, then keeps regenerating the pages affected by any change to the data until interrupted.
+
+    :param str out_dir: The directory to write pages to.
+    :param str cache_dir: The directory of the section cache.
+    :param float interval: The number of seconds between polls for changes.
+    :param tuple[str] | None selection: The keys of the sections to generate, or None for every section.
+    :param str page_format: The format to write pages in, as in page_model.RENDERERS.
+    :param Callable[[], list[str]] | None species: Finds the internal names of the Pokémon to keep up to date, which is
+        done again after every change, so Pokémon added to the dex are picked up. Defaults to the whole dex.
+    """
+    species = species or all_species
+    internal_names = species()
+    start = time.perf_counter()
+    results = run_batch(internal_names, out_dir, selection=selection, page_format=page_format, cache_dir=cache_dir)
+    filenames = {name: result["File"] for name, result in results.items() if result["File"]}
+    print(f"Generated {len(filenames)} of {len(results)} pages in {time.perf_counter() - start:.2f}s.")
+
+    dependency_map = DependencyMap(SectionCache(cache_dir), selection)
+    dependency_map.update(internal_names)
+    files = snapshot()
+    print(f"Watching {', '.join(WATCHED_DIRS)} for changes every {interval:g}s; press Ctrl+C to stop.")
+
+    try:
+        while True:
+            time.sleep(interval)
+            new_files = snapshot()
+            changed = changed_files(files, new_files)
+            if not changed:
+                continue
+            files = new_files
+
+            start = time.perf_counter()
+            print(f"\nChanged: {', '.join(changed)}")
+            reload_game_data()
+            internal_names = species()
+            affected = dependency_map.affected(internal_names)
+            results = run_batch(affected, out_dir, selection=selection, page_format=page_format, cache_dir=cache_dir,
+                                filenames=filenames)
+            filenames.update({name: result["File"] for name, result in results.items() if result["File"]})
+            dependency_map.update(affected)
+
+            failures = [name for name, result in results.items() if result["Error"]]
+            print(f"Regenerated {len(affected) - len(failures)} of {len(affected)} affected pages in "
+                  f"{time.perf_counter() - start:.2f}s" + (f"; failed: {', '.join(failures)}." if failures else "."))
+    except KeyboardInterrupt:
+        logging.info("Stopped watching for changes.")
+        print("\nStopped watching.")
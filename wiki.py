@@ -1,71 +1,267 @@
-# pylint: disable=line-too-long, missing-module-docstring, too-few-public-methods, too-many-arguments
+# pylint: disable=line-too-long, missing-module-docstring, too-few-public-methods, too-many-arguments, F0401
+import functools
+import sys
+from pokemon import PokemonBoxGenerator
+from moves import MoveListGenerator
+from locations import LocationDataGenerator
+from data_collection import DataCollection
+from pokemontypes import TypeEffectivenessCalculator
+from species_context import SpeciesContext
+from page_model import layout_lines, parse_blocks
+from dependencies import record_dependencies, include_dependencies
+from profiling import profile_section
+
+# Every section of a wiki page, in page order.
+# Format: "SectionKey" -> ("Title" | None, "Subtitle" | None, "GeneratorAttribute", "ProviderMethod")
+# Untitled sections (the header/footer, infobox and opening paragraph) have no title, and the learnset is split into
+# subsections that share a title
+SECTIONS = {
+    "header": (None, None, "poke_box_gen", "create_header_footer"),
+    "infobox": (None, None, "poke_box_gen", "create_infobox"),
+    "opening": (None, None, "poke_box_gen", "create_opening_paragraph"),
+    "pokedex": ("Pokédex entries", None, "poke_box_gen", "create_pokedex_entry"),
+    "locations": ("Game locations", None, "location_data_gen", "create_game_locations"),
+    "items": ("Held items", None, "poke_box_gen", "create_wild_items"),
+    "stats": ("Stats", None, "poke_box_gen", "create_stats"),
+    "types": ("Type effectiveness", None, "type_eff_calc", "create_type_effectiveness"),
+    "level": ("Learnset", "By leveling up", "move_list_gen", "create_level_learn_list"),
+    "tm": ("Learnset", "By TM/HM", "move_list_gen", "create_tm_learn_list"),
+    "breed": ("Learnset", "By breeding", "move_list_gen", "create_breeding_learn_list"),
+    "tutor": ("Learnset", "By tutoring", "move_list_gen", "create_tutor_learn_list"),
+    "evolution": ("Evolution", None, "evo_handler", "create_evolution_box"),
+    "sprites": ("Sprites", None, "poke_box_gen", "create_sprites")
+}
+
+# The game data each generator needs, which is only extracted once a generator needing it is created
+GENERATOR_DATA = {
+    "poke_box_gen": ("pokemon_data",),
+    "move_list_gen": ("pokemon_data", "move_data"),
+    "location_data_gen": ("pokemon_data", "encounter_data"),
+    "type_eff_calc": ("pokemon_data",),
+    "evo_handler": ("pokemon_data",)
+}
+
+
+def select_sections(names):
+    """
+    Finds the keys of the sections chosen by a list of names, in page order.
+
+    A name may be a section key (e.g., "tm"), or a section title (e.g., "learnset") to choose all of its subsections.
+
+    :param list[str] names: The names of the chosen sections, in any case.
+    :return tuple[str]: The keys of the chosen sections.
+    :raises ValueError: If a name does not match any section.
+    """
+    names = {name.strip().lower() for name in names}
+    selection = tuple(key for key, (title, _, _, _) in SECTIONS.items() if key in names or (title or "").lower() in names)
+
+    unknown = names - set(SECTIONS) - {title.lower() for title, _, _, _ in SECTIONS.values() if title}
+    if unknown:
+        raise ValueError(f"Unknown section(s) {", ".join(sorted(unknown))}; choose from {", ".join(SECTIONS)} or learnset.")
+
+    return selection
 
 
 class WikiPage:
     """
     Simple class collating different methods together in order to print a full wiki page for a certain Pokémon.
+
+    The game data and generators are only created when a section first needs them, so a page limited to a few sections
+    never extracts encounter data, for example, unless the Game locations section is among them.
+
+    Given a section cache, any section whose inputs are unchanged since it was cached is reused rather than created.
     """
-    def __init__(self, poke_box_gen, move_list_gen, location_data_gen, type_eff_calc, evo_handler):
+    def __init__(self, internal_name, section_cache=None):
         """
         The init function of WikiPage.
 
-        :param class poke_box_gen: An initialised PokémonBoxGenerator class.
-        :param class move_list_gen: An initialised MoveListGenerator class.
-        :param class location_data_gen: An initialised LocationDataGenerator class.
-        :param class type_eff_calc: An initialised TypeEffectivenessCalculator class.
-        :param class evo_handler: An initialised EvolutionHandler class.
+        :param str internal_name: The internal name of the Pokémon, as in pokemon.txt.
+        :param SectionCache | None section_cache: The cache to reuse sections from and store new sections in, if any.
         """
-        self.poke_box_gen = poke_box_gen
-        self.move_list_gen = move_list_gen
-        self.location_data_gen = location_data_gen
-        self.type_eff_calc = type_eff_calc
-        self.evo_handler = evo_handler
+        self.internal_name = internal_name
+        self.dc = DataCollection(internal_name)
+        self.section_cache = section_cache
+        # The data read while creating each piece of game data and each generator, which only matters given a cache
+        self.dependencies = {}
 
-    def generate_wiki_page(self):
+    def _record(self, attribute, create):
         """
-        Retrieves and prints the different elements of a Pokémon wiki page in a pre-defined order.
+        Creates a piece of game data or a generator, recording the data it reads if the page has a section cache.
+
+        :param str attribute: The name of the attribute being created.
+        :param Callable create: Creates the attribute's value.
+        :return Any: The attribute's value.
+        """
+        if self.section_cache is None:
+            return create()
+        with record_dependencies() as recording:
+            value = create()
+        self.dependencies[attribute] = recording
+        return value
+
+    @functools.cached_property
+    def pokemon_data(self):
+        return self._record("pokemon_data", self.dc.extract_pokemon_data)
+
+    @functools.cached_property
+    def move_data(self):
+        return self._record("move_data", self.dc.extract_move_data)
+
+    @functools.cached_property
+    def encounter_data(self):
+        return self._record("encounter_data", self.dc.extract_encounter_data)
+
+    @functools.cached_property
+    def context(self):
+        return self._record("context", lambda: SpeciesContext(self.pokemon_data))
+
+    @functools.cached_property
+    def poke_box_gen(self):
+        return self._record("poke_box_gen", lambda: PokemonBoxGenerator(self.context))
+
+    @functools.cached_property
+    def move_list_gen(self):
+        return self._record("move_list_gen", lambda: MoveListGenerator(self.context, *self.move_data))
+
+    @functools.cached_property
+    def location_data_gen(self):
+        return self._record("location_data_gen", lambda: LocationDataGenerator(self.context, *self.encounter_data))
+
+    @functools.cached_property
+    def type_eff_calc(self):
+        return self._record("type_eff_calc", lambda: TypeEffectivenessCalculator(self.context))
+
+    @functools.cached_property
+    def evo_handler(self):
+        return self._record("evo_handler", lambda: self.context.evolution)
+
+    def load_game_data(self, selection=None):
+        """
+        Extracts the game data needed by the chosen sections, without creating any of them.
+
+        :param tuple[str] | None selection: The keys of the chosen sections, or None for every section.
+        """
+        for key in selection or SECTIONS:
+            for data in GENERATOR_DATA[SECTIONS[key][2]]:
+                getattr(self, data)
+
+    def iter_sections(self, selection=None):
+        """
+        Creates the chosen elements of a Pokémon wiki page one at a time, in page order, each only once the previous
+        one has been used.
+
+        If the page has a section cache, fresh cached sections are reused, and any others are created while recording
+        the data they read, including the data their generator read when created, then cached once every chosen
+        section has been given.
+
+        :param tuple[str] | None selection: The keys of the chosen sections, or None for every section.
+        :return Iterator[tuple[str, list[str]]]: The key and content of each chosen section.
         """
-        # Create the necessary components of the pokemon wiki page
-        header_footer = self.poke_box_gen.create_header_footer()
-        info_box = self.poke_box_gen.create_infobox()
-        open_para = self.poke_box_gen.create_opening_paragraph()
-
-        # Define section titles
-        section_titles = {
-            "Pokédex entries": self.poke_box_gen.create_pokedex_entry(),
-            "Game locations": self.location_data_gen.create_game_locations(),
-            "Held items": self.poke_box_gen.create_wild_items(),
-            "Stats": self.poke_box_gen.create_stats(),
-            "Type effectiveness": self.type_eff_calc.create_type_effectiveness(),
-            "Learnset": {
-                "By leveling up": self.move_list_gen.create_level_learn_list(),
-                "By TM/HM": self.move_list_gen.create_tm_learn_list(),
-                "By breeding": self.move_list_gen.create_breeding_learn_list(),
-                "By tutoring": self.move_list_gen.create_tutor_learn_list()
-            },
-            "Evolution": self.evo_handler.create_evolution_box(),
-            "Sprites": self.poke_box_gen.create_sprites()
-        }
-
-        # Assemble wiki page
-        wiki_page = []
-        wiki_page.extend(header_footer)
-        wiki_page.extend(info_box)
-        wiki_page.extend(open_para)
-        wiki_page.append("")
-
-        for title, content in section_titles.items():
-            wiki_page.append(f"=='''{title}'''==")
-            if isinstance(content, dict):
-                for subtitle, subcontent in content.items():
-                    wiki_page.append(f"==='''{subtitle}'''===")
-                    wiki_page.extend(subcontent)
-            else:
-                wiki_page.extend(content)
-
-        wiki_page.extend(["", ""])
-        wiki_page.extend(header_footer)
+        if self.section_cache is None:
+            for key in selection or SECTIONS:
+                _, _, generator, provider = SECTIONS[key]
+                with profile_section(self.internal_name, key):
+                    content = getattr(getattr(self, generator), provider)()
+                yield key, content
+            return
 
+        with profile_section(self.internal_name, "section_cache"):
+            entries = self.section_cache.load(self.internal_name)
+        changed = False
+        for key in selection or SECTIONS:
+            with profile_section(self.internal_name, key):
+                if key in entries and self.section_cache.is_fresh(entries[key]):
+                    content = entries[key]["Content"]
+                else:
+                    _, _, generator, provider = SECTIONS[key]
+                    with record_dependencies() as recording:
+                        section_generator = getattr(self, generator)
+                        for attribute in (generator, *GENERATOR_DATA[generator]):
+                            include_dependencies(self.dependencies.get(attribute, {}))
+                        content = getattr(section_generator, provider)()
+                    entries[key] = self.section_cache.create_entry(content, recording)
+                    changed = True
+            yield key, content
+
+        if changed:
+            with profile_section(self.internal_name, "section_cache"):
+                self.section_cache.store(self.internal_name, entries)
+
+    def create_sections(self, selection=None):
+        """
+        Retrieves the chosen elements of a Pokémon wiki page from each generator, without assembling them.
+
+        :param tuple[str] | None selection: The keys of the chosen sections, or None for every section.
+        :return dict[str, list[str]]: The content of each chosen section, by section key and in page order.
+        """
+        return dict(self.iter_sections(selection))
+
+    @staticmethod
+    def iter_lines(sections):
+        """
+        Lays out the elements of a Pokémon wiki page in a pre-defined order, giving each line as soon as its section is
+        reached, so that only one section needs to exist at a time.
+
+        :param Iterable[tuple[str, list[str]]] sections: The key and content of each section, in page order.
+        :return Iterator[str]: The lines of the wiki page.
+        """
+        return layout_lines((key, SECTIONS[key][0], SECTIONS[key][1], content) for key, content in sections)
+
+    def create_model(self, selection=None):
+        """
+        Creates the structured model of the Pokémon wiki page, which can then be rendered into any format by the
+        renderers in page_model, as many times as needed.
+
+        :param tuple[str] | None selection: The keys of the sections to include, or None for every section.
+        :return dict: The page model.
+        """
+        sections = [{"Key": key, "Title": SECTIONS[key][0], "Subtitle": SECTIONS[key][1], "Blocks": parse_blocks(list(content))}
+                    for key, content in self.iter_sections(selection)]
+        return {"InternalName": self.internal_name, "DisplayName": self.poke_box_gen.name, "Sections": sections}
+
+    def assemble_wiki_page(self, sections=None, selection=None):
+        """
+        Assembles the different elements of a Pokémon wiki page in a pre-defined order.
+
+        :param dict[str, list[str]] | None sections: The elements of the page, as created by create_sections, which are
+            created now if not given.
+        :param tuple[str] | None selection: The keys of the sections to create if none are given, or None for every
+            section.
+        :return list[str]: The lines of the wiki page.
+        """
+        return list(self.iter_lines(sections.items() if sections else self.iter_sections(selection)))
+
+    def write_wiki_page(self, sink, selection=None):
+        """
+        Writes the lines of a Pokémon wiki page to a writable sink as they are created, without assembling the full
+        page first.
+
+        :param TextIO sink: Anything with a write method taking a string, e.g., sys.stdout, a file, or io.StringIO.
+        :param tuple[str] | None selection: The keys of the sections to write, or None for every section.
+        """
+        for line in self.iter_lines(self.iter_sections(selection)):
+            sink.write(line + "\n")
+
+    def generate_wiki_page(self, selection=None):
+        """
+        Retrieves and prints the different elements of a Pokémon wiki page in a pre-defined order.
+
+        :param tuple[str] | None selection: The keys of the sections to print, or None for every section.
+        """
         # Print wiki page
-        for line in wiki_page:
-            print(line)
+        self.write_wiki_page(sys.stdout, selection)
+
+
+def create_wiki_page(internal_name, section_cache=None):
+    """
+    Prepares the wiki page of a Pokémon, extracting its data from pokemon.txt straight away so that a missing Pokémon is
+    found early. Any other game data, and every generator, is only created once a section needs it.
+
+    :param str internal_name: The internal name of the Pokémon, as in pokemon.txt.
+    :param SectionCache | None section_cache: The cache to reuse sections from and store new sections in, if any.
+    :return WikiPage: The wiki page for the Pokémon.
+    :raises ValueError: If the Pokémon could not be found in the game files.
+    """
+    wiki_page = WikiPage(internal_name, section_cache)
+    wiki_page.load_game_data(("header",))
+    return wiki_page